@@ -0,0 +1,217 @@
+"""Time and memory-profile the pipeline on synthetic issues of increasing size.
+
+Each benchmark is run --repeat times for wall-clock timing (best run reported)
+and once more under tracemalloc for peak memory, so the timings are not skewed
+by allocation tracing. Results are written as JSON that --compare can diff
+against an earlier run.
+
+Run from the repository root (the XML builders read ./config.yml):
+    python -m benchmarks.run_benchmarks --sizes 10 100 1000 --output output/bench.json
+    python -m benchmarks.run_benchmarks --compare old.json new.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic_corpus import MERGED_PDF_NAME, generate_corpus
+from docx_processing.articles import extract_article
+from docx_processing.extractors import (
+    extract_abstract,
+    extract_affiliation_lines,
+    extract_author_orcids,
+    extract_authors,
+    extract_english_title,
+    extract_literature,
+    extract_ukrainian_title,
+)
+from docx_processing.parse import list_docx_files, parse_docx
+from docx_generation.generate_docx import create_contents_docx, create_doi_letter_docx
+from pdf_processing.page_count import extract_pdf_articles_pages
+from xml_generation.crossref.create_crossref_xml import (
+    DEFAULT_INSTITUTION_ID,
+    INSTITUTIONS_CONFIG,
+    create_full_xml,
+)
+from xml_generation.crossref.institution_ror import resolve_institution
+from xml_generation.ici_copernicus.create_copernicus_ini_xml import create_ici_copernicus_xml
+
+RESULTS_SCHEMA = 1
+DEFAULT_SIZES = (10, 100, 1000)
+
+
+def _measure(fn, repeat):
+    """Return (best_seconds, all_seconds, peak_bytes) for fn()."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(timings), timings, peak
+
+
+def _benchmarks(corpus_dir, work_dir):
+    """(name, items, callable) for every benchmarked entry point on one corpus."""
+    paths = [os.path.join(corpus_dir, f) for f in list_docx_files(corpus_dir)]
+    parsed = [parse_docx(p) for p in paths]
+    paragraph_lists = [paragraphs for paragraphs, _ in parsed]
+    literature = [extract_literature(p) for p in paragraph_lists]
+
+    articles_data = []
+    ukrainian_authors = []
+    current_page = 1
+    for paragraphs, page_count in parsed:
+        article, authors_uk = extract_article(paragraphs, current_page, current_page + page_count - 1)
+        current_page += page_count
+        articles_data.append(article)
+        ukrainian_authors.append(authors_uk)
+    affiliation_first_lines = [a[6][0] for a in articles_data if a[6]]
+
+    crossref_path = os.path.join(work_dir, "crossref.xml")
+    with open(crossref_path, "w", encoding="utf-8") as f:
+        f.write(create_full_xml(articles_data))
+
+    n = len(paths)
+    pairs = list(zip(paragraph_lists, literature))
+    return [
+        ("parse_docx", n, lambda: [parse_docx(p) for p in paths]),
+        ("extract_ukrainian_title", n, lambda: [extract_ukrainian_title(p) for p in paragraph_lists]),
+        ("extract_literature", n, lambda: [extract_literature(p) for p in paragraph_lists]),
+        ("extract_english_title", n, lambda: [extract_english_title(p, l) for p, l in pairs]),
+        ("extract_affiliation_lines", n, lambda: [extract_affiliation_lines(p, l) for p, l in pairs]),
+        ("extract_authors", n, lambda: [extract_authors(p) for p in paragraph_lists]),
+        ("extract_author_orcids", n, lambda: [extract_author_orcids(p, l) for p, l in pairs]),
+        ("extract_abstract", n, lambda: [extract_abstract(p) for p in paragraph_lists]),
+        (
+            "resolve_institution",
+            len(affiliation_first_lines),
+            lambda: [
+                resolve_institution(line, INSTITUTIONS_CONFIG, default_institution_id=DEFAULT_INSTITUTION_ID)
+                for line in affiliation_first_lines
+            ],
+        ),
+        ("create_full_xml", n, lambda: create_full_xml(articles_data)),
+        ("create_ici_copernicus_xml", n, lambda: create_ici_copernicus_xml(articles_data)),
+        (
+            "extract_pdf_articles_pages",
+            n,
+            lambda: extract_pdf_articles_pages(os.path.join(corpus_dir, MERGED_PDF_NAME)),
+        ),
+        (
+            "create_doi_letter_docx",
+            n,
+            lambda: create_doi_letter_docx(crossref_path, os.path.join(work_dir, "doi_letter.docx")),
+        ),
+        (
+            "create_contents_docx",
+            n,
+            lambda: create_contents_docx(
+                crossref_path, os.path.join(work_dir, "contents_ua.docx"), ukrainian_authors
+            ),
+        ),
+    ]
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, seed=0, images=False, repeat=3, corpus_root=None, only=None):
+    """Run all benchmarks for each corpus size; returns the results document."""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            corpus_dir = os.path.join(corpus_root or tmp, f"corpus-{size}-seed{seed}{'-img' if images else ''}")
+            if not os.path.exists(os.path.join(corpus_dir, MERGED_PDF_NAME)):
+                print(f"Generating {size} synthetic articles in {corpus_dir} ...", file=sys.stderr)
+                generate_corpus(corpus_dir, size, seed=seed, images=images)
+            work_dir = os.path.join(tmp, f"work-{size}")
+            os.makedirs(work_dir, exist_ok=True)
+            for name, items, fn in _benchmarks(corpus_dir, work_dir):
+                if only and name not in only:
+                    continue
+                best, timings, peak = _measure(fn, repeat)
+                results.append({
+                    "benchmark": name,
+                    "articles": size,
+                    "items": items,
+                    "seconds": round(best, 6),
+                    "seconds_all": [round(t, 6) for t in timings],
+                    "per_item_ms": round(best * 1000 / items, 4) if items else None,
+                    "peak_kib": round(peak / 1024, 1),
+                })
+                print(f"{name:<28}{size:>6} articles {best * 1000:>10.1f} ms {peak / 1024:>10.0f} KiB", file=sys.stderr)
+    return {
+        "schema": RESULTS_SCHEMA,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "images": images,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(old_path, new_path):
+    """Table of new/old time and memory ratios for benchmarks present in both files."""
+    with open(old_path, encoding="utf-8") as f:
+        old = {(r["benchmark"], r["articles"]): r for r in json.load(f)["results"]}
+    with open(new_path, encoding="utf-8") as f:
+        new = {(r["benchmark"], r["articles"]): r for r in json.load(f)["results"]}
+    lines = [f"{'benchmark':<28}{'articles':>9}{'old ms':>11}{'new ms':>11}{'time x':>8}{'mem x':>8}"]
+    for key in sorted(old.keys() & new.keys(), key=lambda k: (k[1], k[0])):
+        o, n = old[key], new[key]
+        time_ratio = n["seconds"] / o["seconds"] if o["seconds"] else float("nan")
+        mem_ratio = n["peak_kib"] / o["peak_kib"] if o["peak_kib"] else float("nan")
+        lines.append(
+            f"{key[0]:<28}{key[1]:>9}{o['seconds'] * 1000:>11.1f}{n['seconds'] * 1000:>11.1f}"
+            f"{time_ratio:>8.2f}{mem_ratio:>8.2f}"
+        )
+    return "\n".join(lines)
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline on synthetic issues.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Articles per issue.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--images", action="store_true", help="Embed figures in the synthetic DOCX files.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark (best is reported).")
+    parser.add_argument("--corpus-dir", help="Keep generated corpora here and reuse them across runs.")
+    parser.add_argument("--only", nargs="+", help="Run only the named benchmarks.")
+    parser.add_argument("--output", default=os.path.join("output", "bench.json"), help="Results JSON path.")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD_JSON", "NEW_JSON"), help="Compare two result files.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    if args.compare:
+        print(compare(*args.compare))
+    else:
+        document = run(
+            args.sizes, seed=args.seed, images=args.images, repeat=args.repeat,
+            corpus_root=args.corpus_dir, only=args.only,
+        )
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+        print(f"Results saved to {args.output}", file=sys.stderr)
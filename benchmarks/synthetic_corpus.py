@@ -0,0 +1,350 @@
+"""Deterministic synthetic journal-template articles for benchmarks and tests.
+
+Each generated DOCX follows the journal layout the extractors expect:
+УДК line, Ukrainian title, Ukrainian authors and © line, Ukrainian abstract,
+numbered body sections, "Список літератури" with 30–80 references, then the
+English title (sometimes split over two lines), byline, affiliations, e-mail,
+comma-separated ORCID list, English © line, two license lines, abstract and
+keywords. Optional inline PNG figures make the files closer to real sizes.
+
+A matching merged PDF (one marker page per article start, as produced by the
+print layout) is written next to the DOCX files so that
+extract_pdf_articles_pages can be exercised as well.
+
+Usage: python -m benchmarks.synthetic_corpus OUT_DIR --articles 100 [--seed 0] [--images]
+"""
+
+import argparse
+import io
+import os
+import random
+import re
+import struct
+import zipfile
+import zlib
+
+from docx import Document
+
+PDF_MARKER = "COMPUTER SYSTEMS AND NETWORKS"
+MERGED_PDF_NAME = "merged.pdf"
+
+SURNAMES = [
+    ("Tyshyk", "Тишик"), ("Petrenko", "Петренко"), ("Kovalenko", "Коваленко"),
+    ("Shevchenko", "Шевченко"), ("Bondarenko", "Бондаренко"), ("Melnyk", "Мельник"),
+    ("Kravchenko", "Кравченко"), ("Oliinyk", "Олійник"), ("Partyka", "Партика"),
+    ("Havano", "Гавано"), ("Dobush", "Добуш"), ("Herych", "Герич"),
+    ("Opirskyi", "Опірський"), ("Zamroz", "Замроз"), ("Teleshko", "Телешко"),
+    ("Arseniuk", "Арсенюк"), ("Nakonechnyi", "Наконечний"), ("Mychuda", "Мичуда"),
+]
+INITIALS = [
+    ("I", "І"), ("O", "О"), ("V", "В"), ("A", "А"), ("P", "П"),
+    ("N", "Н"), ("Y", "Я"), ("D", "Д"), ("M", "М"), ("R", "Р"),
+]
+INSTITUTIONS = [
+    ("Lviv Polytechnic National University", "Національний університет «Львівська політехніка»"),
+    ("Borys Grinchenko Kyiv Metropolitan University", "Київський столичний університет імені Бориса Грінченка"),
+    ('State University "Kyiv Aviation Institute"', "Державний університет «Київський авіаційний інститут»"),
+    ("Ternopil Ivan Puluj National Technical University", "Тернопільський національний технічний університет"),
+]
+DEPARTMENTS = [
+    "Department of Information Protection",
+    "Department of Electronic Computing Machines",
+    "Department of Computer Engineering",
+    "Department of Software Engineering",
+]
+EN_WORDS = (
+    "adaptive routing protocol for mobile ad hoc networks secure data aggregation "
+    "wireless sensor systems neural model intrusion detection distributed ledger "
+    "edge computing scheduling algorithm energy efficient blockchain consensus "
+    "federated learning anomaly classification cyber physical monitoring framework "
+    "optimization method embedded platform cloud service latency analysis"
+).split()
+UK_WORDS = (
+    "адаптивний протокол маршрутизації мобільних мереж захищене агрегування даних "
+    "бездротових сенсорних систем нейромережева модель виявлення вторгнень розподілений "
+    "реєстр периферійні обчислення алгоритм планування енергоефективний консенсус "
+    "федеративне навчання класифікація аномалій моніторинг кіберфізичних систем "
+    "метод оптимізації вбудована платформа хмарний сервіс аналіз затримок"
+).split()
+JOURNALS = [
+    "IEEE Access", "Computer Networks", "Sensors", "Future Generation Computer Systems",
+    "Journal of Network and Computer Applications", "Computer Systems and Networks",
+    "Ad Hoc Networks", "Information Sciences",
+]
+REQUIRED_SECTION_TITLES = [
+    "Вступ",
+    "Огляд літературних джерел",
+    "Постановка задачі",
+    "Результати дослідження",
+    "Висновки",
+]
+LICENSE_LINES = [
+    "This is an open access article under the CC BY license",
+    "(https://creativecommons.org/licenses/by/4.0/)",
+]
+# Upper-case Ukrainian letters, in the order used by docx_processing.parse.ukrainian_sort_key.
+FILENAME_LETTERS = "АБВГҐДЕЄЖЗИІЇЙКЛМНОПРСТУФХЦЧШЩЬЮЯ"
+
+
+def orcid_check_digit(base_digits):
+    """ISO 7064 11,2 check character for the first 15 ORCID digits."""
+    total = 0
+    for ch in base_digits:
+        total = (total + int(ch)) * 2
+    result = (12 - total % 11) % 11
+    return "X" if result == 10 else str(result)
+
+
+def _orcid(rng):
+    digits = "000" + "".join(str(rng.randint(0, 9)) for _ in range(12))
+    full = digits + orcid_check_digit(digits)
+    return "-".join(full[i:i + 4] for i in range(0, 16, 4))
+
+
+def _filename(index, slug):
+    """Issue-order filename: base-33 Ukrainian-letter prefix sorts like the index."""
+    n = len(FILENAME_LETTERS)
+    prefix = "".join(FILENAME_LETTERS[(index // n ** p) % n] for p in (2, 1, 0))
+    return f"{prefix}_{slug}.docx"
+
+
+def _sentence(rng, words, low=8, high=18):
+    text = " ".join(rng.choice(words) for _ in range(rng.randint(low, high)))
+    return text[0].upper() + text[1:] + "."
+
+
+def _reference(rng):
+    """One literature entry; always carries a year so extract_literature keeps it."""
+    surname, _ = rng.choice(SURNAMES)
+    first, _ = rng.choice(INITIALS)
+    year = rng.randint(1995, 2025)
+    title = " ".join(rng.choice(EN_WORDS) for _ in range(rng.randint(4, 9))).capitalize()
+    journal = rng.choice(JOURNALS)
+    volume, issue = rng.randint(1, 60), rng.randint(1, 12)
+    first_page = rng.randint(1, 900)
+    text = (
+        f"{surname}, {first}. ({year}). {title}. {journal}, {volume}({issue}), "
+        f"{first_page}–{first_page + rng.randint(5, 30)}."
+    )
+    kind = rng.random()
+    if kind < 0.45:
+        text += f" https://doi.org/10.{rng.randint(1000, 99999)}/{rng.choice(EN_WORDS)}.{year}.{rng.randint(100, 99999)}"
+    elif kind < 0.6:
+        text += f" doi:10.{rng.randint(1000, 99999)}/{rng.randint(100000, 999999)}"
+    elif kind < 0.75:
+        text += f" Retrieved from https://www.{rng.choice(EN_WORDS)}.org/{rng.randint(1, 9999)}"
+    return text
+
+
+def _png_bytes(rng, width=160, height=100):
+    """Small deterministic RGB gradient PNG."""
+    r0, g0, b0 = rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255)
+    rows = bytearray()
+    for y in range(height):
+        rows.append(0)
+        for x in range(width):
+            rows += bytes(((r0 + x) % 256, (g0 + y) % 256, (b0 + x + y) % 256))
+
+    def chunk(tag, data):
+        body = tag + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(bytes(rows), 6))
+        + chunk(b"IEND", b"")
+    )
+
+
+def reference_pool(seed, size=400):
+    """References shared across articles (the same sources recur within an issue)."""
+    rng = random.Random(f"pool-{seed}")
+    return [_reference(rng) for _ in range(size)]
+
+
+def build_article(index, seed=0, pool=None, images=False):
+    """Return (filename, paragraphs, page_count, inline_images) for one synthetic article."""
+    rng = random.Random(f"{seed}-{index}")
+    pool = pool if pool is not None else reference_pool(seed)
+
+    n_authors = rng.randint(1, 4)
+    people = []
+    for _ in range(n_authors):
+        en_surname, uk_surname = rng.choice(SURNAMES)
+        a, b = rng.sample(INITIALS, 2)
+        people.append((en_surname, uk_surname, a, b, _orcid(rng)))
+    institution_en, institution_uk = rng.choice(INSTITUTIONS)
+    department = rng.choice(DEPARTMENTS)
+
+    title_len = rng.randint(5, 12)
+    picks = [rng.randrange(len(EN_WORDS)) for _ in range(title_len)]
+    en_title = " ".join(EN_WORDS[i] for i in picks).upper()
+    uk_title = " ".join(UK_WORDS[i % len(UK_WORDS)] for i in picks).upper()
+    en_title_lines = [en_title]
+    if rng.random() < 0.3 and title_len > 6:
+        words = en_title.split()
+        en_title_lines = [" ".join(words[: title_len // 2]), " ".join(words[title_len // 2:])]
+
+    n_refs = rng.randint(30, 80)
+    references = []
+    for i in range(n_refs):
+        ref = rng.choice(pool) if rng.random() < 0.5 else _reference(rng)
+        references.append(f"{i + 1}. {ref}")
+
+    year = 2026
+    uk_authors = ", ".join(f"{uk} {a[1]}. {b[1]}." for _, uk, a, b, _ in people)
+    en_copyright = ", ".join(f"{en} {a[0]}. {b[0]}." for en, _, a, b, _ in people)
+    en_byline = ", ".join(f"{a[0]}.{b[0]}. {en}" for en, _, a, b, _ in people)
+    keywords_en = sorted({rng.choice(EN_WORDS) for _ in range(6)})
+    keywords_uk = sorted({rng.choice(UK_WORDS) for _ in range(6)})
+
+    paragraphs = [
+        f"УДК 004.{rng.randint(2, 9)}{rng.randint(10, 99)}",
+        uk_title,
+        ", ".join(f"{a[1]}. {b[1]}. {uk}" for _, uk, a, b, _ in people),
+        institution_uk,
+        f"© {uk_authors} {year}",
+        "Анотація. " + " ".join(_sentence(rng, UK_WORDS) for _ in range(rng.randint(4, 8))),
+        "Ключові слова: " + ", ".join(keywords_uk),
+    ]
+    inline_images = []
+    for number, section in enumerate(REQUIRED_SECTION_TITLES, start=1):
+        paragraphs.append(f"{number}. {section}")
+        for _ in range(rng.randint(3, 9)):
+            paragraphs.append(" ".join(_sentence(rng, UK_WORDS) for _ in range(rng.randint(3, 7))))
+        if images and rng.random() < 0.5:
+            inline_images.append((len(paragraphs), _png_bytes(rng)))
+            paragraphs.append(f"Рис. {len(inline_images)}. {_sentence(rng, UK_WORDS, 4, 8)}")
+    paragraphs.append("Список літератури")
+    paragraphs += references
+    paragraphs += en_title_lines
+    paragraphs += [
+        en_byline,
+        institution_en,
+        department,
+        "E-mail: " + ", ".join(f"{en.lower()}.{a[0].lower()}@example.edu" for en, _, a, _, _ in people),
+        ", ".join(orcid for *_, orcid in people),
+        f"© {en_copyright} {year}",
+        *LICENSE_LINES,
+        "Abstract. " + " ".join(_sentence(rng, EN_WORDS) for _ in range(rng.randint(5, 10))),
+        "Keywords: " + ", ".join(keywords_en),
+    ]
+
+    page_count = 4 + n_refs // 25 + rng.randint(0, 6)
+    slug = re.sub(r"[^a-z0-9]+", "-", en_title.lower()).strip("-")[:40]
+    return _filename(index, slug), paragraphs, page_count, inline_images
+
+
+def _set_page_count(docx_path, page_count):
+    """Rewrite docProps/app.xml <Pages> (what get_page_count_from_metadata reads)."""
+    with zipfile.ZipFile(docx_path) as src:
+        entries = [(info, src.read(info.filename)) for info in src.infolist()]
+    with zipfile.ZipFile(docx_path, "w", zipfile.ZIP_DEFLATED) as dst:
+        for info, data in entries:
+            if info.filename == "docProps/app.xml":
+                text = data.decode("utf-8")
+                if "<Pages>" in text:
+                    text = re.sub(r"<Pages>\d+</Pages>", f"<Pages>{page_count}</Pages>", text)
+                else:
+                    text = text.replace("</Properties>", f"<Pages>{page_count}</Pages></Properties>")
+                data = text.encode("utf-8")
+            dst.writestr(info, data)
+
+
+def write_docx(path, paragraphs, page_count, inline_images=()):
+    document = Document()
+    images = dict(inline_images)
+    for i, text in enumerate(paragraphs):
+        if i in images:
+            document.add_picture(io.BytesIO(images[i]))
+        document.add_paragraph(text)
+    document.core_properties.author = "synthetic"
+    document.save(path)
+    _set_page_count(path, page_count)
+
+
+def _pdf_escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_merged_pdf(path, page_counts, front_matter_pages=1):
+    """Minimal text PDF: front matter, then each article's pages with the marker on its first page."""
+    page_texts = [["Front matter"] for _ in range(front_matter_pages)]
+    for article_no, count in enumerate(page_counts, start=1):
+        for page in range(count):
+            if page == 0:
+                page_texts.append([PDF_MARKER, f"Article {article_no}"])
+            else:
+                page_texts.append([f"Article {article_no}, page {page + 1}"])
+
+    objects = []  # 1-based object ids: 1 catalog, 2 pages, 3 font, then page/content pairs
+    kids = []
+    page_objects = []
+    for i, lines in enumerate(page_texts):
+        page_id = 4 + 2 * i
+        content_id = page_id + 1
+        kids.append(f"{page_id} 0 R")
+        ops = ["BT", "/F1 12 Tf", "72 720 Td"]
+        for line in lines:
+            ops.append(f"({_pdf_escape(line)}) Tj")
+            ops.append("0 -16 Td")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        page_objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>".encode("latin-1")
+        )
+        page_objects.append(
+            b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream"
+        )
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode("latin-1"))
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    objects += page_objects
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref_at = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_at}\n%%EOF\n".encode()
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def generate_corpus(out_dir, n_articles, seed=0, images=False):
+    """Write n_articles DOCX files plus merged.pdf into out_dir; returns the DOCX filenames."""
+    os.makedirs(out_dir, exist_ok=True)
+    pool = reference_pool(seed)
+    filenames = []
+    page_counts = []
+    for index in range(n_articles):
+        filename, paragraphs, page_count, inline_images = build_article(
+            index, seed=seed, pool=pool, images=images
+        )
+        write_docx(os.path.join(out_dir, filename), paragraphs, page_count, inline_images)
+        filenames.append(filename)
+        page_counts.append(page_count)
+    write_merged_pdf(os.path.join(out_dir, MERGED_PDF_NAME), page_counts)
+    return filenames
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description="Generate a synthetic journal issue (DOCX + merged PDF).")
+    parser.add_argument("out_dir", help="Output folder for the DOCX files and merged.pdf.")
+    parser.add_argument("--articles", type=int, default=10, help="Number of articles.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (same seed → same corpus).")
+    parser.add_argument("--images", action="store_true", help="Embed figures in about half of the sections.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    names = generate_corpus(args.out_dir, args.articles, seed=args.seed, images=args.images)
+    print(f"Generated {len(names)} articles in {args.out_dir}")
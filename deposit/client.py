@@ -0,0 +1,218 @@
+"""Crossref deposit client: upload crossref.xml batches to the deposit servlet.
+
+One requests.Session is shared by all uploads; its connection pool keeps up to
+`concurrency` keep-alive connections to the deposit host, and responses are
+requested gzip-compressed. Uploads run in a bounded thread pool. Connection
+errors, timeouts, 429 and 5xx responses are retried with exponential backoff
+(honouring Retry-After); other responses are final. An upload is not
+idempotent: a timeout after it was sent, or a 5xx from a gateway, may come
+after the servlet already took the file, so uploads are retried only on
+429 or 503 with Retry-After (the servlet turning them away) and otherwise
+reported as failed; the jobs queue can then poll the batch by its id.
+Credentials always go in the POST body, never in a URL that could be logged.
+
+Settings come from the `deposit:` block of config.yml; credentials from the
+CROSSREF_LOGIN_ID / CROSSREF_LOGIN_PASSWD environment variables.
+
+    python -m deposit.client output/backfill/volume-*/issue-*/crossref.xml --concurrency 4
+    python -m deposit.mock_server --port 8099 &
+    python -m deposit.client output/crossref.xml --base-url http://127.0.0.1:8099
+"""
+
+import argparse
+import logging
+import os
+import random
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DEPOSIT_PATH = "/servlet/deposit"
+SUBMISSION_DOWNLOAD_PATH = "/servlet/submissionDownload"
+DEFAULT_BASE_URL = "https://test.crossref.org"
+LOGIN_ENV = "CROSSREF_LOGIN_ID"
+PASSWORD_ENV = "CROSSREF_LOGIN_PASSWD"
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+NON_IDEMPOTENT_RETRY_STATUSES = frozenset({429, 503})  # only with Retry-After
+MAX_BACKOFF_SECONDS = 60.0
+_BATCH_ID = re.compile(rb"<doi_batch_id>\s*([^<\s]+)\s*</doi_batch_id>")
+
+
+class DepositError(Exception):
+    """A deposit the servlet did not accept."""
+
+
+def read_batch_id(path):
+    """doi_batch_id from a deposit file's <head> (None if absent)."""
+    with open(path, "rb") as f:
+        match = _BATCH_ID.search(f.read(8192))
+    return match.group(1).decode("utf-8") if match else None
+
+
+class DepositClient:
+    def __init__(self, base_url=DEFAULT_BASE_URL, login_id=None, password=None, concurrency=4, retries=5,
+                 backoff=1.0, timeout=120.0):
+        self.base_url = base_url.rstrip("/")
+        self.login_id = login_id
+        self.password = password
+        self.concurrency = max(1, concurrency)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency, pool_block=True, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Accept-Encoding"] = "gzip"
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _delay(self, attempt, response=None):
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), MAX_BACKOFF_SECONDS)
+            except ValueError:
+                pass
+        return min(self.backoff * 2 ** attempt, MAX_BACKOFF_SECONDS) * random.uniform(0.5, 1.0)
+
+    def request(self, method, path, params=None, data=None, files=None, idempotent=True):
+        """HTTP request with retries; returns (response, attempts). Raises after the last failed attempt.
+
+        With idempotent=False a read timeout is raised at once and a retryable status is returned at once
+        unless it is 429/503 with Retry-After: the request may have been processed.
+        """
+        url = f"{self.base_url}{path}"
+        for attempt in range(self.retries + 1):
+            response = None
+            try:
+                response = self.session.request(
+                    method, url, params=params, data=data, files=files, timeout=self.timeout
+                )
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                sent = isinstance(exc, requests.Timeout) and not isinstance(exc, requests.ConnectTimeout)
+                if attempt == self.retries or (sent and not idempotent):
+                    raise
+                logger.warning("%s failed (%s), retrying", url, exc)
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    return response, attempt + 1
+                if not idempotent and (response.status_code not in NON_IDEMPOTENT_RETRY_STATUSES
+                                       or "Retry-After" not in response.headers):
+                    return response, attempt + 1
+                logger.warning("%s returned HTTP %s, retrying", url, response.status_code)
+            if files:
+                for _, file_tuple in files.items():
+                    file_tuple[1].seek(0)
+            time.sleep(self._delay(attempt, response))
+        raise AssertionError("unreachable")
+
+    def upload(self, path, operation="doMDUpload"):
+        """Deposit one file; returns a result dict (status "submitted" or "failed")."""
+        start = time.perf_counter()
+        result = {"file": path, "doi_batch_id": read_batch_id(path), "operation": operation}
+        try:
+            with open(path, "rb") as f:
+                response, attempts = self.request(
+                    "POST", DEPOSIT_PATH,
+                    data={"operation": operation, "login_id": self.login_id, "login_passwd": self.password},
+                    files={"fname": (os.path.basename(path), f, "application/xml")},
+                    idempotent=False,
+                )
+            result["http_status"] = response.status_code
+            result["attempts"] = attempts
+            if response.status_code != 200 or "SUCCESS" not in response.text:
+                raise DepositError(_response_message(response))
+            result["status"] = "submitted"
+        except (requests.RequestException, DepositError, OSError) as exc:
+            result["status"] = "failed"
+            result["error"] = f"{type(exc).__name__}: {exc}"
+        result["seconds"] = round(time.perf_counter() - start, 3)
+        log = logger.info if result["status"] == "submitted" else logger.error
+        log("deposit %s", result["status"], extra={"fields": {
+            key: result.get(key) for key in ("file", "doi_batch_id", "http_status", "attempts", "seconds", "error")
+            if result.get(key) is not None
+        }})
+        return result
+
+    def submission_result(self, doi_batch_id):
+        """Raw doi_batch_diagnostic XML for a deposited batch (submissionDownload, type=result)."""
+        response, _ = self.request(
+            "POST", SUBMISSION_DOWNLOAD_PATH,
+            data={"usr": self.login_id, "pwd": self.password, "doi_batch_id": doi_batch_id, "type": "result"},
+        )
+        response.raise_for_status()
+        return response.content
+
+    def upload_many(self, paths, operation="doMDUpload"):
+        """Deposit files over the connection pool; results in the order of paths."""
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            return list(pool.map(lambda path: self.upload(path, operation), paths))
+
+
+def _response_message(response):
+    text = re.sub(r"<[^>]+>", " ", response.text)
+    return f"HTTP {response.status_code}: {' '.join(text.split())[:300]}"
+
+
+def deposit_settings(config):
+    return dict(config.get("deposit") or {})
+
+
+def client_from_config(config, **overrides):
+    """DepositClient from config.yml's deposit block and the credential env vars."""
+    settings = deposit_settings(config)
+    settings.update({key: value for key, value in overrides.items() if value is not None})
+    return DepositClient(
+        base_url=settings.get("base_url", DEFAULT_BASE_URL),
+        login_id=settings.get("login_id") or os.environ.get(LOGIN_ENV),
+        password=settings.get("password") or os.environ.get(PASSWORD_ENV),
+        concurrency=int(settings.get("concurrency", 4)),
+        retries=int(settings.get("retries", 5)),
+        backoff=float(settings.get("backoff_seconds", 1.0)),
+        timeout=float(settings.get("timeout_seconds", 120.0)),
+    )
+
+
+def _parse_args(argv=None):
+    from instrumentation.logging_setup import add_logging_arguments
+
+    parser = argparse.ArgumentParser(description="Upload Crossref deposit files to the deposit servlet.")
+    parser.add_argument("files", nargs="+", help="crossref.xml batches to deposit.")
+    parser.add_argument("--base-url", help="Deposit host (default: deposit.base_url in config.yml).")
+    parser.add_argument("--concurrency", type=int, help="Parallel uploads / pooled connections.")
+    parser.add_argument("--operation", default="doMDUpload", help="Servlet operation (default: doMDUpload).")
+    add_logging_arguments(parser)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    import yaml
+
+    from instrumentation.logging_setup import configure_logging
+
+    args = _parse_args()
+    configure_logging(quiet=args.quiet, verbose=args.verbose, log_format=args.log_format)
+    with open("config.yml", "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    client = client_from_config(config, base_url=args.base_url, concurrency=args.concurrency)
+    if not client.login_id or not client.password:
+        logger.warning("%s / %s are not set; the servlet will reject the upload", LOGIN_ENV, PASSWORD_ENV)
+    with client:
+        results = client.upload_many(args.files, operation=args.operation)
+    failed = [result for result in results if result["status"] != "submitted"]
+    logger.info("deposit finished", extra={"fields": {"files": len(results), "failed": len(failed)}})
+    sys.exit(1 if failed else 0)
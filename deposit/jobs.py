@@ -0,0 +1,352 @@
+"""Durable deposit job queue: record submitted batches and poll their results.
+
+Every successful upload is stored in a SQLite database (deposit.queue_db,
+default output/deposits.sqlite) keyed by its doi_batch_id. `poll` checks the
+outstanding batches through submissionDownload from one asyncio event loop:
+requests run in worker threads (asyncio.to_thread) on the client's pooled
+session, at most deposit.poll_concurrency at a time, and all database writes
+stay on the loop thread. Each batch has its own next-poll time: a batch that
+is still queued is polled less and less often (poll_initial_seconds growing
+by POLL_GROWTH up to poll_max_seconds); one being processed is checked again
+after poll_initial_seconds (never less than MIN_POLL_SECONDS). A batch that
+has not completed poll_max_age_hours after its upload (still queued, never
+visible, or every poll failing) is marked failed and no longer polled.
+Because the schedule lives in the database, a restarted poller picks up
+exactly where the previous one stopped. A batch id is queued again only
+after its batch failed (gave up, or completed with Failure records; the old
+row and records are replaced): `submit` skips files without a doi_batch_id
+or with one that is outstanding or completed without failures. Completed
+batches are parsed into per-DOI records (Success / Warning / Failure), and
+the accepted DOIs are marked deposited in the DOI ledger
+(xml_generation.crossref.doi_ledger) when one is attached.
+
+    python -m deposit.jobs submit output/backfill/volume-*/issue-*/crossref.xml
+    python -m deposit.jobs poll [--once]
+    python -m deposit.jobs status
+    python -m deposit.jobs records --failed
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sqlite3
+import sys
+import time
+
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_DB = os.path.join("output", "deposits.sqlite")
+TERMINAL_STATUSES = ("completed", "failed")
+POLL_GROWTH = 1.5
+MIN_POLL_SECONDS = 1.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    doi_batch_id   TEXT PRIMARY KEY,
+    file           TEXT,
+    operation      TEXT,
+    status         TEXT NOT NULL,
+    submitted_at   REAL NOT NULL,
+    polled_at      REAL,
+    next_poll_at   REAL NOT NULL,
+    interval       REAL NOT NULL,
+    polls          INTEGER NOT NULL DEFAULT 0,
+    submission_id  TEXT,
+    record_count   INTEGER,
+    success_count  INTEGER,
+    warning_count  INTEGER,
+    failure_count  INTEGER,
+    error          TEXT
+);
+CREATE INDEX IF NOT EXISTS batches_due ON batches (status, next_poll_at);
+CREATE TABLE IF NOT EXISTS records (
+    doi_batch_id  TEXT NOT NULL REFERENCES batches (doi_batch_id),
+    doi           TEXT NOT NULL,
+    status        TEXT NOT NULL,
+    message       TEXT,
+    PRIMARY KEY (doi_batch_id, doi)
+);
+"""
+
+
+def parse_diagnostic(xml):
+    """doi_batch_diagnostic XML → dict with status, counts and per-DOI records."""
+    root = etree.fromstring(xml)
+    if etree.QName(root).localname != "doi_batch_diagnostic":
+        raise ValueError(f"Unexpected submission result root <{root.tag}>")
+
+    def text(path):
+        value = root.findtext(path)
+        return value.strip() if value else None
+
+    def count(name):
+        value = text(f"batch_data/{name}")
+        return int(value) if value is not None else None
+
+    return {
+        "status": root.get("status"),
+        "submission_id": text("submission_id"),
+        "batch_id": text("batch_id"),
+        "record_count": count("record_count"),
+        "success_count": count("success_count"),
+        "warning_count": count("warning_count"),
+        "failure_count": count("failure_count"),
+        "records": [
+            (
+                (record.findtext("doi") or "").strip(),
+                record.get("status"),
+                (record.findtext("msg") or "").strip() or None,
+            )
+            for record in root.iter("record_diagnostic")
+        ],
+    }
+
+
+def _resubmittable(batch):
+    return batch["status"] == "failed" or (batch["status"] == "completed" and (batch["failure_count"] or 0) > 0)
+
+
+class DepositQueue:
+    def __init__(self, path=DEFAULT_QUEUE_DB, initial_interval=60.0, max_interval=900.0, max_age=72 * 3600.0,
+                 ledger=None, min_interval=MIN_POLL_SECONDS):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+        self.initial_interval = max(initial_interval, min_interval)
+        self.max_interval = max(max_interval, self.initial_interval)
+        self.max_age = max_age
+        self.ledger = ledger
+
+    def close(self):
+        self.db.close()
+        if self.ledger is not None:
+            self.ledger.close()
+
+    def add(self, result, now=None):
+        """Record a submitted upload (a deposit.client result dict).
+
+        ValueError for a missing doi_batch_id or one that is queued and has not failed.
+        """
+        now = time.time() if now is None else now
+        batch_id = result.get("doi_batch_id")
+        if not batch_id:
+            raise ValueError(f"{result.get('file')}: no doi_batch_id")
+        existing = self.batch(batch_id)
+        if existing is not None and not _resubmittable(existing):
+            raise ValueError(f"{result.get('file')}: doi_batch_id {batch_id} is already queued ({existing['status']})")
+        with self.db:
+            if existing is not None:
+                logger.info("Queueing %s again after status %s", batch_id, existing["status"])
+                self.db.execute("DELETE FROM records WHERE doi_batch_id = ?", (batch_id,))
+                self.db.execute("DELETE FROM batches WHERE doi_batch_id = ?", (batch_id,))
+            self.db.execute(
+                "INSERT INTO batches (doi_batch_id, file, operation, status, submitted_at, "
+                "next_poll_at, interval) VALUES (?, ?, ?, 'submitted', ?, ?, ?)",
+                (
+                    batch_id, result.get("file"), result.get("operation"), now,
+                    now + self.initial_interval, self.initial_interval,
+                ),
+            )
+
+    def batch(self, doi_batch_id):
+        return self.db.execute("SELECT * FROM batches WHERE doi_batch_id = ?", (doi_batch_id,)).fetchone()
+
+    def accepts(self, doi_batch_id):
+        """True when add() would queue this batch id (new, or its previous batch failed)."""
+        existing = self.batch(doi_batch_id)
+        return existing is None or _resubmittable(existing)
+
+    def outstanding(self):
+        return self.db.execute(
+            "SELECT * FROM batches WHERE status NOT IN (?, ?) ORDER BY next_poll_at", TERMINAL_STATUSES
+        ).fetchall()
+
+    def due(self, now=None):
+        now = time.time() if now is None else now
+        return self.db.execute(
+            "SELECT * FROM batches WHERE status NOT IN (?, ?) AND next_poll_at <= ? ORDER BY next_poll_at",
+            (*TERMINAL_STATUSES, now),
+        ).fetchall()
+
+    def next_due(self):
+        row = self.db.execute(
+            "SELECT MIN(next_poll_at) FROM batches WHERE status NOT IN (?, ?)", TERMINAL_STATUSES
+        ).fetchone()
+        return row[0]
+
+    def apply(self, batch, diagnostic=None, error=None, now=None):
+        """Store one poll outcome and schedule the next poll of unfinished batches."""
+        now = time.time() if now is None else now
+        if diagnostic is None:
+            status, interval = batch["status"], min(batch["interval"] * POLL_GROWTH, self.max_interval)
+        elif diagnostic["status"] == "completed":
+            status, interval = "completed", batch["interval"]
+        elif diagnostic["status"] == "in_process":
+            status, interval = "in_process", self.initial_interval
+        else:  # queued, or not yet visible (unknown_submission) right after the upload
+            status, interval = diagnostic["status"] or "unknown", min(batch["interval"] * POLL_GROWTH, self.max_interval)
+        if status != "completed" and now - batch["submitted_at"] >= self.max_age:
+            hours = (now - batch["submitted_at"]) / 3600
+            error = f"gave up after {batch['polls'] + 1} polls in {hours:.1f} h (last status {status})" + (
+                f": {error}" if error else ""
+            )
+            status = "failed"
+        counts = {key: (diagnostic or {}).get(key) for key in
+                  ("submission_id", "record_count", "success_count", "warning_count", "failure_count")}
+        with self.db:
+            self.db.execute(
+                "UPDATE batches SET status = ?, polled_at = ?, next_poll_at = ?, interval = ?, polls = polls + 1, "
+                "submission_id = COALESCE(?, submission_id), record_count = ?, success_count = ?, "
+                "warning_count = ?, failure_count = ?, error = ? WHERE doi_batch_id = ?",
+                (
+                    status, now, now + interval, interval, counts["submission_id"], counts["record_count"],
+                    counts["success_count"], counts["warning_count"], counts["failure_count"], error,
+                    batch["doi_batch_id"],
+                ),
+            )
+            if diagnostic is not None and status == "completed":
+                self.db.executemany(
+                    "INSERT OR REPLACE INTO records (doi_batch_id, doi, status, message) VALUES (?, ?, ?, ?)",
+                    [(batch["doi_batch_id"], doi, rec_status, message)
+                     for doi, rec_status, message in diagnostic["records"]],
+                )
+        if self.ledger is not None and diagnostic is not None and status == "completed":
+            self.ledger.mark_deposited(
+                batch["doi_batch_id"],
+                [doi for doi, rec_status, _ in diagnostic["records"] if rec_status in ("Success", "Warning")],
+            )
+        return status
+
+    def records(self, failed_only=False, doi_batch_id=None):
+        query, params = "SELECT * FROM records WHERE 1 = 1", []
+        if failed_only:
+            query += " AND status = 'Failure'"
+        if doi_batch_id:
+            query += " AND doi_batch_id = ?"
+            params.append(doi_batch_id)
+        return self.db.execute(query + " ORDER BY doi_batch_id, doi", params).fetchall()
+
+    def status_counts(self):
+        return dict(self.db.execute("SELECT status, COUNT(*) FROM batches GROUP BY status").fetchall())
+
+
+async def _poll_batch(queue, client, batch, semaphore):
+    async with semaphore:
+        try:
+            xml = await asyncio.to_thread(client.submission_result, batch["doi_batch_id"])
+            diagnostic = parse_diagnostic(xml)
+        except Exception as exc:
+            logger.warning("Polling %s failed: %s", batch["doi_batch_id"], exc)
+            return queue.apply(batch, error=f"{type(exc).__name__}: {exc}")
+    status = queue.apply(batch, diagnostic)
+    if status == "completed":
+        logger.info("batch completed", extra={"fields": {
+            "doi_batch_id": batch["doi_batch_id"], "records": diagnostic["record_count"],
+            "failures": diagnostic["failure_count"],
+        }})
+    return status
+
+
+async def poll(queue, client, concurrency=8, once=False):
+    """Poll outstanding batches until none are left (or one round with once=True)."""
+    semaphore = asyncio.Semaphore(concurrency)
+    while True:
+        due = queue.due()
+        if due:
+            await asyncio.gather(*(_poll_batch(queue, client, batch, semaphore) for batch in due))
+        if once:
+            return
+        next_due = queue.next_due()
+        if next_due is None:
+            return
+        await asyncio.sleep(max(0.0, next_due - time.time()))
+
+
+def queue_from_config(config, path=None):
+    from xml_generation.crossref.doi_ledger import DoiLedger, ledger_path
+
+    settings = config.get("deposit") or {}
+    return DepositQueue(
+        path or settings.get("queue_db", DEFAULT_QUEUE_DB),
+        initial_interval=float(settings.get("poll_initial_seconds", 60)),
+        max_interval=float(settings.get("poll_max_seconds", 900)),
+        max_age=float(settings.get("poll_max_age_hours", 72)) * 3600,
+        ledger=DoiLedger(ledger_path(config)),
+    )
+
+
+def _parse_args(argv=None):
+    from instrumentation.logging_setup import add_logging_arguments
+
+    parser = argparse.ArgumentParser(description="Submit deposits and track their results in a local queue.")
+    parser.add_argument("--db", help="Queue database (default: deposit.queue_db in config.yml).")
+    parser.add_argument("--base-url", help="Deposit host (default: deposit.base_url in config.yml).")
+    add_logging_arguments(parser)
+    sub = parser.add_subparsers(dest="command", required=True)
+    submit = sub.add_parser("submit", help="Upload files and queue them for polling.")
+    submit.add_argument("files", nargs="+")
+    submit.add_argument("--operation", default="doMDUpload")
+    poll_parser = sub.add_parser("poll", help="Poll outstanding batches until all have completed.")
+    poll_parser.add_argument("--once", action="store_true", help="Poll the batches that are due once, then exit.")
+    sub.add_parser("status", help="Batch counts by status and the outstanding batches.")
+    records = sub.add_parser("records", help="Per-DOI results of completed batches.")
+    records.add_argument("--failed", action="store_true")
+    records.add_argument("--batch")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    import yaml
+
+    from deposit.client import client_from_config, read_batch_id
+    from instrumentation.logging_setup import configure_logging
+
+    args = _parse_args(argv)
+    configure_logging(quiet=args.quiet, verbose=args.verbose, log_format=args.log_format)
+    with open("config.yml", "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    queue = queue_from_config(config, args.db)
+    try:
+        if args.command == "submit":
+            files, seen, skipped = [], set(), 0
+            for path in args.files:
+                batch_id = read_batch_id(path)
+                if not batch_id or batch_id in seen or not queue.accepts(batch_id):
+                    logger.error("Not submitting %s: %s", path,
+                                 f"doi_batch_id {batch_id} is already queued" if batch_id else "no doi_batch_id")
+                    skipped += 1
+                    continue
+                seen.add(batch_id)
+                files.append(path)
+            with client_from_config(config, base_url=args.base_url) as client:
+                results = client.upload_many(files, operation=args.operation)
+            for result in results:
+                if result["status"] == "submitted":
+                    queue.add(result)
+            return 1 if skipped or any(result["status"] != "submitted" for result in results) else 0
+        if args.command == "poll":
+            concurrency = int((config.get("deposit") or {}).get("poll_concurrency", 8))
+            with client_from_config(config, base_url=args.base_url, concurrency=concurrency) as client:
+                asyncio.run(poll(queue, client, concurrency=concurrency, once=args.once))
+            logger.info("poll finished", extra={"fields": queue.status_counts()})
+            return 0
+        if args.command == "status":
+            print(" ".join(f"{status}={count}" for status, count in sorted(queue.status_counts().items())))
+            for batch in queue.outstanding():
+                print(f"{batch['doi_batch_id']}\t{batch['status']}\tpolls={batch['polls']}\t{batch['file']}")
+            return 0
+        for record in queue.records(failed_only=args.failed, doi_batch_id=args.batch):
+            print(f"{record['doi_batch_id']}\t{record['doi']}\t{record['status']}\t{record['message'] or ''}")
+        return 0
+    finally:
+        queue.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
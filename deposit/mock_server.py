@@ -0,0 +1,198 @@
+"""Local stand-in for the Crossref deposit servlet, for tests and dry runs.
+
+POST /servlet/deposit accepts the same multipart form as doi.crossref.org
+(operation, login_id, login_passwd, fname) and answers with Crossref's
+SUCCESS page. Responses are gzip-compressed when the client asks for it and
+connections are kept alive, so client pooling behaves as against the real host.
+`fail_next` makes the next N requests return 503 to exercise retries.
+
+POST (form fields usr, pwd, doi_batch_id, type=result) or GET (the same
+as query parameters) /servlet/submissionDownload answers with a
+doi_batch_diagnostic: "queued" until `processing_delay` seconds after the
+upload, then "completed" with one record_diagnostic per deposited DOI
+(DOIs listed in `fail_dois` get status Failure).
+
+    python -m deposit.mock_server --port 8099
+"""
+
+import argparse
+import email.parser
+import email.policy
+import gzip
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from xml.sax.saxutils import escape
+
+SUCCESS_PAGE = (
+    "<html><head><title>SUCCESS</title></head><body><h2>SUCCESS</h2>"
+    "<p>Your batch submission was successfully received.</p></body></html>"
+)
+FAILURE_PAGE = "<html><head><title>FAILURE</title></head><body><h2>FAILURE</h2><p>{}</p></body></html>"
+_BATCH_ID = re.compile(rb"<doi_batch_id>\s*([^<\s]+)\s*</doi_batch_id>")
+_DOI = re.compile(rb"<doi>\s*([^<\s]+)\s*</doi>")
+
+
+class MockState:
+    def __init__(self, credentials=None):
+        self.credentials = credentials
+        self.lock = threading.Lock()
+        self.deposits = {}
+        self.requests = 0
+        self.connections = set()
+        self.fail_next = 0
+        self.processing_delay = 0.0
+        self.fail_dois = set()
+
+    def diagnostic(self, batch_id):
+        """doi_batch_diagnostic XML for a batch, as submissionDownload returns it."""
+        with self.lock:
+            deposit = self.deposits.get(batch_id)
+        if deposit is None:
+            return '<?xml version="1.0" encoding="UTF-8"?>\n<doi_batch_diagnostic status="unknown_submission"/>'
+        if time.time() - deposit["received"] < self.processing_delay:
+            return (
+                '<?xml version="1.0" encoding="UTF-8"?>\n<doi_batch_diagnostic status="queued">'
+                f"<batch_id>{escape(batch_id)}</batch_id></doi_batch_diagnostic>"
+            )
+        dois = [doi.decode("utf-8") for doi in _DOI.findall(deposit["xml"])]
+        records = []
+        for doi in dois:
+            failed = doi in self.fail_dois
+            message = "Record not processed because of schema errors" if failed else "Successfully added"
+            records.append(
+                f'<record_diagnostic status="{"Failure" if failed else "Success"}">'
+                f"<doi>{escape(doi)}</doi><msg>{message}</msg></record_diagnostic>"
+            )
+        failures = sum(1 for doi in dois if doi in self.fail_dois)
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<doi_batch_diagnostic status="completed" sp="mock">'
+            f"<submission_id>{deposit['submission_id']}</submission_id><batch_id>{escape(batch_id)}</batch_id>"
+            + "".join(records)
+            + f"<batch_data><record_count>{len(dois)}</record_count><success_count>{len(dois) - failures}"
+            f"</success_count><warning_count>0</warning_count><failure_count>{failures}</failure_count>"
+            "</batch_data></doi_batch_diagnostic>"
+        )
+
+    def take_failure(self):
+        with self.lock:
+            if self.fail_next > 0:
+                self.fail_next -= 1
+                return True
+            return False
+
+
+def parse_multipart(content_type, body):
+    """{field name: bytes} from a multipart/form-data body."""
+    message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+        b"Content-Type: " + content_type.encode("latin-1") + b"\r\n\r\n" + body
+    )
+    fields = {}
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        if name:
+            fields[name] = part.get_payload(decode=True) or b""
+    return fields
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state = None  # set per server in start_mock_server
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type="text/html; charset=UTF-8", headers=None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        if "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            data = gzip.compress(data)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _count(self):
+        with self.state.lock:
+            self.state.requests += 1
+            self.state.connections.add(self.client_address)
+
+    def do_POST(self):
+        self._count()
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.state.take_failure():
+            self._send(503, FAILURE_PAGE.format("Service temporarily unavailable"), headers={"Retry-After": "0"})
+            return
+        path = urlsplit(self.path).path
+        if path == "/servlet/submissionDownload":
+            self._submission_download(parse_qs(body.decode("utf-8")))
+            return
+        if path != "/servlet/deposit":
+            self._send(404, FAILURE_PAGE.format("Not found"))
+            return
+        fields = parse_multipart(self.headers.get("Content-Type", ""), body)
+        login = (fields.get("login_id", b"").decode(), fields.get("login_passwd", b"").decode())
+        if self.state.credentials is not None and login != self.state.credentials:
+            self._send(401, FAILURE_PAGE.format("Login failed"))
+            return
+        xml = fields.get("fname")
+        match = _BATCH_ID.search(xml or b"")
+        if not match:
+            self._send(200, FAILURE_PAGE.format("No doi_batch_id in the uploaded file"))
+            return
+        batch_id = match.group(1).decode("utf-8")
+        with self.state.lock:
+            self.state.deposits[batch_id] = {
+                "operation": fields.get("operation", b"").decode(),
+                "xml": xml,
+                "received": time.time(),
+                "submission_id": 1400000000 + len(self.state.deposits),
+            }
+        self._send(200, SUCCESS_PAGE)
+
+    def do_GET(self):
+        self._count()
+        url = urlsplit(self.path)
+        if url.path != "/servlet/submissionDownload":
+            self._send(404, FAILURE_PAGE.format("Not found"))
+            return
+        self._submission_download(parse_qs(url.query))
+
+    def _submission_download(self, fields):
+        query = {key: values[0] for key, values in fields.items()}
+        if self.state.credentials is not None and (query.get("usr"), query.get("pwd")) != self.state.credentials:
+            self._send(401, FAILURE_PAGE.format("Login failed"))
+            return
+        self._send(200, self.state.diagnostic(query.get("doi_batch_id", "")), content_type="text/xml; charset=UTF-8")
+
+
+def start_mock_server(host="127.0.0.1", port=0, credentials=None, handler=MockHandler):
+    """Serve in a daemon thread; returns the server (server.state, server.base_url, server.shutdown())."""
+    state = MockState(credentials)
+    handler_class = type("BoundMockHandler", (handler,), {"state": state})
+    server = ThreadingHTTPServer((host, port), handler_class)
+    server.daemon_threads = True
+    server.state = state
+    server.base_url = f"http://{host}:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local mock of the Crossref deposit servlet.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    args = parser.parse_args()
+    server = start_mock_server(args.host, args.port)
+    print(f"Mock Crossref servlet on {server.base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
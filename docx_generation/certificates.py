@@ -0,0 +1,213 @@
+"""DOI confirmation letters: one DOCX per article, or per article and author.
+
+The template is any DOCX with {placeholders} in its body, headers or footers
+(see PLACEHOLDERS; `--write-template` saves the built-in one for editing). It
+is read once: the zip entries are kept as bytes and the body, header and
+footer parts whose text contains placeholders (also ones split over runs)
+are parsed once. Each letter deep-copies those trees, replaces each
+placeholder in the runs it spans, and writes a new zip next to the
+untouched entries, so no output reloads the template through python-docx.
+Letters are written by a process pool whose workers each load the template
+once.
+
+    python -m docx_generation.certificates output/crossref.xml --output-dir output/certificates \\
+        [--template letter.docx] [--per-author] [--jobs 4]
+"""
+
+import argparse
+import copy
+import io
+import logging
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from docx import Document
+from lxml import etree
+
+from docx_generation.generate_docx import _nsmap, parse_articles, parse_journal_metadata, parse_xml
+
+logger = logging.getLogger(__name__)
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+W_P, W_T, W_TAB, W_BR, W_CR = (f"{{{W_NS}}}{name}" for name in ("p", "t", "tab", "br", "cr"))
+XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+PLACEHOLDER_RE = re.compile(r"\{([a-z_]+)\}")
+TEMPLATE_PART_RE = re.compile(r"^word/(document|header\d*|footer\d*)\.xml$")
+PLACEHOLDERS = (
+    "journal_title", "issn", "volume", "issue", "year", "number", "authors", "author",
+    "title", "original_title", "pages", "doi", "url",
+)
+
+
+def default_template():
+    """Built-in letter template (DOCX bytes)."""
+    doc = Document()
+    doc.add_heading("{journal_title}", level=1)
+    doc.add_paragraph("ISSN: {issn}. Volume {volume}, issue {issue}, {year}.")
+    doc.add_paragraph("DOI registration confirmation", style="Title")
+    doc.add_paragraph("To: {author}")
+    doc.add_paragraph(
+        "The article “{title}” ({authors}), pages {pages}, has been registered with Crossref "
+        "under DOI {doi}."
+    )
+    doc.add_paragraph("Article page: {url}")
+    out = io.BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+
+class LetterTemplate:
+    def __init__(self, data):
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            self.entries = [(info, archive.read(info.filename)) for info in archive.infolist()]
+        parts = (
+            (info.filename, etree.fromstring(content))
+            for info, content in self.entries
+            if TEMPLATE_PART_RE.match(info.filename)
+        )
+        # Word often splits a placeholder over several runs, so look at the text, not the raw XML.
+        self.trees = {
+            name: tree for name, tree in parts
+            if any(PLACEHOLDER_RE.search(text) for text, _ in map(_paragraph_text, tree.iter(W_P)))
+        }
+
+    @classmethod
+    def load(cls, path=None):
+        if path is None:
+            return cls(default_template())
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    def render(self, fields):
+        """DOCX bytes with every {placeholder} replaced (unknown placeholders are left as they are)."""
+        out = io.BytesIO()
+        with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+            for info, content in self.entries:
+                tree = self.trees.get(info.filename)
+                if tree is not None:
+                    tree = copy.deepcopy(tree)
+                    _fill(tree, fields)
+                    content = etree.tostring(tree, xml_declaration=True, encoding="UTF-8", standalone=True)
+                archive.writestr(info, content)
+        return out.getvalue()
+
+
+def _paragraph_text(paragraph):
+    """(text, [(offset, w:t)]) of a paragraph's own runs; tabs and breaks are separators in the text."""
+    text, nodes = [], []
+    length = 0
+    for node in paragraph.iter(W_T, W_TAB, W_BR, W_CR):
+        if next(node.iterancestors(W_P)) is not paragraph:
+            continue  # a nested paragraph (text box), filled on its own
+        if node.tag == W_T:
+            nodes.append((length, node))
+            value = node.text or ""
+        else:
+            value = "\t" if node.tag == W_TAB else "\n"
+        text.append(value)
+        length += len(value)
+    return "".join(text), nodes
+
+
+def _fill(tree, fields):
+    for paragraph in tree.iter(W_P):
+        text, nodes = _paragraph_text(paragraph)
+        if "{" not in text:
+            continue
+        # Right to left, so the offsets of the earlier placeholders stay valid. A placeholder split
+        # over several runs is written into its first run; the other runs keep their remaining text,
+        # and breaks and tabs between runs stay where they are.
+        for match in reversed(list(PLACEHOLDER_RE.finditer(text))):
+            value = fields.get(match.group(1))
+            if value is None:
+                continue
+            spanned = [(offset, t) for offset, t in nodes
+                       if offset < match.end() and offset + len(t.text or "") > match.start()]
+            (first_offset, first), (last_offset, last) = spanned[0], spanned[-1]
+            suffix = (last.text or "")[match.end() - last_offset:]
+            for _, t in spanned[1:]:
+                t.text = ""
+            first.text = (first.text or "")[:match.start() - first_offset] + str(value) + (
+                suffix if last is first else ""
+            )
+            if last is not first:
+                last.text = suffix
+                last.set(XML_SPACE, "preserve")
+            first.set(XML_SPACE, "preserve")
+
+
+def letter_jobs(xml_path, output_dir, per_author=False):
+    """(output path, fields) for every letter of a crossref.xml."""
+    root = parse_xml(xml_path)
+    nsmap = _nsmap(root)
+    journal_title, volume, issue, year, issn, _, _ = parse_journal_metadata(root, nsmap)
+    jobs = []
+    for number, authors, title, original_title, pages, url, doi in parse_articles(root, nsmap):
+        fields = {
+            "journal_title": journal_title, "issn": issn, "volume": volume, "issue": issue, "year": year,
+            "number": number, "authors": authors, "author": authors, "title": title,
+            "original_title": original_title, "pages": pages, "doi": doi, "url": url,
+        }
+        stem = re.sub(r"[^A-Za-z0-9._-]+", "_", doi.split("/", 1)[-1])
+        if not per_author or authors == "N/A":
+            jobs.append((os.path.join(output_dir, f"{stem}.docx"), fields))
+            continue
+        for position, author in enumerate(authors.split(", "), start=1):
+            surname = re.sub(r"\W+", "_", author.split()[-1])
+            jobs.append((os.path.join(output_dir, f"{stem}-{position}-{surname}.docx"), dict(fields, author=author)))
+    return jobs
+
+
+_worker_template = None
+
+
+def _init_worker(template_path):
+    global _worker_template
+    _worker_template = LetterTemplate.load(template_path)
+
+
+def _write_letters(jobs):
+    for path, fields in jobs:
+        with open(path, "wb") as f:
+            f.write(_worker_template.render(fields))
+    return len(jobs)
+
+
+def write_letters(xml_path, output_dir, template_path=None, per_author=False, jobs=None):
+    """Write all letters of a crossref.xml; returns the written paths."""
+    os.makedirs(output_dir, exist_ok=True)
+    letters = letter_jobs(xml_path, output_dir, per_author)
+    workers = jobs or os.cpu_count() or 1
+    if workers <= 1 or len(letters) < 2:
+        _init_worker(template_path)
+        _write_letters(letters)
+    else:
+        chunk = max(1, len(letters) // (workers * 4))
+        batches = [letters[i:i + chunk] for i in range(0, len(letters), chunk)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(template_path,)) as pool:
+            for _ in pool.map(_write_letters, batches):
+                pass
+    logger.info("letters written", extra={"fields": {"letters": len(letters), "output_dir": output_dir}})
+    return [path for path, _ in letters]
+
+
+if __name__ == "__main__":
+    from instrumentation.logging_setup import add_logging_arguments, configure_logging
+
+    parser = argparse.ArgumentParser(description="One DOI confirmation letter per article (or per author).")
+    parser.add_argument("crossref_xml", nargs="?", default=os.path.join("output", "crossref.xml"))
+    parser.add_argument("--output-dir", default=os.path.join("output", "certificates"))
+    parser.add_argument("--template", help="DOCX with {placeholders} (default: built-in letter).")
+    parser.add_argument("--per-author", action="store_true", help="One letter per author of each article.")
+    parser.add_argument("--jobs", type=int, help="Worker processes (default: CPU count).")
+    parser.add_argument("--write-template", metavar="PATH", help="Save the built-in template and exit.")
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    configure_logging(quiet=args.quiet, verbose=args.verbose, log_format=args.log_format)
+    if args.write_template:
+        with open(args.write_template, "wb") as f:
+            f.write(default_template())
+    else:
+        write_letters(args.crossref_xml, args.output_dir, args.template, args.per_author, args.jobs)
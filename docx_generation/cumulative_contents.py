@@ -0,0 +1,117 @@
+"""Cumulative table of contents across issues (a volume or the whole archive).
+
+Rows are streamed issue by issue, straight into a direct-XML table
+(docx_generation.table_writer). They come from crossref.xml files, parsed
+with iterparse and each journal_article cleared after use, or from issue
+snapshots, read one record per line. Memory stays flat for thousands of rows.
+
+    python -m docx_generation.cumulative_contents output/backfill/volume-*/issue-*/issue.ndjson \\
+        --output output/cumulative_contents.docx [--ukrainian]
+"""
+
+import argparse
+import logging
+import os
+
+import lxml.etree as etree
+from docx import Document
+
+from docx_generation.generate_docx import article_row
+from docx_generation.table_writer import append_table
+from docx_processing.author_names import parsed_authors
+
+logger = logging.getLogger(__name__)
+
+HEADER = ("№", "Випуск", "Автори", "Назви статей", "Сторінки", "DOI")
+
+
+def _issue_label(volume, issue, year):
+    return f"Вип. {volume}, №{issue}, {year}"
+
+
+def iter_crossref_entries(xml_path):
+    """One dict per journal_article of a crossref.xml, streamed."""
+    label = None
+    for _, el in etree.iterparse(xml_path, events=("end",), tag=("{*}journal_issue", "{*}journal_article")):
+        nsmap = {"ns": etree.QName(el).namespace}
+        if etree.QName(el).localname == "journal_issue":
+            label = _issue_label(
+                el.findtext("ns:journal_volume/ns:volume", namespaces=nsmap),
+                el.findtext("ns:issue", namespaces=nsmap),
+                el.findtext("ns:publication_date/ns:year", namespaces=nsmap),
+            )
+            continue
+        _, authors, title, original_title, pages, _, doi = article_row(0, el, nsmap)
+        yield {
+            "issue": label, "authors": authors, "ukrainian_authors": None, "title": title,
+            "original_title": original_title, "pages": pages, "doi": doi,
+        }
+        el.clear()
+        while el.getprevious() is not None:
+            del el.getparent()[0]
+
+
+def iter_snapshot_entries(snapshot_path):
+    """One dict per article record of an issue snapshot (DOIs built with that issue's config)."""
+    import xml_generation.crossref.create_crossref_xml as crossref_module
+    from pipeline.snapshot import iter_snapshot, read_header
+
+    config = read_header(snapshot_path)["config"]
+    crossref_module.apply_config(config)
+    publication = config["publication"]
+    label = _issue_label(publication["volume"], publication["issue"], publication["year"])
+    for record in iter_snapshot(snapshot_path):
+        first, last = record.get("pages") or (None, None)
+        authors = ", ".join(f"{a.given} {a.surname}" for a in parsed_authors(record.get("authors")))
+        yield {
+            "issue": label, "authors": authors or "N/A", "ukrainian_authors": record.get("ukrainian_authors"),
+            "title": record.get("english_title"), "original_title": record.get("ukrainian_title"),
+            "pages": f"{first}-{last}" if first is not None and last is not None else "N/A",
+            "doi": crossref_module.generate_doi(first) if first is not None else "N/A",
+        }
+
+
+def iter_entries(sources):
+    """Entries of every source in order: *.ndjson snapshots or crossref XML files."""
+    for path in sources:
+        yield from (iter_snapshot_entries(path) if path.endswith(".ndjson") else iter_crossref_entries(path))
+
+
+def create_cumulative_contents_docx(sources, output_path, ukrainian=False, journal_title=None):
+    """Write one contents table over all sources; returns the number of articles."""
+    doc = Document()
+    doc.add_paragraph("ЗМІСТ", style="Title")
+    if journal_title:
+        doc.add_paragraph(f"наукового журналу\n“{journal_title}”", style="Normal")
+
+    def rows():
+        for number, entry in enumerate(iter_entries(sources), start=1):
+            use_ukrainian = ukrainian and entry["ukrainian_authors"]
+            yield (
+                number, entry["issue"],
+                entry["ukrainian_authors"] if use_ukrainian else entry["authors"],
+                entry["original_title"] if ukrainian and entry["original_title"] else entry["title"],
+                entry["pages"], entry["doi"],
+            )
+
+    count = append_table(doc, HEADER, rows())
+    doc.save(output_path)
+    logger.info("Cumulative contents saved to %s", output_path, extra={"fields": {"articles": count}})
+    return count
+
+
+if __name__ == "__main__":
+    import yaml
+
+    from instrumentation.logging_setup import add_logging_arguments, configure_logging
+
+    parser = argparse.ArgumentParser(description="Cumulative table of contents over several issues.")
+    parser.add_argument("sources", nargs="+", help="Issue snapshots (issue.ndjson) or crossref.xml files, in order.")
+    parser.add_argument("--output", default=os.path.join("output", "cumulative_contents.docx"))
+    parser.add_argument("--ukrainian", action="store_true", help="Ukrainian authors and titles where available.")
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    configure_logging(quiet=args.quiet, verbose=args.verbose, log_format=args.log_format)
+    with open("config.yml", "r", encoding="utf-8") as f:
+        title = (yaml.safe_load(f).get("journal") or {}).get("full_title")
+    create_cumulative_contents_docx(args.sources, args.output, ukrainian=args.ukrainian, journal_title=title)
@@ -1,6 +1,10 @@
 from docx import Document
+import logging
 import os
 import lxml.etree as etree
+from docx_generation.table_writer import append_table
+
+logger = logging.getLogger(__name__)
 
 def parse_xml(xml_path):
     """Parse XML file and return its root element."""
@@ -64,33 +68,34 @@ def parse_journal_metadata(xml_data, nsmap):
 def parse_articles(xml_data, nsmap):
     """Extract articles with their authors, titles, pages, DOIs, and URLs from XML."""
     articles = xml_data.xpath('//ns:journal_article', namespaces=nsmap)
-    articles_data = []
+    return [article_row(i, article, nsmap) for i, article in enumerate(articles, start=1)]
+
 
-    for i, article in enumerate(articles, start=1):
-        title_node = article.find('ns:titles/ns:title', namespaces=nsmap)
-        title_text = title_node.text if title_node is not None else "N/A"
+def article_row(i, article, nsmap):
+    """(i, authors, title, original title, page range, URL, DOI) of one journal_article element."""
+    title_node = article.find('ns:titles/ns:title', namespaces=nsmap)
+    title_text = title_node.text if title_node is not None else "N/A"
 
-        original_title_node = article.find('ns:titles/ns:original_language_title', namespaces=nsmap)
-        original_language_title = original_title_node.text if original_title_node is not None else "N/A"
+    original_title_node = article.find('ns:titles/ns:original_language_title', namespaces=nsmap)
+    original_language_title = original_title_node.text if original_title_node is not None else "N/A"
 
-        authors = _contributors_display_string(article, nsmap)
+    authors = _contributors_display_string(article, nsmap)
 
-        # Extract pages
-        pages_node = article.find('ns:pages', namespaces=nsmap)
-        first_page = pages_node.find('ns:first_page', namespaces=nsmap).text if pages_node is not None and pages_node.find('ns:first_page', namespaces=nsmap) is not None else "N/A"
-        last_page = pages_node.find('ns:last_page', namespaces=nsmap).text if pages_node is not None and pages_node.find('ns:last_page', namespaces=nsmap) is not None else "N/A"
-        page_range = f"{first_page}-{last_page}" if first_page != "N/A" and last_page != "N/A" else "N/A"
+    # Extract pages
+    pages_node = article.find('ns:pages', namespaces=nsmap)
+    first_page = pages_node.find('ns:first_page', namespaces=nsmap).text if pages_node is not None and pages_node.find('ns:first_page', namespaces=nsmap) is not None else "N/A"
+    last_page = pages_node.find('ns:last_page', namespaces=nsmap).text if pages_node is not None and pages_node.find('ns:last_page', namespaces=nsmap) is not None else "N/A"
+    page_range = f"{first_page}-{last_page}" if first_page != "N/A" and last_page != "N/A" else "N/A"
 
-        # Extract article DOI and URL
-        url_node = article.find('ns:doi_data/ns:resource', namespaces=nsmap)
-        url_text = url_node.text if url_node is not None else "N/A"
+    # Extract article DOI and URL
+    url_node = article.find('ns:doi_data/ns:resource', namespaces=nsmap)
+    url_text = url_node.text if url_node is not None else "N/A"
 
-        doi_node = article.find('ns:doi_data/ns:doi', namespaces=nsmap)
-        doi_text = doi_node.text if doi_node is not None else "N/A"
+    doi_node = article.find('ns:doi_data/ns:doi', namespaces=nsmap)
+    doi_text = doi_node.text if doi_node is not None else "N/A"
 
-        articles_data.append((i, authors, title_text, original_language_title, page_range, url_text, doi_text))
+    return i, authors, title_text, original_language_title, page_range, url_text, doi_text
 
-    return articles_data
 
 def create_contents_docx(xml_name, output_path, ukrainian_authors=None):
     """Generate contents_eng.docx or contents_ukr.docx based on available data.
@@ -114,22 +119,15 @@ def create_contents_docx(xml_name, output_path, ukrainian_authors=None):
     )
 
     doc.add_paragraph("\n")
-    table = doc.add_table(rows=1, cols=3)
-    table.style = "Table Grid"
-
-    hdr_cells = table.rows[0].cells
-    hdr_cells[0].text = "№"
-    hdr_cells[1].text = "Автори"
-    hdr_cells[2].text = "Назви статей"
-
-    for idx, article in enumerate(articles_data):
-        row_cells = table.add_row().cells
-        row_cells[0].text = str(article[0])
-        row_cells[1].text = ukrainian_authors[idx] if ukrainian_authors and ukrainian_authors[idx] else article[1]
-        row_cells[2].text = article[3] if ukrainian_authors and ukrainian_authors[idx] else article[2] # use original title if ukr authors are present or normal title otherwise
+    # use original title if ukr authors are present or normal title otherwise
+    append_table(doc, ("№", "Автори", "Назви статей"), (
+        (article[0], ukrainian_authors[idx], article[3])
+        if ukrainian_authors and ukrainian_authors[idx] else (article[0], article[1], article[2])
+        for idx, article in enumerate(articles_data)
+    ))
 
     doc.save(output_path)
-    print(f"Contents document saved to {output_path}")
+    logger.info("Contents document saved to %s", output_path)
 
 
 def create_doi_letter_docx(xml_name, output_path):
@@ -150,27 +148,17 @@ def create_doi_letter_docx(xml_name, output_path):
 
     # Add a table for articles
     doc.add_paragraph("\nArticles:\n")
-    table = doc.add_table(rows=1, cols=4)
-    table.style = "Table Grid"
-
-    # Define table headers
-    hdr_cells = table.rows[0].cells
-    hdr_cells[0].text = "№"
-    hdr_cells[1].text = "Authors, Title, and URL"
-    hdr_cells[2].text = "Pages"
-    hdr_cells[3].text = "DOI"
-
-    for article in articles_data:
-        row_cells = table.add_row().cells
-        row_cells[0].text = str(article[0])  # Article number
-        row_cells[1].text = f"{article[1]}. {article[2]}\n{article[5]}"  # Authors, title, and URL
-        row_cells[2].text = article[4]  # Pages
-        row_cells[3].text = article[6]  # DOI
+    # Number; authors, title and URL; pages; DOI
+    append_table(doc, ("№", "Authors, Title, and URL", "Pages", "DOI"), (
+        (article[0], f"{article[1]}. {article[2]}\n{article[5]}", article[4], article[6])
+        for article in articles_data
+    ))
 
     doc.save(output_path)
-    print(f"DOI Letter document saved to {output_path}")
+    logger.info("DOI Letter document saved to %s", output_path)
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     current_dir = os.path.dirname(os.path.abspath(__file__))
     root_dir = os.path.dirname(current_dir)
     output_dir = os.path.join(root_dir, "output")
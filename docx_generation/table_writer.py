@@ -0,0 +1,68 @@
+"""Write DOCX tables as w:tbl XML directly.
+
+python-docx's table.add_row().cells re-reads the whole grid on every call,
+so a table gets slower with every row. append_table() lets python-docx
+create the table (style, tblPr, tblGrid) in the loaded document, then
+serializes the w:tr rows and parses them with lxml in batches of
+ROWS_PER_BATCH. The rows can come from any iterable, so they can be
+streamed from a parsed crossref.xml or an issue snapshot. Cell text follows
+python-docx's rules: "\\n" becomes <w:br/>, "\\t" becomes <w:tab/>, and
+surrounding whitespace is kept with xml:space="preserve".
+"""
+
+from docx.oxml.ns import nsdecls, qn
+from lxml import etree
+
+W_W = qn("w:w")
+ROWS_PER_BATCH = 500
+
+_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
+
+def _text_xml(text):
+    parts = []
+    for line_number, line in enumerate(text.split("\n")):
+        if line_number:
+            parts.append("<w:br/>")
+        for tab_number, piece in enumerate(line.split("\t")):
+            if tab_number:
+                parts.append("<w:tab/>")
+            if piece:
+                space = ' xml:space="preserve"' if piece != piece.strip() else ""
+                parts.append(f"<w:t{space}>{piece.translate(_ESCAPES)}</w:t>")
+    return "".join(parts)
+
+
+def row_xml(cells, widths):
+    """Serialized w:tr with the given cell texts (column widths in twips)."""
+    parts = ["<w:tr>"]
+    for text, width in zip(cells, widths):
+        text = "" if text is None else str(text)
+        run = f"<w:r>{_text_xml(text)}</w:r>" if text else "<w:r/>"
+        parts.append(f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{width}"/></w:tcPr><w:p>{run}</w:p></w:tc>')
+    parts.append("</w:tr>")
+    return "".join(parts)
+
+
+def _append_rows(tbl, rows_xml):
+    fragment = etree.fromstring(f"<w:tbl {nsdecls('w')}>{''.join(rows_xml)}</w:tbl>")
+    tbl.extend(fragment)
+
+
+def append_table(doc, header, rows, style="Table Grid"):
+    """Add a table with a header row and the given rows (iterables of cell texts); returns the row count."""
+    table = doc.add_table(rows=0, cols=len(header))
+    table.style = style
+    tbl = table._tbl
+    widths = [grid_col.get(W_W) for grid_col in tbl.tblGrid.iterchildren(qn("w:gridCol"))]
+    batch = [row_xml(header, widths)]
+    count = 0
+    for row in rows:
+        batch.append(row_xml(row, widths))
+        count += 1
+        if len(batch) >= ROWS_PER_BATCH:
+            _append_rows(tbl, batch)
+            batch = []
+    if batch:
+        _append_rows(tbl, batch)
+    return count
@@ -0,0 +1,104 @@
+from instrumentation.tracing import span
+from .parse import iter_docs
+from .extractors import (
+    extract_ukrainian_title,
+    extract_literature,
+    extract_english_title,
+    extract_authors,
+    extract_abstract,
+    extract_affiliation_lines,
+    extract_author_orcids,
+    align_author_orcids,
+)
+
+
+def _traced(extractor, *args):
+    with span(extractor.__name__, cat="extract"):
+        return extractor(*args)
+
+
+def extract_article(paragraphs, start_page, end_page):
+    """Extract one article's metadata from its paragraphs.
+
+    Returns (article, ukrainian_authors) where article has the tuple shape consumed by
+    create_full_xml / create_ici_copernicus_xml:
+    (english_title, ukrainian_title, authors, (start_page, end_page), references,
+     abstract, affiliation_lines, author_orcids).
+    """
+    ukrainian_title = _traced(extract_ukrainian_title, paragraphs).upper()
+    literature_references = _traced(extract_literature, paragraphs)
+    english_title = _traced(extract_english_title, paragraphs, literature_references).upper()
+    affiliation_lines = _traced(extract_affiliation_lines, paragraphs, literature_references)
+    authors_text = _traced(extract_authors, paragraphs)
+    author_orcids = align_author_orcids(
+        authors_text,
+        _traced(extract_author_orcids, paragraphs, literature_references),
+    )
+    authors_ukrainian_text = _traced(extract_authors, paragraphs, True)
+    abstract_text = _traced(extract_abstract, paragraphs)
+
+    article = (
+        english_title,
+        ukrainian_title,
+        authors_text,
+        (start_page, end_page),
+        literature_references,
+        abstract_text,
+        affiliation_lines,
+        author_orcids,
+    )
+    return article, authors_ukrainian_text
+
+
+def extract_document(filename, paragraphs, start_page, end_page):
+    """extract_article for one parsed DOCX, traced as its "extract" span."""
+    with span("extract", cat="extract", file=filename, paragraphs=len(paragraphs)) as attrs:
+        article, authors_ukrainian_text = extract_article(paragraphs, start_page, end_page)
+        attrs["references"] = len(article[4])
+    return article, authors_ukrainian_text
+
+
+def iter_articles(directory_path):
+    """Yields (filename, article, ukrainian_authors) one DOCX at a time.
+
+    Each document's raw paragraphs are released (here and in iter_docs) as soon
+    as its metadata is extracted, before the next file is parsed, so peak memory
+    follows the largest article, not the whole issue.
+    """
+    for filename, paragraphs, start_page, end_page in iter_docs(directory_path):
+        article, authors_ukrainian_text = extract_document(filename, paragraphs, start_page, end_page)
+        del paragraphs
+        yield filename, article, authors_ukrainian_text
+
+
+# Field names of the article tuple, in order.
+ARTICLE_FIELDS = (
+    "english_title",
+    "ukrainian_title",
+    "authors",
+    "pages",
+    "references",
+    "abstract",
+    "affiliation_lines",
+    "author_orcids",
+)
+
+
+def article_to_record(article, **extra):
+    """JSON-friendly dict for an article tuple (plus optional extra keys such as source file)."""
+    record = dict(zip(ARTICLE_FIELDS, article))
+    if record.get("pages") is not None:
+        record["pages"] = list(record["pages"])
+    record.update(extra)
+    return record
+
+
+def article_from_record(record, pages=None):
+    """Article tuple from a record; ``pages`` overrides the stored (start, end) range."""
+    values = []
+    for field in ARTICLE_FIELDS:
+        value = record.get(field)
+        if field == "pages":
+            value = tuple(pages if pages is not None else value or (None, None))
+        values.append(value)
+    return tuple(values)
@@ -0,0 +1,91 @@
+"""Author names from the © line, parsed once and shared by every consumer.
+
+Crossref contributors, Copernicus <authors> and the anonymizer all read the
+same author strings. They go through this module: precompiled patterns, and
+LRU memos keyed by the raw string (the same authors recur across articles and
+issues), so each distinct line or name is parsed once per process.
+
+    parse_author_line("Havano N. I., V.S. Ivkova")
+    → (AuthorName(raw='Havano N. I.', given='N I', surname='Havano'),
+       AuthorName(raw='V.S. Ivkova', given='V S', surname='Ivkova'))
+
+Entries are None where a name could not be parsed, so positions stay aligned
+with per-author data such as ORCIDs.
+"""
+
+import functools
+import re
+from typing import NamedTuple
+
+AUTHORS_NOT_FOUND = "Authors not found."
+
+_LETTER = "A-Za-zА-ЯІЇЄҐа-яіїєґ"
+_NAME = f"[{_LETTER}'\\-]"
+
+TRAILING_YEAR_RE = re.compile(r"\s+\d{4}$")
+SEPARATOR_RE = re.compile(r"\s*(?:,|;| and | та |&)\s*")
+# I. V. Tyshko / I.V. Teleshko
+INITIALS_FIRST_RE = re.compile(rf"^((?:[{_LETTER}]\.){{1,4}})\s*({_NAME}{{2,}})$")
+# Tyshyk I. Y. / Arseniuk V.
+SURNAME_FIRST_RE = re.compile(rf"^({_NAME}{{2,}})\s+((?:[{_LETTER}]\.\s*){{1,4}})$")
+# Ivan Tyshyk (full first + surname)
+FULL_NAME_RE = re.compile(rf"^([A-Z][a-zА-ЯІЇЄҐа-яіїєґ'\-]+)\s+([A-Z][A-Za-zА-ЯІЇЄҐа-яіїєґ'\-]{{1,}})$")
+INITIAL_RE = re.compile(f"[{_LETTER}]")
+WHITESPACE_RE = re.compile(r"\s+")
+DIGITS_RE = re.compile(r"\d+")
+
+
+class AuthorName(NamedTuple):
+    raw: str
+    given: str
+    surname: str
+
+
+def split_authors(authors_text):
+    """Author strings of a © line, in order (year and the 'not found' placeholder removed)."""
+    if not authors_text or authors_text.strip() == AUTHORS_NOT_FOUND:
+        return []
+    text = TRAILING_YEAR_RE.sub("", authors_text.strip()).strip()
+    return [part.strip() for part in SEPARATOR_RE.split(text) if part.strip()]
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_author_name(author):
+    """One author string → AuthorName, or None when no given name and surname can be found."""
+    t = author.strip()
+    if not t:
+        return None
+    m = INITIALS_FIRST_RE.match(t)
+    if m:
+        given, surname = " ".join(INITIAL_RE.findall(m.group(1))), m.group(2)
+    elif (m := SURNAME_FIRST_RE.match(t)):
+        given, surname = " ".join(INITIAL_RE.findall(m.group(2))), m.group(1)
+    elif (m := FULL_NAME_RE.match(t)):
+        given, surname = m.group(1), m.group(2)
+    else:
+        # Fallback: first token surname, rest given (legacy)
+        parts = WHITESPACE_RE.split(t)
+        if len(parts) < 2:
+            return None
+        given, surname = " ".join(parts[1:]), parts[0]
+    given = DIGITS_RE.sub("", given).strip()
+    surname = surname.strip()
+    if not given or not surname:
+        return None
+    return AuthorName(t, given, surname)
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_author_line(authors_text):
+    """Tuple of Optional[AuthorName] for every author of a © line."""
+    return tuple(parse_author_name(author) for author in split_authors(authors_text))
+
+
+def parse_authors(authors_texts):
+    """Batch form of parse_author_line: one tuple per input string."""
+    return [parse_author_line(text or "") for text in authors_texts]
+
+
+def parsed_authors(authors_text):
+    """The authors of a line that could be parsed (positions not preserved)."""
+    return [author for author in parse_author_line(authors_text or "") if author is not None]
@@ -1,5 +1,7 @@
 import re
 
+from docx_processing.author_names import split_authors
+
 AFFILIATION_KEYWORDS_RE = re.compile(
     r"\b(university|institute|department|dept\.?|faculty|academy|college|laboratory|centre|center)\b"
     r"|\b(університет|інститут|кафедра|факультет|академія|коледж|лабораторія|центр)\b",
@@ -209,11 +211,8 @@ def extract_orcids_from_comma_separated_line(text):
 
 
 def split_copyright_authors(authors_text):
-    """Split ©-line authors on commas (same order as in the DOCX)."""
-    if not authors_text or authors_text.strip() == "Authors not found.":
-        return []
-    text = re.sub(r"\s\d{4}$", "", authors_text.strip()).strip()
-    return [part.strip() for part in text.split(",") if part.strip()]
+    """Split ©-line authors (same order as in the DOCX; see docx_processing.author_names)."""
+    return split_authors(authors_text)
 
 
 def align_author_orcids(authors_text, raw_orcids):
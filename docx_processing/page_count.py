@@ -1,6 +1,9 @@
+import logging
 import zipfile
 import xml.dom.minidom
 
+logger = logging.getLogger(__name__)
+
 def get_page_count_from_metadata(docx_path):
     """Gets the page count from the document metadata."""
     try:
@@ -10,5 +13,5 @@ def get_page_count_from_metadata(docx_path):
             page_count = int(uglyXml.getElementsByTagName('Pages')[0].childNodes[0].nodeValue)
             return page_count
     except Exception as e:
-        print(f"Error reading page count from metadata: {e}")
+        logger.warning("Error reading page count from metadata of %s: %s", docx_path, e)
         return 1  # Default to 1 page if metadata is not available or an error occurs
@@ -1,6 +1,7 @@
 import os
 from docx import Document
 import locale
+from instrumentation.tracing import span
 from .page_count import get_page_count_from_metadata
 
 def parse_docx(docx_path):
@@ -24,21 +25,37 @@ def ukrainian_sort_key(filename):
     # Replace each character with its position in the alphabet, or a high value if not found
     return [alphabet_order.get(char, len(UKRAINIAN_ALPHABET)) for char in filename]
 
-def process_multiple_docs(directory_path):
-    """Processes multiple DOCX files in the given directory."""
-    all_paragraphs = []
-    current_page = 1
+def list_docx_files(directory_path):
+    """DOCX filenames in the directory, in issue (Ukrainian alphabetical) order."""
+    return sorted([f for f in os.listdir(directory_path) if f.endswith(".docx")], key=ukrainian_sort_key)
 
-    # Get the list of files in the directory and sort them using the Ukrainian sorting key
-    filenames = sorted([f for f in os.listdir(directory_path) if f.endswith(".docx")], key=ukrainian_sort_key)
+def iter_docs(directory_path, cached=None):
+    """Yields (filename, paragraphs, start_page, end_page) one DOCX at a time.
 
-    for filename in filenames:
-        if filename.endswith(".docx"):
+    Page numbers are cumulative across the issue. cached, if given, is called
+    with each filename and returns the page count of a file that need not be
+    parsed again (its paragraphs are then None), or None to parse it. The
+    generator keeps no reference to a yielded paragraph list once it is
+    resumed, so only the documents the consumer still holds stay in memory.
+    """
+    current_page = 1
+    for filename in list_docx_files(directory_path):
+        page_count = cached(filename) if cached is not None else None
+        paragraphs = None
+        if page_count is None:
             docx_path = os.path.join(directory_path, filename)
-            paragraphs, page_count = parse_docx(docx_path)
-            start_page = current_page
-            end_page = current_page + page_count - 1
-            current_page = end_page + 1
-            all_paragraphs.append((filename, paragraphs, start_page, end_page))
+            with span("parse_docx", cat="ingest", file=filename, file_size=os.path.getsize(docx_path)) as attrs:
+                paragraphs, page_count = parse_docx(docx_path)
+                attrs["paragraphs"] = len(paragraphs)
+                attrs["pages"] = page_count
+        start_page = current_page
+        end_page = current_page + page_count - 1
+        current_page = end_page + 1
+        yield filename, paragraphs, start_page, end_page
+        # Drop this frame's reference before parsing the next file, so the list
+        # is freed as soon as the consumer lets go of it.
+        del paragraphs
 
-    return all_paragraphs
+def process_multiple_docs(directory_path):
+    """Processes multiple DOCX files in the given directory."""
+    return list(iter_docs(directory_path))
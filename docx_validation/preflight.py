@@ -0,0 +1,200 @@
+"""Preflight lint of an extracted issue, before any XML is emitted.
+
+Checks (the "check" value of each problem):
+  placeholder             a "... not found." value left by the extractors
+  orcid_missing           an author without an ORCID iD
+  orcid_checksum          an ORCID iD whose ISO 7064 Mod 11-2 check character is wrong
+  institution_unresolved  no affiliation line, or one that matches no entry of config "institutions"
+                          (crossref.xml would fall back to crossref.default_institution)
+  pages_missing / pages_invalid / page_gap / page_overlap
+                          page ranges that are absent, reversed, or not contiguous in issue order
+  duplicate_doi           articles that get the same DOI from generate_doi (same first page)
+
+The per-article checks run in a process pool when workers > 1; ORCID
+checksums, page continuity and DOI collisions are computed for the whole
+issue at once with NumPy. All problems go into one report.
+
+    python -m docx_validation.preflight output/issue.ndjson [--output output/preflight.json] [--jobs N]
+
+exits with 1 when there is any problem. The preflight build stage writes
+output/preflight.json and, with app.preflight_strict, stops the build.
+"""
+
+import argparse
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from docx_processing.author_names import split_authors
+from docx_processing.extractors import ORCID_ID_RE, affiliation_lines_for_crossref_organization
+from xml_generation.crossref.institution_ror import resolve_institution
+
+PLACEHOLDER_SUFFIX = "not found."
+PLACEHOLDER_FIELDS = (
+    ("english_title", 0), ("ukrainian_title", 1), ("authors", 2), ("abstract", 5),
+)
+# Weights of the 15 ORCID digits in ISO 7064 Mod 11-2: 2^15 ... 2^1, reduced mod 11.
+ORCID_WEIGHTS = np.array([pow(2, 15 - i, 11) for i in range(15)], dtype=np.int64)
+
+
+class PreflightError(Exception):
+    pass
+
+
+def _problem(check, position, article, message, **fields):
+    first_page = article[3][0] if article[3] else None
+    return {"check": check, "article": position, "first_page": first_page, "title": article[0],
+            "message": message, **fields}
+
+
+def check_article(item, institutions=None, default_institution=None) -> List[Dict[str, object]]:
+    """Problems of one (position, article tuple, Ukrainian authors) item that need only that article."""
+    position, article, ukrainian_authors = item
+    problems = []
+    values = [(name, article[index]) for name, index in PLACEHOLDER_FIELDS]
+    values.append(("ukrainian_authors", ukrainian_authors))
+    for name, value in values:
+        if isinstance(value, str) and value.strip().lower().endswith(PLACEHOLDER_SUFFIX):
+            problems.append(_problem("placeholder", position, article, f"{name}: {value.strip()}", field=name))
+
+    orcids = list(article[7] or [])
+    for number, author in enumerate(split_authors(article[2] or ""), start=1):
+        if number > len(orcids) or not orcids[number - 1]:
+            problems.append(_problem("orcid_missing", position, article, f"no ORCID for {author}", author=author))
+
+    org_lines = affiliation_lines_for_crossref_organization(article[6] or [])
+    if not org_lines:
+        problems.append(_problem("institution_unresolved", position, article, "no institution line",
+                                 fallback=default_institution))
+    elif resolve_institution(org_lines[0], institutions or {}) is None:
+        problems.append(_problem("institution_unresolved", position, article, f"unknown institution: {org_lines[0]}",
+                                 line=org_lines[0], fallback=default_institution))
+    return problems
+
+
+def orcid_checksums_ok(orcids: Sequence[str]) -> np.ndarray:
+    """Boolean array: ISO 7064 Mod 11-2 check character of each 0000-0000-0000-000X iD is right."""
+    if not orcids:
+        return np.zeros(0, dtype=bool)
+    compact = np.array([list(orcid.replace("-", "").upper()) for orcid in orcids])
+    digits = compact[:, :15].astype(np.int64)
+    total = digits @ ORCID_WEIGHTS
+    check = (12 - total % 11) % 11
+    expected = np.where(check == 10, "X", check.astype(str))
+    return expected == compact[:, 15]
+
+
+def _orcid_problems(articles):
+    found = []  # (position, author number, iD)
+    for position, article in enumerate(articles):
+        for number, orcid in enumerate(article[7] or [], start=1):
+            match = ORCID_ID_RE.search(orcid or "")
+            if match:
+                found.append((position, number, match.group(1)))
+            elif orcid:
+                found.append((position, number, None))
+    ids = [orcid for _, _, orcid in found if orcid]
+    valid = iter(orcid_checksums_ok(ids))
+    problems = []
+    for position, number, orcid in found:
+        if orcid is None or not next(valid):
+            problems.append(_problem("orcid_checksum", position, articles[position],
+                                     f"invalid ORCID iD {articles[position][7][number - 1]}", author_number=number))
+    return problems
+
+
+def _page_problems(articles):
+    problems = []
+    positions = []
+    for position, article in enumerate(articles):
+        first, last = article[3] if article[3] else (None, None)
+        if first is None or last is None:
+            problems.append(_problem("pages_missing", position, article, "no page range"))
+        elif first > last:
+            problems.append(_problem("pages_invalid", position, article, f"page range {first}-{last}"))
+        else:
+            positions.append(position)
+    if len(positions) < 2:
+        return problems
+    starts = np.array([articles[p][3][0] for p in positions])
+    ends = np.array([articles[p][3][1] for p in positions])
+    gaps = starts[1:] - ends[:-1] - 1
+    for index in np.flatnonzero(gaps):
+        previous, position = positions[index], positions[index + 1]
+        check = "page_gap" if gaps[index] > 0 else "page_overlap"
+        problems.append(_problem(
+            check, position, articles[position],
+            f"starts at {starts[index + 1]}, previous article ends at {ends[index]}",
+            previous_article=previous,
+        ))
+    return problems
+
+
+def _doi_problems(articles, generate_doi):
+    dois = np.array([
+        generate_doi(article[3][0]) if article[3] and article[3][0] is not None else "" for article in articles
+    ])
+    problems = []
+    values, inverse, counts = np.unique(dois, return_inverse=True, return_counts=True)
+    for position in np.flatnonzero((counts[inverse] > 1) & (dois != "")):
+        others = [int(p) for p in np.flatnonzero(dois == dois[position]) if p != position]
+        problems.append(_problem("duplicate_doi", int(position), articles[position], f"DOI {dois[position]}",
+                                 doi=str(dois[position]), same_as=others))
+    return problems
+
+
+def lint(articles, ukrainian_authors, config, workers=0) -> Dict[str, object]:
+    """Report dict with every problem of the issue (articles as article tuples, config as in config.yml)."""
+    import xml_generation.crossref.create_crossref_xml as crossref_module
+
+    crossref_module.apply_config(config)
+    ukrainian_authors = list(ukrainian_authors or [None] * len(articles))
+    check = partial(
+        check_article,
+        institutions=config.get("institutions") or {},
+        default_institution=(config.get("crossref") or {}).get("default_institution"),
+    )
+    items = list(zip(range(len(articles)), articles, ukrainian_authors))
+    if workers > 1 and len(items) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            per_article = list(pool.map(check, items, chunksize=max(1, len(items) // (workers * 4))))
+    else:
+        per_article = [check(item) for item in items]
+
+    problems = [problem for found in per_article for problem in found]
+    problems += _orcid_problems(articles)
+    problems += _page_problems(articles)
+    problems += _doi_problems(articles, crossref_module.generate_doi)
+    problems.sort(key=lambda problem: (problem["article"], problem["check"]))
+    return {
+        "articles": len(articles),
+        "problems": problems,
+        "counts": dict(sorted(Counter(problem["check"] for problem in problems).items())),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from pipeline.dag import write_json_atomic
+    from pipeline.snapshot import load_articles, read_header
+
+    parser = argparse.ArgumentParser(description="Lint an issue snapshot before emitting XML.")
+    parser.add_argument("snapshot", help="Issue snapshot (output/issue.ndjson).")
+    parser.add_argument("--output", help="Write the JSON report to this path.")
+    parser.add_argument("--jobs", type=int, default=0, help="Worker processes for the per-article checks.")
+    args = parser.parse_args(argv)
+
+    articles, ukrainian_authors = load_articles(args.snapshot)
+    report = lint(articles, ukrainian_authors, read_header(args.snapshot)["config"], workers=args.jobs)
+    for problem in report["problems"]:
+        print(f"p.{problem['first_page']}\t{problem['check']}\t{problem['message']}")
+    if args.output:
+        write_json_atomic(args.output, report, indent=2)
+    return 1 if report["problems"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
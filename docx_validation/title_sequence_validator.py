@@ -1,7 +1,31 @@
-from docx import Document
+"""Check that submissions contain the template's main sections, in order.
+
+Body paragraphs are read straight from word/document.xml with lxml (the
+same paragraphs as python-docx's document.paragraphs, without loading the
+whole package) and each is normalized once. Section titles are indexed as
+title → paragraph positions, so presence is a dict lookup. The order check
+takes the longest run of sections, one occurrence each, that appear in
+template order (a longest increasing subsequence over all occurrences) and
+reports only the sections outside it, so a title repeated earlier (e.g. in
+a table of contents) does not count as out of order and one misplaced
+section does not make the others look misplaced. Files are checked in a
+process pool; the results can be written as JSON and CSV reports.
+
+    python -m docx_validation.title_sequence_validator INTAKE_FOLDER [--json report.json] [--csv report.csv] [--jobs N]
+"""
+
+import argparse
+import csv
+import json
 import os
 import re
-from typing import List, Tuple
+import sys
+import zipfile
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from lxml import etree
 
 # Canonical titles from template
 REQUIRED_SECTIONS = [
@@ -12,51 +36,197 @@ REQUIRED_SECTIONS = [
     "Висновки",
     "Список літератури",
 ]
+_REQUIRED = frozenset(REQUIRED_SECTIONS)
+
+_SPACES_RE = re.compile(r"\s+")
+_NUMBERING_RE = re.compile(r"^\d+(\.\d+)*[.)]?\s*")
+
+_W_NS = {"w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"}
+# What python-docx's Paragraph.text reads: runs directly in the paragraph or in a hyperlink;
+# tabs and breaks count as whitespace, which _normalize collapses anyway.
+_RUN_CONTENT = etree.XPath(
+    "(./w:r | ./w:hyperlink/w:r)/*[self::w:t or self::w:tab or self::w:br or self::w:cr]", namespaces=_W_NS
+)
+_W_T = f"{{{_W_NS['w']}}}t"
+
+CSV_FIELDS = ("file", "ok", "missing", "out_of_order", "positions", "error")
+
 
 def _normalize(s: str) -> str:
     """Normalize text: trim, collapse spaces, drop leading numbering like '3. ' or '2.1 '."""
     s = s.replace("\u00A0", " ")  # NBSP → space
-    s = s.strip()
-    s = re.sub(r"\s+", " ", s)
+    s = _SPACES_RE.sub(" ", s.strip())
     # Remove leading numbering patterns: 1. , 2.1 , 3) etc.
-    s = re.sub(r"^\d+(\.\d+)*[.)]?\s*", "", s)
-    return s
+    return _NUMBERING_RE.sub("", s)
+
+
+def _paragraph_text(paragraph) -> str:
+    return "".join((node.text or "") if node.tag == _W_T else " " for node in _RUN_CONTENT(paragraph))
+
 
 def extract_paragraph_texts(docx_path: str) -> List[str]:
-    doc = Document(docx_path)
-    return [_normalize(p.text) for p in doc.paragraphs if _normalize(p.text)]
+    """Normalized, non-empty texts of the body paragraphs (python-docx's document.paragraphs)."""
+    with zipfile.ZipFile(docx_path) as archive:
+        root = etree.fromstring(archive.read("word/document.xml"))
+    body = root.find("w:body", _W_NS)
+    texts = (_normalize(_paragraph_text(p)) for p in body.iterfind("w:p", _W_NS))
+    return [text for text in texts if text]
 
-def check_main_sections_present(docx_path: str) -> Tuple[List[str], List[str]]:
-    paras = extract_paragraph_texts(docx_path)
-    present, missing = [], []
-    for title in REQUIRED_SECTIONS:
-        if title in paras:
-            present.append(title)
+
+def section_positions(paras: List[str]) -> Dict[str, List[int]]:
+    """Required section title → positions (ascending) of the paragraphs equal to it."""
+    positions: Dict[str, List[int]] = {}
+    for position, text in enumerate(paras):
+        if text in _REQUIRED:
+            positions.setdefault(text, []).append(position)
+    return positions
+
+
+def check_sequence(positions: Dict[str, List[int]]) -> Tuple[Dict[str, int], List[str]]:
+    """(title → position used, titles out of order) for the present sections, in template order.
+
+    Sections in the longest in-order subsequence use their position in it; the others are out of
+    order and use their first occurrence.
+    """
+    candidates = sorted(
+        (position, index) for index, title in enumerate(REQUIRED_SECTIONS) for position in positions.get(title, ())
+    )
+    # Patience sorting on the template index: tails[k] ends the best in-order run of length k + 1.
+    tails: List[int] = []
+    tail_indexes: List[int] = []
+    previous: List[Optional[int]] = []
+    for candidate, (_, index) in enumerate(candidates):
+        length = bisect_left(tail_indexes, index)
+        previous.append(tails[length - 1] if length else None)
+        if length == len(tails):
+            tails.append(candidate)
+            tail_indexes.append(index)
         else:
-            missing.append(title)
+            tails[length] = candidate
+            tail_indexes[length] = index
+    in_order: Dict[str, int] = {}
+    candidate = tails[-1] if tails else None
+    while candidate is not None:
+        position, index = candidates[candidate]
+        in_order[REQUIRED_SECTIONS[index]] = position
+        candidate = previous[candidate]
+
+    used: Dict[str, int] = {}
+    out_of_order = []
+    for title in REQUIRED_SECTIONS:
+        if title in in_order:
+            used[title] = in_order[title]
+        elif positions.get(title):
+            used[title] = positions[title][0]
+            out_of_order.append(title)
+    return used, out_of_order
+
+
+def check_main_sections_present(docx_path: str) -> Tuple[List[str], List[str]]:
+    positions = section_positions(extract_paragraph_texts(docx_path))
+    present = [title for title in REQUIRED_SECTIONS if title in positions]
+    missing = [title for title in REQUIRED_SECTIONS if title not in positions]
     return present, missing
 
+
+def check_file(docx_path: str) -> Dict[str, object]:
+    """Result dict for one file: missing and out-of-order sections, positions, or the read error."""
+    result: Dict[str, object] = {
+        "file": os.path.basename(docx_path), "ok": False, "missing": [], "out_of_order": [], "positions": {},
+        "error": None,
+    }
+    try:
+        positions = section_positions(extract_paragraph_texts(docx_path))
+    except Exception as exc:  # a broken upload should not stop the rest of the intake
+        result["error"] = f"{type(exc).__name__}: {exc}"
+        return result
+    used, out_of_order = check_sequence(positions)
+    result["missing"] = [title for title in REQUIRED_SECTIONS if title not in positions]
+    result["out_of_order"] = out_of_order
+    result["positions"] = used
+    result["ok"] = not result["missing"] and not out_of_order
+    return result
+
+
+def format_report(result: Dict[str, object]) -> str:
+    lines = [f"Документ: {result['file']}"]
+    if result["error"]:
+        lines.append(f"❌ Не вдалося прочитати: {result['error']}")
+    if result["missing"]:
+        lines.append(f"❌ Відсутні розділи: {', '.join(result['missing'])}")
+    if result["out_of_order"]:
+        lines.append(f"❌ Порушено порядок розділів: {', '.join(result['out_of_order'])}")
+    if result["ok"]:
+        lines.append("✅ Усі розділи присутні й у правильному порядку")
+    return "\n".join(lines) + "\n"
+
+
 def report_for_file(docx_path: str) -> str:
-    present, missing = check_main_sections_present(docx_path)
-    if missing:
-        return (
-            f"Документ: {os.path.basename(docx_path)}\n"
-            f"❌ Відсутні розділи: {', '.join(missing)}\n"
-        )
-    else:
-        return (
-            f"Документ: {os.path.basename(docx_path)}\n"
-            f"✅ Усі розділи присутні\n"
-        )
-
-def validate_folder(folder_path: str) -> List[str]:
-    reports = []
-    for name in sorted(os.listdir(folder_path)):
-        if name.lower().endswith(".docx"):
-            reports.append(report_for_file(os.path.join(folder_path, name)))
-    return reports
+    return format_report(check_file(docx_path))
+
+
+def validate_files(paths: List[str], workers: Optional[int] = None) -> List[Dict[str, object]]:
+    """check_file for every path, in a process pool when there is more than one worker and file."""
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(paths) < 2:
+        return [check_file(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+        return list(pool.map(check_file, paths, chunksize=max(1, len(paths) // (workers * 4))))
+
+
+def docx_paths(folder_path: str) -> List[str]:
+    return [
+        os.path.join(folder_path, name)
+        for name in sorted(os.listdir(folder_path))
+        if name.lower().endswith(".docx") and not name.startswith("~$")
+    ]
+
+
+def validate_folder(folder_path: str, workers: Optional[int] = None) -> List[str]:
+    return [format_report(result) for result in validate_files(docx_paths(folder_path), workers)]
+
+
+def write_json_report(results: List[Dict[str, object]], path: str) -> None:
+    summary = {
+        "files": len(results), "ok": sum(1 for r in results if r["ok"]),
+        "required_sections": REQUIRED_SECTIONS, "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+
+def write_csv_report(results: List[Dict[str, object]], path: str) -> None:
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for result in results:
+            writer.writerow({
+                "file": result["file"], "ok": int(bool(result["ok"])),
+                "missing": "; ".join(result["missing"]), "out_of_order": "; ".join(result["out_of_order"]),
+                "positions": "; ".join(f"{title}={position}" for title, position in result["positions"].items()),
+                "error": result["error"] or "",
+            })
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check the main sections of every DOCX in an intake folder.")
+    parser.add_argument("folder")
+    parser.add_argument("--json", help="Write a JSON report to this path.")
+    parser.add_argument("--csv", help="Write a CSV report to this path.")
+    parser.add_argument("--jobs", type=int, help="Worker processes (default: CPU count).")
+    parser.add_argument("--quiet", action="store_true", help="Print only the files with problems.")
+    args = parser.parse_args(argv)
+
+    results = validate_files(docx_paths(args.folder), args.jobs)
+    for result in results:
+        if not (args.quiet and result["ok"]):
+            print(format_report(result))
+    if args.json:
+        write_json_report(results, args.json)
+    if args.csv:
+        write_csv_report(results, args.csv)
+    return 0 if all(result["ok"] for result in results) else 1
+
 
 if __name__ == "__main__":
-    FOLDER_PATH = ""
-    for rep in validate_folder(FOLDER_PATH):
-        print(rep)
+    sys.exit(main())
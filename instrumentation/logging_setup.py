@@ -0,0 +1,84 @@
+"""Leveled, buffered logging for pipeline runs (text or one-JSON-object-per-line)."""
+
+import json
+import logging
+import logging.handlers
+import sys
+
+TEXT_FORMAT = "%(levelname)s %(name)s: %(message)s"
+# Records are held in memory and written in batches; WARNING and above flush immediately.
+BUFFER_CAPACITY = 200
+
+
+class CompactTextFormatter(logging.Formatter):
+    """Text lines with structured fields appended as key=value pairs."""
+
+    def format(self, record):
+        line = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + " ".join(f"{k}={_compact(v)}" for k, v in fields.items())
+        return line
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record; structured fields are merged into the object."""
+
+    def format(self, record):
+        payload = {
+            "ts": round(record.created, 3),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            payload.update(fields)
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def _compact(value):
+    if isinstance(value, str):
+        return json.dumps(value, ensure_ascii=False) if " " in value else value
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def configure_logging(quiet=False, verbose=False, log_format="text", stream=None):
+    """Install a buffered handler on the root logger.
+
+    quiet → WARNING and above only; verbose → DEBUG (full per-article dumps); otherwise INFO.
+    """
+    level = logging.WARNING if quiet else logging.DEBUG if verbose else logging.INFO
+    target = logging.StreamHandler(stream or sys.stderr)
+    if log_format == "json":
+        target.setFormatter(JsonFormatter())
+    else:
+        target.setFormatter(CompactTextFormatter(TEXT_FORMAT))
+    handler = logging.handlers.MemoryHandler(
+        BUFFER_CAPACITY, flushLevel=logging.WARNING, target=target
+    )
+
+    root = logging.getLogger()
+    for old in list(root.handlers):
+        root.removeHandler(old)
+        old.close()
+    root.addHandler(handler)
+    root.setLevel(level)
+    return handler
+
+
+def add_logging_arguments(parser):
+    """--quiet / --verbose / --log-format options shared by the command-line entry points."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("-q", "--quiet", action="store_true", help="Only log warnings and errors.")
+    group.add_argument(
+        "-v", "--verbose", action="store_true",
+        help="Debug logging, including full abstracts, references and affiliations per article.",
+    )
+    parser.add_argument(
+        "--log-format", choices=("text", "json"), default="text",
+        help="Log record format (json: one object per line).",
+    )
+    return parser
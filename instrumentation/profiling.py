@@ -0,0 +1,247 @@
+"""Per-stage CPU (cProfile) and memory (tracemalloc) profiling for pipeline runs.
+
+The profiler hooks into instrumentation.tracing spans and treats the span
+category as the stage name (ingest, extract, page_injection, preflight,
+doi_check, near_duplicates, crossref, copernicus, doi_letter, contents).
+Nested spans of the same category stay in the enclosing stage; entering a
+different stage pauses the outer one, so every function call is attributed
+to exactly one stage. In mem mode a stage's net
+allocations are its snapshot diff minus the diffs of the stages nested in it,
+so each allocation site is also counted in exactly one stage; the reported
+peak is the highest traced memory above the stage's start while it was open,
+nested stages included.
+
+Reports written to the output directory:
+  cpu: <stage>.pstats (load with pstats / snakeviz), <stage>.collapsed
+       (sampled "frame;frame;frame count" stacks for flamegraph.pl / speedscope)
+       and summary.txt (top-N functions by cumulative time per stage).
+  mem: <stage>.tracemalloc.txt (top-N allocation sites by net size, plus peak)
+       and summary.txt.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+
+PROFILED_STAGES = (
+    "ingest",
+    "extract",
+    "page_injection",
+    "preflight",
+    "doi_check",
+    "near_duplicates",
+    "crossref",
+    "copernicus",
+    "doi_letter",
+    "contents",
+)
+TRACEMALLOC_FRAMES = 10
+
+
+class _CpuStage:
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self.samples = {}
+
+
+class _MemStage:
+    def __init__(self):
+        self.sites = {}
+        self.peak = 0
+        self.entries = 0
+
+
+def _add_sites(target, sites):
+    for key, (size, count) in sites.items():
+        total_size, total_count = target.get(key, (0, 0))
+        target[key] = (total_size + size, total_count + count)
+
+
+class StageProfiler:
+    def __init__(self, mode, out_dir, top_n=25, sample_interval=0.005):
+        if mode not in ("cpu", "mem"):
+            raise ValueError(f"Unknown profile mode: {mode}")
+        self.mode = mode
+        self.out_dir = out_dir
+        self.top_n = top_n
+        self.sample_interval = sample_interval
+        self.stages = {}
+        self._stack = []
+        self._thread_id = threading.get_ident()
+        self._sampler = None
+        self._stop = threading.Event()
+
+    # ---- lifecycle ----
+    def start(self):
+        if self.mode == "mem":
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        else:
+            self._sampler = threading.Thread(target=self._sample_loop, daemon=True)
+            self._sampler.start()
+
+    def stop(self):
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+            self._sampler = None
+        if self.mode == "mem" and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    # ---- tracer hook ----
+    def enter_span(self, name, cat):
+        if cat not in PROFILED_STAGES or threading.get_ident() != self._thread_id:
+            return
+        outer = self._stack[-1] if self._stack else None
+        if outer is not None and outer[0] == cat:
+            self._stack.append((cat, None))
+            return
+        if self.mode == "cpu":
+            if outer is not None:
+                self.stages[outer[0]].profile.disable()
+            stage = self.stages.setdefault(cat, _CpuStage())
+            self._stack.append((cat, None))
+            stage.profile.enable()
+        else:
+            stage = self.stages.setdefault(cat, _MemStage())
+            outer_state = self._enclosing_state()
+            if outer_state is not None:
+                outer_state["running_peak"] = max(outer_state["running_peak"], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            state = {
+                "snapshot": self._snapshot(),
+                "current": tracemalloc.get_traced_memory()[0],
+                "running_peak": 0,
+                "nested_sites": {},
+            }
+            self._stack.append((cat, state))
+
+    def exit_span(self, name, cat):
+        if cat not in PROFILED_STAGES or threading.get_ident() != self._thread_id:
+            return
+        stage_name, state = self._stack.pop()
+        outer = self._stack[-1] if self._stack else None
+        if outer is not None and outer[0] == stage_name:
+            return
+        if self.mode == "cpu":
+            self.stages[stage_name].profile.disable()
+            if outer is not None:
+                self.stages[outer[0]].profile.enable()
+            return
+
+        stage = self.stages[stage_name]
+        peak = max(state["running_peak"], tracemalloc.get_traced_memory()[1])
+        stage.peak = max(stage.peak, peak - state["current"])
+        stage.entries += 1
+        inclusive = {}
+        for stat in self._snapshot().compare_to(state["snapshot"], "lineno"):
+            if not stat.size_diff and not stat.count_diff:
+                continue
+            frame = stat.traceback[0]
+            inclusive[(frame.filename, frame.lineno)] = (stat.size_diff, stat.count_diff)
+        nested = state["nested_sites"]
+        for key, (size, count) in inclusive.items():
+            nested_size, nested_count = nested.get(key, (0, 0))
+            size, count = size - nested_size, count - nested_count
+            if size or count:
+                stage_size, stage_count = stage.sites.get(key, (0, 0))
+                stage.sites[key] = (stage_size + size, stage_count + count)
+        outer_state = self._enclosing_state()
+        if outer_state is not None:
+            outer_state["running_peak"] = max(outer_state["running_peak"], peak)
+            _add_sites(outer_state["nested_sites"], inclusive)
+
+    # ---- helpers ----
+    def _enclosing_state(self):
+        """Memory state of the innermost open stage (same-stage nested spans carry none)."""
+        for _, state in reversed(self._stack):
+            if state is not None:
+                return state
+        return None
+
+    @staticmethod
+    def _snapshot():
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.sample_interval):
+            try:
+                stage_name = self._stack[-1][0]
+            except IndexError:
+                continue
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+                frame = frame.f_back
+            if not self._stack or self._stack[-1][0] != stage_name:
+                continue  # the stage changed while the stack was read; drop the sample
+            key = ";".join(reversed(frames))
+            samples = self.stages[stage_name].samples
+            samples[key] = samples.get(key, 0) + 1
+
+    # ---- reports ----
+    def write_reports(self):
+        """Write per-stage reports; returns the summary text."""
+        os.makedirs(self.out_dir, exist_ok=True)
+        summary = []
+        for name in sorted(self.stages):
+            if self.mode == "cpu":
+                summary.append(self._write_cpu_stage(name, self.stages[name]))
+            else:
+                summary.append(self._write_mem_stage(name, self.stages[name]))
+        text = "\n".join(summary)
+        with open(os.path.join(self.out_dir, "summary.txt"), "w", encoding="utf-8") as f:
+            f.write(text)
+        return text
+
+    def _write_cpu_stage(self, name, stage):
+        stage.profile.dump_stats(os.path.join(self.out_dir, f"{name}.pstats"))
+        with open(os.path.join(self.out_dir, f"{name}.collapsed"), "w", encoding="utf-8") as f:
+            for stack, count in sorted(stage.samples.items()):
+                f.write(f"{stack} {count}\n")
+        out = io.StringIO()
+        stats = pstats.Stats(stage.profile, stream=out)
+        stats.strip_dirs().sort_stats("cumulative").print_stats(self.top_n)
+        return f"=== {name} (cpu) ===\n{out.getvalue()}"
+
+    def _write_mem_stage(self, name, stage):
+        sites = sorted(stage.sites.items(), key=lambda kv: kv[1][0], reverse=True)[: self.top_n]
+        lines = [
+            f"=== {name} (mem) ===",
+            f"entries: {stage.entries}, peak above stage start: {stage.peak / 1024:.1f} KiB",
+            f"{'net KiB':>10}{'blocks':>9}  site",
+        ]
+        for (filename, lineno), (size, count) in sites:
+            lines.append(f"{size / 1024:>10.1f}{count:>9}  {filename}:{lineno}")
+        text = "\n".join(lines) + "\n"
+        with open(os.path.join(self.out_dir, f"{name}.tracemalloc.txt"), "w", encoding="utf-8") as f:
+            f.write(text)
+        return text
+
+
+def add_profile_arguments(parser):
+    """--profile / --profile-dir / --profile-top options for command-line entry points."""
+    parser.add_argument(
+        "--profile", choices=("cpu", "mem"),
+        help="Profile each pipeline stage (cpu: cProfile + sampled stacks, mem: tracemalloc).",
+    )
+    parser.add_argument(
+        "--profile-dir", default=os.path.join("output", "profile"),
+        help="Directory for profiling reports.",
+    )
+    parser.add_argument(
+        "--profile-top", type=int, default=25,
+        help="Number of functions / allocation sites listed per stage.",
+    )
+    return parser
@@ -0,0 +1,134 @@
+"""Lightweight timing spans with Chrome/Perfetto trace export.
+
+Spans are no-ops until the tracer is enabled (main.py --trace / --timings).
+Open one with ``with span("create_full_xml", articles=n) as attrs:``; the yielded dict
+can be updated inside the block to attach attributes only known at the end
+(reference count, output size, ...).
+"""
+
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+SpanRecord = namedtuple(
+    "SpanRecord", "name cat start_ns dur_ns pid tid args outermost_for_file"
+)
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.spans = []
+        self.hooks = []
+        self._local = threading.local()
+        self._origin_ns = time.perf_counter_ns()
+
+    def enable(self):
+        self.enabled = True
+        self._origin_ns = time.perf_counter_ns()
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def add_hook(self, hook):
+        """Register an object with enter_span(name, cat) / exit_span(name, cat) methods.
+
+        Hooks run even while span recording is disabled (used by --profile).
+        """
+        self.hooks.append(hook)
+
+    @contextmanager
+    def span(self, name, cat="stage", **attrs):
+        if not self.enabled and not self.hooks:
+            yield attrs
+            return
+        for hook in self.hooks:
+            hook.enter_span(name, cat)
+        try:
+            if self.enabled:
+                with self._recorded(name, cat, attrs):
+                    yield attrs
+            else:
+                yield attrs
+        finally:
+            for hook in reversed(self.hooks):
+                hook.exit_span(name, cat)
+
+    @contextmanager
+    def _recorded(self, name, cat, attrs):
+        stack = self._stack()
+        file = attrs.get("file")
+        outermost_for_file = file is not None and all(a.get("file") != file for a in stack)
+        stack.append(attrs)
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            dur = time.perf_counter_ns() - start
+            stack.pop()
+            self.spans.append(
+                SpanRecord(
+                    name, cat, start, dur, os.getpid(), threading.get_ident(),
+                    attrs, outermost_for_file,
+                )
+            )
+
+    def chrome_trace(self):
+        """Trace Event Format dict ("X" complete events, microsecond timestamps)."""
+        events = []
+        for s in sorted(self.spans, key=lambda s: s.start_ns):
+            events.append({
+                "name": s.name,
+                "cat": s.cat,
+                "ph": "X",
+                "ts": (s.start_ns - self._origin_ns) / 1000,
+                "dur": s.dur_ns / 1000,
+                "pid": s.pid,
+                "tid": s.tid,
+                "args": s.args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f, ensure_ascii=False, default=str)
+
+    def stage_totals(self):
+        """{span name: (count, total_ns, max_ns)}."""
+        totals = {}
+        for s in self.spans:
+            count, total, longest = totals.get(s.name, (0, 0, 0))
+            totals[s.name] = (count + 1, total + s.dur_ns, max(longest, s.dur_ns))
+        return totals
+
+    def article_totals(self):
+        """{file: total_ns} over the outermost spans carrying a ``file`` attribute."""
+        totals = {}
+        for s in self.spans:
+            if s.outermost_for_file:
+                file = s.args["file"]
+                totals[file] = totals.get(file, 0) + s.dur_ns
+        return totals
+
+    def summary_table(self, limit=10):
+        """Plain-text table of the slowest stages and articles."""
+        lines = ["Slowest stages:", f"{'stage':<36}{'calls':>7}{'total ms':>12}{'max ms':>10}"]
+        stages = sorted(self.stage_totals().items(), key=lambda kv: kv[1][1], reverse=True)
+        for name, (count, total, longest) in stages[:limit]:
+            lines.append(f"{name:<36}{count:>7}{total / 1e6:>12.1f}{longest / 1e6:>10.1f}")
+        articles = sorted(self.article_totals().items(), key=lambda kv: kv[1], reverse=True)
+        if articles:
+            lines += ["", "Slowest articles:", f"{'file':<60}{'total ms':>12}"]
+            for file, total in articles[:limit]:
+                lines.append(f"{file[:59]:<60}{total / 1e6:>12.1f}")
+        return "\n".join(lines)
+
+
+TRACER = Tracer()
+span = TRACER.span
@@ -1,85 +1,94 @@
+import argparse
+import logging
 import os
+import sys
 import yaml
-from docx_processing.parse import process_multiple_docs
-from docx_processing.extractors import (
-    extract_ukrainian_title,
-    extract_literature,
-    extract_english_title,
-    extract_authors,
-    extract_abstract,
-    extract_affiliation_lines,
-    extract_author_orcids,
-    align_author_orcids,
-)
-from xml_generation.crossref.create_crossref_xml import create_full_xml
-from xml_generation.ici_copernicus.create_copernicus_ini_xml import create_ici_copernicus_xml
-from docx_generation.generate_docx import create_contents_docx, create_doi_letter_docx
-from pdf_processing.page_count import extract_pdf_articles_pages
-from pdf_processing.inject_pages import inject_pages_into_articles
+from docx_validation.preflight import PreflightError
+from instrumentation.logging_setup import add_logging_arguments, configure_logging
+from instrumentation.tracing import TRACER
+from instrumentation.profiling import StageProfiler, add_profile_arguments
+from pipeline.stages import STAGE_NAMES, BuildContext, build_graph
+from xml_generation.reproducible import add_reproducible_arguments, configure_reproducible
 with open("config.yml", "r") as f:
     config = yaml.safe_load(f)
 
+logger = logging.getLogger("main")
 
-if __name__ == '__main__':
-    input_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "articles")
-    all_docs = process_multiple_docs(input_folder)
-    articles_data = []
-    ukrainian_authors = [] # not needed for XML forming, but may be useful for other features
-
-    for filename, paragraphs, start_page, end_page in all_docs:
-        print(f"Processing file: {filename}")
 
-        # Extract the information
-        ukrainian_title = extract_ukrainian_title(paragraphs).upper()
-        literature_references = extract_literature(paragraphs)
-        english_title = extract_english_title(paragraphs, literature_references).upper()
-        affiliation_lines = extract_affiliation_lines(paragraphs, literature_references)
-        authors_text = extract_authors(paragraphs)
-        author_orcids = align_author_orcids(
-            authors_text,
-            extract_author_orcids(paragraphs, literature_references),
-        )
-        authors_ukrainian_text = extract_authors(paragraphs, True)
-        ukrainian_authors.append(authors_ukrainian_text)
-        abstract_text = extract_abstract(paragraphs)
+def _parse_args():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Extract article metadata from DOCX files and generate Crossref/Copernicus XML. "
+            "Only stages whose inputs changed since the last run are rebuilt."
+        ),
+    )
+    parser.add_argument(
+        "--input-folder",
+        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "articles"),
+        help="Folder with the issue's DOCX files.",
+    )
+    parser.add_argument("--output-dir", default="output", help="Folder for XML/DOCX outputs.")
+    parser.add_argument(
+        "--stage", action="append", choices=STAGE_NAMES, dest="stages",
+        help="Build only this stage and what it depends on (repeatable).",
+    )
+    parser.add_argument("--force", action="store_true", help="Rebuild every selected stage.")
+    parser.add_argument("--dry-run", action="store_true", help="Report stale stages without running them.")
+    parser.add_argument(
+        "--xml-jobs", type=int, default=0,
+        help="Build Crossref/Copernicus article fragments in N worker processes (same output as serial).",
+    )
+    add_reproducible_arguments(parser)
+    add_logging_arguments(parser)
+    add_profile_arguments(parser)
+    parser.add_argument(
+        "--trace", metavar="OUT_JSON",
+        help="Write per-stage/per-article timing spans in Chrome/Perfetto trace format.",
+    )
+    parser.add_argument(
+        "--timings", action="store_true",
+        help="Log a table of the slowest stages and articles at the end of the run.",
+    )
+    return parser.parse_args()
 
-        # Print the extracted information
-        print("Ukrainian Title:", ukrainian_title)
-        print("English Title:", english_title)
-        print("Authors:", authors_text)
-        print("Ukrainian Authors:", authors_ukrainian_text)
-        print("Abstract:", abstract_text)
-        print("Literature References:", literature_references)
-        print("affiliation_lines:", affiliation_lines)
-        print("author_orcids:", author_orcids)
-        print(f"Start Page: {start_page}, End Page: {end_page}")
 
-        # Prepare data for full XML generation
-        articles_data.append(
-            (
-                english_title,
-                ukrainian_title,
-                authors_text,
-                (start_page, end_page),
-                literature_references,
-                abstract_text,
-                affiliation_lines,
-                author_orcids,
-            )
-        )
-
-    if config["app"]["inject_pdf_pages"]:
-        pages_pdf = extract_pdf_articles_pages("")
-        articles_data = inject_pages_into_articles(articles_data, pages_pdf)
+if __name__ == '__main__':
+    args = _parse_args()
+    configure_logging(quiet=args.quiet, verbose=args.verbose, log_format=args.log_format)
+    configure_reproducible(args.deterministic, args.epoch)
 
-    # Generate full XML for all articles
-    with open("output/crossref.xml", "w", encoding="utf-8") as f:
-        f.write(create_full_xml(articles_data))
+    if args.trace or args.timings:
+        TRACER.enable()
+    profiler = None
+    if args.profile:
+        profiler = StageProfiler(args.profile, args.profile_dir, top_n=args.profile_top)
+        TRACER.add_hook(profiler)
+        profiler.start()
 
-    with open("output/copernicus.xml", "w", encoding="utf-8") as f:
-        f.write(create_ici_copernicus_xml(articles_data))
+    ctx = BuildContext(config, args.input_folder, output_dir=args.output_dir, xml_workers=args.xml_jobs)
+    graph = build_graph(ctx)
+    exit_code = 0
+    try:
+        report = graph.build(ctx, targets=args.stages, force=args.force, dry_run=args.dry_run)
+    except PreflightError as exc:  # app.preflight_strict: the problems were logged by the stage
+        logger.error("Build stopped before XML: %s", exc)
+        exit_code = 1
+    else:
+        logger.info(
+            "run finished",
+            extra={"fields": {
+                "rebuilt" if not args.dry_run else "stale": [name for name, reason in report if reason],
+                "up_to_date": [name for name, reason in report if not reason],
+            }},
+        )
 
-    # Create docx documents based on XML
-    create_doi_letter_docx("output/crossref.xml", "output/doi_letter.docx")
-    create_contents_docx("output/crossref.xml", "output/contents_eng.docx")
-    create_contents_docx("output/crossref.xml", "output/contents_ua.docx", ukrainian_authors)
\ No newline at end of file
+    if args.trace:
+        TRACER.write_chrome_trace(args.trace)
+        logger.info("Trace written to %s", args.trace)
+    if TRACER.enabled:
+        logger.info("Timing summary\n%s", TRACER.summary_table())
+    if profiler is not None:
+        profiler.stop()
+        profiler.write_reports()
+        logger.info("Profiling reports (%s) written to %s", args.profile, args.profile_dir)
+    sys.exit(exit_code)
@@ -5,8 +5,9 @@ import tempfile
 
 from docx import Document
 
+from docx_processing.author_names import parsed_authors, split_authors
 from docx_processing.extractors import extract_authors, extract_english_title, extract_ukrainian_title, extract_literature
-from docx_processing.parse import process_multiple_docs
+from docx_processing.parse import list_docx_files
 from pdf_generation.generate_pdf import _check_libreoffice_installed, _convert_docx_to_pdf
 
 
@@ -43,25 +44,11 @@ def _build_anonymous_line(original_text):
 
 
 def _extract_author_tokens(authors_text):
-    if authors_text == "Authors not found.":
-        return []
-    normalized = re.sub(r"\s+\d{4}$", "", authors_text).strip()
-    parts = re.split(r"\s*(?:,|;| and | та |&)\s*", normalized)
-    return [part.strip() for part in parts if len(part.strip()) > 2]
+    return [part for part in split_authors(authors_text) if len(part) > 2]
 
 
 def _extract_surnames(authors_text):
-    if not authors_text or authors_text == "Authors not found.":
-        return []
-    surnames = []
-    for part in authors_text.split(","):
-        tokens = [t for t in part.strip().split() if t]
-        if not tokens:
-            continue
-        candidate = tokens[-1]
-        if re.match(r"^[A-Za-zА-Яа-яІЇЄҐіїєґ'\-]{3,}$", candidate):
-            surnames.append(candidate.lower())
-    return surnames
+    return [author.surname.lower() for author in parsed_authors(authors_text) if len(author.surname) >= 3]
 
 
 def _looks_like_email_line(text):
@@ -229,9 +216,7 @@ def process_and_convert_folder(input_folder, output_folder):
     os.makedirs(output_folder, exist_ok=True)
 
     with tempfile.TemporaryDirectory() as temp_dir:
-        for index, (filename, _, _, _) in enumerate(
-            process_multiple_docs(input_folder), start=1
-        ):
+        for index, filename in enumerate(list_docx_files(input_folder), start=1):
             input_path = os.path.join(input_folder, filename)
             temp_docx_path = os.path.join(temp_dir, filename)
             doc = Document(input_path)
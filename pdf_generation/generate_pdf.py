@@ -2,7 +2,7 @@ import os
 import subprocess
 import shutil
 import sys
-from docx_processing.parse import process_multiple_docs
+from docx_processing.parse import list_docx_files
 
 def _get_soffice_path():
     """
@@ -55,16 +55,13 @@ def process_and_convert_docs(input_folder, output_folder):
     """
     # Ensure LibreOffice is installed
     _check_libreoffice_installed()
-    # Process DOCX files
-    all_docs = process_multiple_docs(input_folder)
-
     # Ensure output folder exists
     os.makedirs(output_folder, exist_ok=True)
 
-    # Convert each DOCX to PDF
-    for doc in process_multiple_docs(input_folder):
-        input_path = os.path.join(input_folder, doc[0])  # filename
-        output_path = os.path.join(output_folder, doc[0].replace(".docx", ".pdf"))
+    # Convert each DOCX to PDF (issue order; conversion does not need parsed paragraphs)
+    for filename in list_docx_files(input_folder):
+        input_path = os.path.join(input_folder, filename)
+        output_path = os.path.join(output_folder, filename.replace(".docx", ".pdf"))
         _convert_docx_to_pdf(input_path, output_path)
 
 if __name__ == "__main__":
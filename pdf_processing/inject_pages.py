@@ -1,3 +1,8 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+
 def inject_pages_into_articles(articles_data, pages_data):
     if len(articles_data) != len(pages_data):
         raise ValueError(f"Кількість статей ({len(articles_data)}) не збігається з кількістю записів сторінок у PDF ({len(pages_data)})")
@@ -17,8 +22,9 @@ def inject_pages_into_articles(articles_data, pages_data):
         )
         if len(article) > 7:
             updated = updated + (article[7],)  # author_orcids
-        print(f"[INFO] '{article[0]}': сторінки змінено з {old_range} на {new_range}")
+        logger.debug("'%s': сторінки змінено з %s на %s", article[0], old_range, new_range)
         updated_articles.append(updated)
 
+    logger.info("PDF page ranges injected", extra={"fields": {"articles": len(updated_articles)}})
     return updated_articles
 
@@ -0,0 +1,256 @@
+"""Backfill: build many issues from a volume-X/issue-Y/ tree in a process pool.
+
+    archive/
+      volume-5/
+        issue-1/   *.docx, optional merged.pdf, optional issue.yml
+        issue-2/
+      volume-6/
+        ...
+
+Each issue's config is ./config.yml deep-merged with its issue.yml; when
+issue.yml does not set them, publication.volume/issue come from the folder
+names and page ranges come from the issue's merged.pdf if there is one
+(otherwise from the DOCX page counts). DOIs are built from the publication
+year, so an issue of any volume other than config.yml's must set
+publication.year (and usually month) in its issue.yml. Every issue is an
+independent build graph (pipeline.stages) with its own output/.build
+directory, DOI ledger and doi_batch_id prefix under
+<output-dir>/volume-X/issue-Y/, so a rerun only rebuilds what changed.
+Issues are spread over a process pool, largest first; a failing issue is
+reported in the summary and does not stop the others. Two issues that get
+the same DOI both fail the run.
+
+    python -m pipeline.backfill archive/ --output-dir output/backfill --jobs 8
+"""
+
+import argparse
+import copy
+import logging
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import yaml
+
+from docx_processing.parse import list_docx_files
+from pipeline.dag import write_json_atomic
+from pipeline.snapshot import load_articles, read_header
+from pipeline.stages import STAGE_NAMES, BuildContext, build_graph
+from xml_generation.reproducible import add_reproducible_arguments, configure_reproducible, reproducible_settings
+
+logger = logging.getLogger(__name__)
+
+ISSUE_CONFIG_NAME = "issue.yml"
+MERGED_PDF_NAME = "merged.pdf"
+SUMMARY_NAME = "backfill_summary.json"
+LEDGER_NAME = "doi_ledger.sqlite"
+DEFAULT_TARGETS = ("crossref", "copernicus")
+_VOLUME_DIR = re.compile(r"^volume-(\d+)$")
+_ISSUE_DIR = re.compile(r"^issue-(\d+)$")
+
+
+def merge_config(base, override):
+    """Recursive dict merge; values from override win, base is not modified."""
+    merged = copy.deepcopy(base)
+    for key, value in (override or {}).items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_config(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def discover_issues(root):
+    """(volume, issue, folder) for every volume-X/issue-Y folder, in numeric order."""
+    issues = []
+    for volume_name in os.listdir(root):
+        volume_match = _VOLUME_DIR.match(volume_name)
+        volume_dir = os.path.join(root, volume_name)
+        if not volume_match or not os.path.isdir(volume_dir):
+            continue
+        for issue_name in os.listdir(volume_dir):
+            issue_match = _ISSUE_DIR.match(issue_name)
+            issue_dir = os.path.join(volume_dir, issue_name)
+            if issue_match and os.path.isdir(issue_dir):
+                issues.append((int(volume_match.group(1)), int(issue_match.group(1)), issue_dir))
+    return sorted(issues)
+
+
+def issue_config(base_config, volume, issue, issue_dir, output_dir):
+    """The effective config of one issue folder (ValueError if it needs a publication.year it lacks)."""
+    defaults = {"publication": {"volume": str(volume), "issue": str(issue)}}
+    merged_pdf = os.path.join(issue_dir, MERGED_PDF_NAME)
+    has_pdf = os.path.exists(merged_pdf)
+    defaults["app"] = {"merged_pdf": merged_pdf if has_pdf else "", "inject_pdf_pages": has_pdf}
+    defaults["crossref"] = {"batch_id_prefix": f"register_v{volume}_i{issue}"}
+    defaults["deposit"] = {"ledger_db": os.path.join(output_dir, LEDGER_NAME)}
+    override = {}
+    override_path = os.path.join(issue_dir, ISSUE_CONFIG_NAME)
+    if os.path.exists(override_path):
+        with open(override_path, encoding="utf-8") as f:
+            override = yaml.safe_load(f) or {}
+    config = merge_config(merge_config(base_config, defaults), override)
+    publication = config["publication"]
+    # The base year only belongs to the base volume; any other volume would get its DOIs.
+    if "year" not in (override.get("publication") or {}) and \
+            str(publication["volume"]) != str(base_config["publication"]["volume"]):
+        raise ValueError(
+            f"{override_path}: publication.year is required for volume {publication['volume']} "
+            f"(config.yml's year {base_config['publication']['year']} is for volume "
+            f"{base_config['publication']['volume']})"
+        )
+    return config
+
+
+def _issue_size(issue_dir):
+    return sum(os.path.getsize(os.path.join(issue_dir, name)) for name in list_docx_files(issue_dir))
+
+
+def _issue_dois(config, snapshot_path):
+    import xml_generation.crossref.create_crossref_xml as crossref_module
+
+    crossref_module.apply_config(config)
+    articles, _ = load_articles(snapshot_path)
+    return [crossref_module.generate_doi(article[3][0]) for article in articles if article[3] and article[3][0]]
+
+
+def check_doi_collisions(entries):
+    """Mark every entry whose DOIs another issue of the run also emits as failed; returns the collisions.
+
+    Pops the per-issue "dois" lists so they do not end up in the summary.
+    """
+    owners = {}
+    for position, entry in enumerate(entries):
+        for doi in set(entry.pop("dois", None) or ()):
+            owners.setdefault(doi, []).append(position)
+    collisions = []
+    for doi, positions in sorted(owners.items()):
+        if len(positions) < 2:
+            continue
+        issues = [f"{entries[p]['volume']}/{entries[p]['issue']}" for p in positions]
+        collisions.append({"doi": doi, "issues": issues})
+        for position in positions:
+            entry = entries[position]
+            entry["status"] = "failed"
+            entry.setdefault("error", f"DOI collision with another issue: {doi} ({', '.join(issues)})")
+    return collisions
+
+
+def build_issue(config, issue_dir, output_dir, targets=DEFAULT_TARGETS, force=False, dry_run=False):
+    """Build one issue (runs in a worker process); returns its summary entry."""
+    start = time.perf_counter()
+    entry = {"input": issue_dir, "output": output_dir, "volume": config["publication"]["volume"],
+             "issue": config["publication"]["issue"]}
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        ctx = BuildContext(config, issue_dir, output_dir=output_dir)
+        report = build_graph(ctx).build(ctx, targets=targets, force=force, dry_run=dry_run)
+        entry["rebuilt" if not dry_run else "stale"] = [name for name, reason in report if reason]
+        if os.path.exists(ctx.snapshot_path):
+            entry["articles"] = read_header(ctx.snapshot_path)["articles"]
+            entry["dois"] = _issue_dois(config, ctx.snapshot_path)
+        entry["status"] = "ok"
+    except Exception as exc:
+        logger.exception("Issue %s failed", issue_dir)
+        entry["status"] = "failed"
+        entry["error"] = f"{type(exc).__name__}: {exc}"
+    entry["seconds"] = round(time.perf_counter() - start, 3)
+    return entry
+
+
+def _init_worker(quiet, verbose, log_format, reproducible):
+    from instrumentation.logging_setup import configure_logging
+
+    configure_logging(quiet=quiet, verbose=verbose, log_format=log_format)
+    configure_reproducible(**reproducible)
+
+
+def backfill(root, output_root, base_config, jobs=None, targets=DEFAULT_TARGETS, force=False, dry_run=False,
+             initializer=None, initargs=()):
+    """Build every issue under root; returns the summary document (entries in issue order)."""
+    issues = discover_issues(root)
+    entries = [None] * len(issues)
+    work = []
+    for position, (volume, issue, issue_dir) in enumerate(issues):
+        output_dir = os.path.join(output_root, os.path.relpath(issue_dir, root))
+        try:
+            config = issue_config(base_config, volume, issue, issue_dir, output_dir)
+        except ValueError as exc:
+            logger.error("Issue %s not built: %s", issue_dir, exc)
+            entries[position] = {"input": issue_dir, "output": output_dir, "volume": str(volume),
+                                 "issue": str(issue), "status": "failed", "error": f"ValueError: {exc}",
+                                 "seconds": 0.0}
+            continue
+        work.append((_issue_size(issue_dir), config, issue_dir, output_dir, position))
+    # Largest issues first so a big issue does not start last and stretch the wall time.
+    work.sort(key=lambda item: item[0], reverse=True)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs, initializer=initializer, initargs=initargs) as pool:
+        futures = {
+            pool.submit(build_issue, config, issue_dir, output_dir, targets, force, dry_run): position
+            for _, config, issue_dir, output_dir, position in work
+        }
+        for future in as_completed(futures):
+            entry = future.result()
+            entries[futures[future]] = entry
+            logger.info("issue done", extra={"fields": {
+                "volume": entry["volume"], "issue": entry["issue"], "status": entry["status"],
+                "articles": entry.get("articles"), "seconds": entry["seconds"],
+            }})
+    collisions = check_doi_collisions(entries)
+    for collision in collisions:
+        logger.error("DOI %s emitted by issues %s", collision["doi"], ", ".join(collision["issues"]))
+    return {
+        "root": root,
+        "issues": len(entries),
+        "failed": sum(1 for entry in entries if entry["status"] != "ok"),
+        "articles": sum(entry.get("articles") or 0 for entry in entries),
+        "seconds": round(time.perf_counter() - start, 3),
+        "jobs": jobs or os.cpu_count(),
+        "doi_collisions": collisions,
+        "entries": entries,
+    }
+
+
+def _parse_args(argv=None):
+    from instrumentation.logging_setup import add_logging_arguments
+
+    parser = argparse.ArgumentParser(description="Build Crossref/Copernicus outputs for many issues in parallel.")
+    parser.add_argument("root", help="Folder containing volume-X/issue-Y/ subfolders.")
+    parser.add_argument("--output-dir", default=os.path.join("output", "backfill"))
+    parser.add_argument("--jobs", type=int, help="Worker processes (default: CPU count).")
+    parser.add_argument(
+        "--stage", action="append", choices=STAGE_NAMES, dest="stages",
+        help=f"Stages to build per issue (repeatable; default: {', '.join(DEFAULT_TARGETS)}).",
+    )
+    parser.add_argument("--force", action="store_true", help="Rebuild every selected stage.")
+    parser.add_argument("--dry-run", action="store_true", help="Report stale stages without running them.")
+    add_reproducible_arguments(parser)
+    add_logging_arguments(parser)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    from instrumentation.logging_setup import configure_logging
+
+    args = _parse_args()
+    configure_logging(quiet=args.quiet, verbose=args.verbose, log_format=args.log_format)
+    configure_reproducible(args.deterministic, args.epoch)
+    with open("config.yml", "r", encoding="utf-8") as f:
+        base_config = yaml.safe_load(f)
+    summary = backfill(
+        args.root, args.output_dir, base_config, jobs=args.jobs,
+        targets=args.stages or DEFAULT_TARGETS, force=args.force, dry_run=args.dry_run,
+        initializer=_init_worker, initargs=(args.quiet, args.verbose, args.log_format, reproducible_settings()),
+    )
+    os.makedirs(args.output_dir, exist_ok=True)
+    summary_path = os.path.join(args.output_dir, SUMMARY_NAME)
+    write_json_atomic(summary_path, summary, indent=1)
+    logger.info(
+        "backfill finished",
+        extra={"fields": {key: summary[key] for key in ("issues", "failed", "articles", "seconds", "jobs")}},
+    )
+    logger.info("Summary written to %s", summary_path)
+    sys.exit(1 if summary["failed"] else 0)
@@ -0,0 +1,155 @@
+"""Make-like build graph: named stages, on-disk artifacts, content-hash staleness.
+
+A stage declares
+  inputs(ctx)  → JSON-serializable description of everything its output depends on
+                 (file digests, config sections, code digests, derived values),
+  outputs      → artifact paths it writes,
+  run(ctx)     → writes the outputs.
+
+The stage fingerprint is the SHA-256 of its canonical inputs. The manifest
+(<build_dir>/manifest.json) records, per stage, the fingerprint of its last
+successful run and the digests of its outputs. A stage reruns only when the
+fingerprint changed, an output is missing, or an output was modified outside
+the build. Because downstream stages fingerprint upstream artifacts by content,
+an upstream rerun that produces identical bytes does not cascade.
+"""
+
+import hashlib
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+
+
+def canonical_digest(value):
+    """SHA-256 of a JSON-serializable value in canonical form."""
+    data = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def write_json_atomic(path, value, **dump_kwargs):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(value, f, ensure_ascii=False, **dump_kwargs)
+    os.replace(tmp, path)
+
+
+class FileDigests:
+    """SHA-256 of files, memoized on (size, mtime_ns) across runs."""
+
+    def __init__(self, cache=None):
+        self.cache = cache if cache is not None else {}
+
+    def __call__(self, path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        key = os.path.abspath(path)
+        cached = self.cache.get(key)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        digest = h.hexdigest()
+        self.cache[key] = [st.st_size, st.st_mtime_ns, digest]
+        return digest
+
+
+class Stage:
+    def __init__(self, name, run, inputs, outputs, deps=()):
+        self.name = name
+        self.run = run
+        self.inputs = inputs
+        self.outputs = list(outputs)
+        self.deps = tuple(deps)
+
+
+class BuildGraph:
+    def __init__(self, build_dir, stages):
+        self.build_dir = build_dir
+        self.stages = {stage.name: stage for stage in stages}
+        os.makedirs(build_dir, exist_ok=True)
+        self.manifest_path = os.path.join(build_dir, MANIFEST_NAME)
+        self.manifest = self._load_manifest()
+        self.digest = FileDigests(self.manifest.setdefault("files", {}))
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"stages": {}, "files": {}}
+
+    def _save_manifest(self):
+        write_json_atomic(self.manifest_path, self.manifest, indent=1, sort_keys=True)
+
+    def order(self, targets=None):
+        """Stages needed for targets (default: all), dependencies first."""
+        ordered, seen = [], set()
+
+        def visit(name, trail=()):
+            if name in trail:
+                raise ValueError(f"Stage cycle: {' -> '.join(trail + (name,))}")
+            if name in seen:
+                return
+            if name not in self.stages:
+                raise KeyError(f"Unknown stage: {name}")
+            for dep in self.stages[name].deps:
+                visit(dep, trail + (name,))
+            seen.add(name)
+            ordered.append(self.stages[name])
+
+        for name in targets or self.stages:
+            visit(name)
+        return ordered
+
+    def stale_reason(self, stage, ctx):
+        """Why the stage must run (None if up to date). Returns (reason, fingerprint)."""
+        fingerprint = canonical_digest(stage.inputs(ctx))
+        record = self.manifest["stages"].get(stage.name)
+        if record is None:
+            return "never built", fingerprint
+        if record.get("fingerprint") != fingerprint:
+            return "inputs changed", fingerprint
+        for path in stage.outputs:
+            digest = self.digest(path)
+            if digest is None:
+                return f"missing {path}", fingerprint
+            if record.get("outputs", {}).get(path) != digest:
+                return f"{path} modified outside the build", fingerprint
+        return None, fingerprint
+
+    def build(self, ctx, targets=None, force=False, dry_run=False):
+        """Run stale stages in dependency order; returns [(stage name, reason or None)]."""
+        report = []
+        pending = set()
+        for stage in self.order(targets):
+            reason, fingerprint = self.stale_reason(stage, ctx)
+            if force and reason is None:
+                reason = "forced"
+            if dry_run and reason is None and pending.intersection(stage.deps):
+                reason = "upstream stage will run"
+            report.append((stage.name, reason))
+            if reason is None:
+                logger.debug("Stage %s is up to date", stage.name)
+                continue
+            if dry_run:
+                pending.add(stage.name)
+                logger.info("Stage %s would run (%s)", stage.name, reason)
+                continue
+            logger.info("Running stage %s (%s)", stage.name, reason)
+            stage.run(ctx)
+            self.manifest["stages"][stage.name] = {
+                "fingerprint": fingerprint,
+                "outputs": {path: self.digest(path) for path in stage.outputs},
+            }
+            self._save_manifest()
+        if not dry_run:
+            self._save_manifest()
+        return report
@@ -0,0 +1,225 @@
+"""Versioned, compact snapshot of one issue's extracted metadata.
+
+issue.ndjson holds one JSON document per line:
+  line 1      header: {"format", "version", "config", "articles"} — "config" carries
+              the config.yml sections the emitters need, so an old issue can be
+              re-emitted without its config.yml either;
+  lines 2..   one article record per line (docx_processing.articles.article_to_record
+              plus "source" and "ukrainian_authors"), in issue order.
+
+issue.ndjson.idx is a JSON sidecar with the [offset, length] of every article
+line and "articles_sha256", a digest of the article lines only (downstream
+stages fingerprint on it, so a config-only change does not look like new data).
+
+Regenerate outputs straight from a snapshot, without the source DOCX files:
+    python -m pipeline.snapshot emit output/issue.ndjson --output-dir output/reissue
+    python -m pipeline.snapshot show output/issue.ndjson 3
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+
+from docx_processing.articles import article_from_record, article_to_record
+from instrumentation.tracing import span
+from pipeline.dag import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = "issue-snapshot"
+SNAPSHOT_VERSION = 1
+INDEX_SUFFIX = ".idx"
+EMIT_TARGETS = ("crossref", "copernicus", "doi_letter", "contents_eng", "contents_ua")
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def index_path(path):
+    return path + INDEX_SUFFIX
+
+
+def write_snapshot(path, articles, config, sources=None, ukrainian_authors=None):
+    """Write articles (tuples) and the emitters' config sections; returns the index dict."""
+    articles = list(articles)
+    sources = sources or [None] * len(articles)
+    ukrainian_authors = ukrainian_authors or [None] * len(articles)
+    header = {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_VERSION,
+        "config": config,
+        "articles": len(articles),
+    }
+    offsets = []
+    digest = hashlib.sha256()
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_dumps(header))
+        for article, source, authors in zip(articles, sources, ukrainian_authors):
+            line = _dumps(article_to_record(article, source=source, ukrainian_authors=authors))
+            offsets.append([f.tell(), len(line)])
+            digest.update(line)
+            f.write(line)
+    index = {"version": SNAPSHOT_VERSION, "articles_sha256": digest.hexdigest(), "offsets": offsets}
+    os.replace(tmp, path)
+    write_json_atomic(index_path(path), index)
+    return index
+
+
+def read_index(path):
+    with open(index_path(path), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_header(path):
+    with open(path, "rb") as f:
+        header = json.loads(f.readline())
+    if header.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(f"{path} is not an issue snapshot")
+    if header.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {header.get('version')} in {path}")
+    return header
+
+
+def read_article(path, position, index=None):
+    """One article record by its position in the issue, read by offset."""
+    offset, length = (index or read_index(path))["offsets"][position]
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return json.loads(f.read(length))
+
+
+def iter_snapshot(path):
+    """Article records in issue order."""
+    with open(path, "rb") as f:
+        f.readline()
+        for line in f:
+            yield json.loads(line)
+
+
+def load_articles(path):
+    """(article tuples, Ukrainian author strings) from a snapshot."""
+    articles, ukrainian_authors = [], []
+    for record in iter_snapshot(path):
+        articles.append(article_from_record(record))
+        ukrainian_authors.append(record.get("ukrainian_authors"))
+    return articles, ukrainian_authors
+
+
+def emit(path, output_dir, targets=EMIT_TARGETS, ledger=None, changed_only=False, xml_workers=0):
+    """Regenerate the issue's outputs from a snapshot alone; returns the written paths.
+
+    With a DoiLedger the crossref.xml emissions are recorded, and changed_only
+    keeps only the articles changed since their last deposit (nothing is
+    written when none changed). xml_workers > 1 builds the XML article
+    fragments in a process pool.
+    """
+    import docx_generation.generate_docx as generate_docx_module
+    import xml_generation.crossref.create_crossref_xml as crossref_module
+    import xml_generation.ici_copernicus.create_copernicus_ini_xml as copernicus_module
+
+    header = read_header(path)
+    articles, ukrainian_authors = load_articles(path)
+    crossref_module.apply_config(header["config"])
+    copernicus_module.apply_config(header["config"])
+    os.makedirs(output_dir, exist_ok=True)
+    crossref_path = os.path.join(output_dir, "crossref.xml")
+    written = []
+
+    def write_xml(name, builder, cat, **kwargs):
+        out = os.path.join(output_dir, name)
+        with span(builder.__name__, cat=cat, articles=len(articles)):
+            xml = builder(articles, **kwargs)
+        if xml is None:
+            logger.info("No article changed since its last deposit; %s not written", out)
+            return
+        with open(out, "w", encoding="utf-8") as f:
+            f.write(xml)
+        written.append(out)
+
+    if "crossref" in targets:
+        write_xml(
+            "crossref.xml", crossref_module.create_full_xml, "crossref", ledger=ledger, changed_only=changed_only,
+            workers=xml_workers,
+        )
+    if "copernicus" in targets:
+        write_xml("copernicus.xml", copernicus_module.create_ici_copernicus_xml, "copernicus", workers=xml_workers)
+    docx_targets = [t for t in ("doi_letter", "contents_eng", "contents_ua") if t in targets]
+    if docx_targets and not os.path.exists(crossref_path):
+        raise FileNotFoundError(f"{crossref_path} is needed for {', '.join(docx_targets)}; emit crossref too")
+    if "doi_letter" in targets:
+        out = os.path.join(output_dir, "doi_letter.docx")
+        with span("create_doi_letter_docx", cat="doi_letter"):
+            generate_docx_module.create_doi_letter_docx(crossref_path, out)
+        written.append(out)
+    if "contents_eng" in targets:
+        out = os.path.join(output_dir, "contents_eng.docx")
+        with span("create_contents_docx", cat="contents", output="contents_eng.docx"):
+            generate_docx_module.create_contents_docx(crossref_path, out)
+        written.append(out)
+    if "contents_ua" in targets:
+        out = os.path.join(output_dir, "contents_ua.docx")
+        with span("create_contents_docx", cat="contents", output="contents_ua.docx"):
+            generate_docx_module.create_contents_docx(crossref_path, out, ukrainian_authors)
+        written.append(out)
+    return written
+
+
+def _parse_args(argv=None):
+    from instrumentation.logging_setup import add_logging_arguments
+    from xml_generation.reproducible import add_reproducible_arguments
+
+    parser = argparse.ArgumentParser(description="Inspect issue snapshots or regenerate outputs from them.")
+    add_logging_arguments(parser)
+    sub = parser.add_subparsers(dest="command", required=True)
+    emit_parser = sub.add_parser("emit", help="Write XML/DOCX outputs from a snapshot.")
+    emit_parser.add_argument("snapshot")
+    emit_parser.add_argument("--output-dir", default="output")
+    emit_parser.add_argument(
+        "--only", nargs="+", choices=EMIT_TARGETS, default=list(EMIT_TARGETS),
+        help="Outputs to write (DOCX outputs read the crossref.xml in --output-dir).",
+    )
+    emit_parser.add_argument(
+        "--changed-only", action="store_true",
+        help="crossref.xml with only the articles changed since their last deposit (see the DOI ledger).",
+    )
+    emit_parser.add_argument("--ledger", help="DOI ledger database (default: deposit.ledger_db in config.yml).")
+    emit_parser.add_argument(
+        "--xml-jobs", type=int, default=0, help="Build XML article fragments in N worker processes."
+    )
+    add_reproducible_arguments(emit_parser)
+    show_parser = sub.add_parser("show", help="Print the header, or one article record by position.")
+    show_parser.add_argument("snapshot")
+    show_parser.add_argument("position", type=int, nargs="?")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    from instrumentation.logging_setup import configure_logging
+
+    args = _parse_args()
+    configure_logging(quiet=args.quiet, verbose=args.verbose, log_format=args.log_format)
+    if args.command == "emit":
+        import yaml
+
+        from xml_generation.crossref.doi_ledger import DoiLedger, ledger_path
+        from xml_generation.reproducible import configure_reproducible
+
+        configure_reproducible(args.deterministic, args.epoch)
+        if args.ledger is None:
+            with open("config.yml", "r", encoding="utf-8") as f:
+                args.ledger = ledger_path(yaml.safe_load(f))
+        with DoiLedger(args.ledger) as ledger:
+            for written in emit(args.snapshot, args.output_dir, targets=args.only, ledger=ledger,
+                                changed_only=args.changed_only, xml_workers=args.xml_jobs):
+                logger.info("Wrote %s", written)
+    elif args.position is None:
+        json.dump(read_header(args.snapshot), sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        json.dump(read_article(args.snapshot, args.position), sys.stdout, ensure_ascii=False, indent=2)
+        print()
@@ -0,0 +1,528 @@
+"""The converter's build stages (see pipeline.dag for the staleness rules).
+
+    extract ──► pages ──► snapshot ──► preflight, doi_check, near_duplicates ──► crossref ──► doi_letter,
+                                 │                                                          contents_eng,
+                                 │                                                          contents_ua
+                                 └──────────────────────────────────────────────────► copernicus
+
+extract     per-DOCX extraction JSON in <build>/extract/ (only changed files are re-parsed)
+pages       <build>/pages.json — cumulative DOCX page ranges, or ranges from the merged PDF
+snapshot    output/issue.ndjson (+ .idx) — the issue's metadata in one file (pipeline.snapshot);
+            everything below reads it, never the DOCX files
+preflight   output/preflight.json — ORCID, DOI, page-range, placeholder and institution problems
+            (docx_validation.preflight; per-article checks in xml_workers processes); logged as
+            warnings, or the build stops there with app.preflight_strict
+doi_check   output/doi_check.json — reference DOIs missing from the offline index app.doi_index
+            (xml_generation.doi_index); logged as warnings, skipped when no index is configured
+near_duplicates
+            output/near_duplicates.json — MinHash near-duplicates of the issue's articles among
+            themselves and in the archive index app.similarity_index (xml_generation.near_duplicates)
+crossref    output/crossref.xml (also ingested into the archive index app.archive_index when set,
+            xml_generation.crossref.archive_index)
+copernicus  output/copernicus.xml
+            both splice per-article fragments cached in <build>/fragments/ (xml_generation.fragment_cache);
+            with xml_workers > 1 the uncached fragments are built in a process pool
+doi_letter, contents_eng, contents_ua
+            DOCX files; fingerprinted on the journal/article data they read from
+            crossref.xml, so e.g. a license change rebuilds only the XML.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+
+import docx_generation.generate_docx as generate_docx_module
+import docx_generation.table_writer as table_writer_module
+import docx_processing.articles as articles_module
+import docx_processing.author_names as author_names_module
+import docx_processing.extractors as extractors_module
+import docx_validation.preflight as preflight_module
+import xml_generation.abstracts as abstracts_module
+import xml_generation.crossref.create_authors as create_authors_module
+import xml_generation.crossref.create_crossref_xml as crossref_module
+import xml_generation.crossref.create_literature as create_literature_module
+import xml_generation.crossref.create_pages as create_pages_module
+import xml_generation.crossref.institution_ror as institution_ror_module
+import xml_generation.crossref.slug_utils as slug_utils_module
+import xml_generation.doi_index as doi_index_module
+import xml_generation.ici_copernicus.create_copernicus_ini_xml as copernicus_module
+import xml_generation.near_duplicates as near_duplicates_module
+import xml_generation.references as references_module
+import pipeline.snapshot as snapshot_module
+from docx_generation.generate_docx import (
+    _nsmap,
+    create_contents_docx,
+    create_doi_letter_docx,
+    parse_articles,
+    parse_journal_metadata,
+    parse_xml,
+)
+from docx_processing.articles import article_from_record, article_to_record, extract_document
+from docx_processing.parse import iter_docs, list_docx_files
+from instrumentation.tracing import span
+from pdf_processing.inject_pages import inject_pages_into_articles
+from pdf_processing.page_count import extract_pdf_articles_pages
+from pipeline.dag import BuildGraph, Stage, write_json_atomic
+from xml_generation.crossref.archive_index import ArchiveIndex
+from xml_generation.crossref.doi_ledger import DoiLedger, ledger_path
+from xml_generation.fragment_cache import FragmentCache
+from xml_generation.reproducible import reproducible_settings
+
+logger = logging.getLogger(__name__)
+
+STAGE_NAMES = (
+    "extract", "pages", "snapshot", "preflight", "doi_check", "near_duplicates",
+    "crossref", "copernicus", "doi_letter", "contents_eng", "contents_ua",
+)
+CROSSREF_CONFIG_KEYS = ("publication", "journal", "depositor", "registrant", "license", "crossref", "institutions")
+PREFLIGHT_CONFIG_KEYS = ("publication", "journal", "crossref", "institutions")
+COPERNICUS_CONFIG_KEYS = ("publication", "journal")
+
+
+class BuildContext:
+    def __init__(self, config, input_folder, output_dir="output", build_dir=None, xml_workers=0):
+        self.config = config
+        self.input_folder = input_folder
+        self.output_dir = output_dir
+        self.build_dir = build_dir or os.path.join(output_dir, ".build")
+        self.extract_dir = os.path.join(self.build_dir, "extract")
+        self.xml_workers = xml_workers  # not fingerprinted: the output is the same for any worker count
+        self.digest = None  # set by build_graph (shares the manifest's digest cache)
+
+    def path(self, name):
+        return os.path.join(self.output_dir, name)
+
+    @property
+    def extract_index_path(self):
+        return os.path.join(self.extract_dir, "index.json")
+
+    @property
+    def pages_path(self):
+        return os.path.join(self.build_dir, "pages.json")
+
+    @property
+    def snapshot_path(self):
+        return self.path("issue.ndjson")
+
+    @property
+    def merged_pdf(self):
+        return (self.config.get("app") or {}).get("merged_pdf", "")
+
+    @property
+    def doi_index(self):
+        return (self.config.get("app") or {}).get("doi_index", "")
+
+    @property
+    def preflight_strict(self):
+        return bool((self.config.get("app") or {}).get("preflight_strict"))
+
+    @property
+    def similarity_index(self):
+        return (self.config.get("app") or {}).get("similarity_index", "")
+
+    @property
+    def archive_index(self):
+        return (self.config.get("app") or {}).get("archive_index", "")
+
+    @property
+    def inject_pdf_pages(self):
+        return bool((self.config.get("app") or {}).get("inject_pdf_pages"))
+
+    def config_subset(self, keys):
+        return {key: self.config.get(key) for key in keys}
+
+    def code_digest(self, *modules):
+        return {module.__name__: self.digest(module.__file__) for module in modules}
+
+    # ---- artifact loaders ----
+    def load_extract_index(self):
+        with open(self.extract_index_path, encoding="utf-8") as f:
+            return json.load(f)["articles"]
+
+    def load_extracted(self):
+        """Per-article extraction records, in issue order."""
+        records = []
+        for entry in self.load_extract_index():
+            with open(os.path.join(self.extract_dir, entry["artifact"]), encoding="utf-8") as f:
+                records.append(json.load(f))
+        return records
+
+    def fragment_cache(self, builder):
+        """Per-article fragment cache of one XML builder under <build>/fragments/."""
+        return FragmentCache(os.path.join(self.build_dir, "fragments", builder))
+
+    def snapshot_digest(self):
+        """articles_sha256 of the current snapshot (None before the first build)."""
+        if self.digest(snapshot_module.index_path(self.snapshot_path)) is None:
+            return None
+        return snapshot_module.read_index(self.snapshot_path)["articles_sha256"]
+
+
+EXTRACTOR_MODULES = (extractors_module, author_names_module, articles_module)
+CROSSREF_MODULES = (
+    crossref_module, create_authors_module, create_literature_module, create_pages_module,
+    institution_ror_module, slug_utils_module, extractors_module, author_names_module, abstracts_module,
+    references_module,
+)
+
+
+def log_article(filename, article, authors_ukrainian_text):
+    """One compact record per article; the full dumps only at debug level."""
+    (
+        english_title,
+        ukrainian_title,
+        authors_text,
+        pages,
+        literature_references,
+        abstract_text,
+        affiliation_lines,
+        author_orcids,
+    ) = article
+    fields = {
+        "file": filename,
+        "title": english_title,
+        "authors": authors_text,
+        "references": len(literature_references),
+        "affiliations": len(affiliation_lines),
+        "orcids": sum(1 for o in author_orcids or [] if o),
+    }
+    if pages and pages[0] is not None:
+        fields["pages"] = f"{pages[0]}-{pages[1]}"
+    logger.info("article extracted", extra={"fields": fields})
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Ukrainian Title: %s", ukrainian_title)
+        logger.debug("Ukrainian Authors: %s", authors_ukrainian_text)
+        logger.debug("Abstract: %s", abstract_text)
+        logger.debug("Literature References: %s", literature_references)
+        logger.debug("affiliation_lines: %s", affiliation_lines)
+        logger.debug("author_orcids: %s", author_orcids)
+
+
+# ---------- extract ----------
+def _extract_inputs(ctx):
+    docx = {name: ctx.digest(os.path.join(ctx.input_folder, name)) for name in list_docx_files(ctx.input_folder)}
+    return {"docx": docx, "code": ctx.code_digest(*EXTRACTOR_MODULES)}
+
+
+def _run_extract(ctx):
+    os.makedirs(ctx.extract_dir, exist_ok=True)
+    code = ctx.code_digest(*EXTRACTOR_MODULES)
+    reused = {}
+
+    def cached_page_count(filename):
+        record = _load_current_record(
+            os.path.join(ctx.extract_dir, f"{filename}.json"),
+            ctx.digest(os.path.join(ctx.input_folder, filename)), code,
+        )
+        if record is None:
+            return None
+        reused[filename] = record
+        return record["page_count"]
+
+    entries = []
+    with span("ingest", folder=ctx.input_folder) as ingest_attrs:
+        # Extraction runs without page numbers (None, None): a cached record must not depend on the
+        # other files; the pages stage numbers the articles.
+        for filename, paragraphs, start_page, end_page in iter_docs(ctx.input_folder, cached=cached_page_count):
+            artifact = f"{filename}.json"
+            artifact_path = os.path.join(ctx.extract_dir, artifact)
+            record = reused.pop(filename, None)
+            if record is None:
+                article, authors_ukrainian_text = extract_document(filename, paragraphs, None, None)
+                del paragraphs
+                log_article(filename, article, authors_ukrainian_text)
+                record = {
+                    "source": filename,
+                    "source_sha256": ctx.digest(os.path.join(ctx.input_folder, filename)),
+                    "code": code,
+                    "page_count": end_page - start_page + 1,
+                    "ukrainian_authors": authors_ukrainian_text,
+                    "article": article_to_record(article),
+                }
+                write_json_atomic(artifact_path, record, indent=1)
+            else:
+                logger.debug("Reusing extraction of %s", filename)
+            entries.append({
+                "source": filename,
+                "artifact": artifact,
+                "sha256": ctx.digest(artifact_path),
+                "page_count": record["page_count"],
+            })
+        ingest_attrs["articles"] = len(entries)
+
+    keep = {entry["artifact"] for entry in entries} | {"index.json"}
+    for stale in os.listdir(ctx.extract_dir):
+        if stale not in keep:
+            os.remove(os.path.join(ctx.extract_dir, stale))
+    write_json_atomic(ctx.extract_index_path, {"articles": entries}, indent=1)
+
+
+def _load_current_record(artifact_path, source_sha, code):
+    try:
+        with open(artifact_path, encoding="utf-8") as f:
+            record = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if record.get("source_sha256") != source_sha or record.get("code") != code:
+        return None
+    return record
+
+
+# ---------- pages ----------
+def _pages_inputs(ctx):
+    inputs = {"extract": ctx.digest(ctx.extract_index_path), "inject_pdf_pages": ctx.inject_pdf_pages}
+    if ctx.inject_pdf_pages:
+        inputs["merged_pdf"] = [ctx.merged_pdf, ctx.digest(ctx.merged_pdf) if ctx.merged_pdf else None]
+    return inputs
+
+
+def _run_pages(ctx):
+    records = ctx.load_extracted()
+    articles = []
+    current_page = 1
+    for record in records:
+        end_page = current_page + record["page_count"] - 1
+        articles.append(article_from_record(record["article"], pages=(current_page, end_page)))
+        current_page = end_page + 1
+    source = "docx"
+    if ctx.inject_pdf_pages:
+        with span("extract_pdf_articles_pages", cat="page_injection"):
+            pages_pdf = extract_pdf_articles_pages(ctx.merged_pdf)
+        with span("inject_pages_into_articles", cat="page_injection"):
+            articles = inject_pages_into_articles(articles, pages_pdf)
+        source = "pdf"
+    write_json_atomic(
+        ctx.pages_path,
+        {"source": source, "pages": [list(article[3]) for article in articles]},
+        indent=1,
+    )
+
+
+# ---------- snapshot ----------
+def _snapshot_inputs(ctx):
+    return {
+        "extract": ctx.digest(ctx.extract_index_path),
+        "pages": ctx.digest(ctx.pages_path),
+        "config": ctx.config_subset(CROSSREF_CONFIG_KEYS),
+        "code": ctx.code_digest(snapshot_module, articles_module),
+    }
+
+
+def _run_snapshot(ctx):
+    records = ctx.load_extracted()
+    with open(ctx.pages_path, encoding="utf-8") as f:
+        pages = json.load(f)["pages"]
+    snapshot_module.write_snapshot(
+        ctx.snapshot_path,
+        [article_from_record(record["article"], pages=page_range) for record, page_range in zip(records, pages)],
+        ctx.config_subset(CROSSREF_CONFIG_KEYS),
+        sources=[record["source"] for record in records],
+        ukrainian_authors=[record["ukrainian_authors"] for record in records],
+    )
+
+
+# ---------- preflight ----------
+def _preflight_inputs(ctx):
+    return {
+        "articles": ctx.snapshot_digest(),
+        "config": ctx.config_subset(PREFLIGHT_CONFIG_KEYS),
+        "strict": ctx.preflight_strict,
+        "code": ctx.code_digest(
+            preflight_module, extractors_module, author_names_module, institution_ror_module, crossref_module,
+        ),
+    }
+
+
+def _run_preflight(ctx):
+    articles, ukrainian_authors = snapshot_module.load_articles(ctx.snapshot_path)
+    with span("preflight", cat="preflight", articles=len(articles)) as attrs:
+        report = preflight_module.lint(articles, ukrainian_authors, ctx.config, workers=ctx.xml_workers)
+        attrs["problems"] = len(report["problems"])
+    for problem in report["problems"]:
+        logger.warning("preflight: %s", problem["message"], extra={"fields": {
+            "check": problem["check"], "first_page": problem["first_page"],
+        }})
+    write_json_atomic(ctx.path("preflight.json"), report, indent=2)
+    if report["problems"] and ctx.preflight_strict:
+        raise preflight_module.PreflightError(
+            f"{len(report['problems'])} preflight problem(s), see {ctx.path('preflight.json')}"
+        )
+
+
+# ---------- doi_check ----------
+def _doi_check_inputs(ctx):
+    return {
+        "articles": ctx.snapshot_digest(),
+        "index": ctx.doi_index,
+        "segments": doi_index_module.index_signature(ctx.doi_index) if ctx.doi_index else {},
+        "code": ctx.code_digest(doi_index_module, references_module),
+    }
+
+
+def _run_doi_check(ctx):
+    report = {"index": ctx.doi_index or None, "indexed_dois": 0, "unknown": []}
+    if ctx.doi_index and doi_index_module.index_signature(ctx.doi_index):
+        articles, _ = snapshot_module.load_articles(ctx.snapshot_path)
+        with span("doi_check", cat="doi_check", articles=len(articles)) as attrs, \
+                doi_index_module.DoiIndex(ctx.doi_index) as index:
+            report["indexed_dois"] = len(index)
+            report["unknown"] = doi_index_module.unknown_reference_dois(index, articles)
+            attrs["unknown"] = len(report["unknown"])
+        for entry in report["unknown"]:
+            logger.warning("reference DOI not in the offline index", extra={"fields": entry})
+    elif ctx.doi_index:
+        logger.warning("DOI index %s has no segments; reference DOIs not checked", ctx.doi_index)
+    write_json_atomic(ctx.path("doi_check.json"), report, indent=2)
+
+
+# ---------- near_duplicates ----------
+def _near_duplicates_inputs(ctx):
+    return {
+        "articles": ctx.snapshot_digest(),
+        "issue": near_duplicates_module.issue_key(ctx.config),
+        "index": ctx.similarity_index,
+        "code": ctx.code_digest(near_duplicates_module),
+    }
+
+
+def _run_near_duplicates(ctx):
+    articles, _ = snapshot_module.load_articles(ctx.snapshot_path)
+    sources = [record.get("source") for record in snapshot_module.iter_snapshot(ctx.snapshot_path)]
+    issue = near_duplicates_module.issue_key(ctx.config)
+    with span("near_duplicates", cat="near_duplicates", articles=len(articles)) as attrs, \
+            near_duplicates_module.NearDuplicateIndex(ctx.similarity_index or ":memory:") as index:
+        pairs = near_duplicates_module.check_issue(index, issue, articles, sources)
+        report = {
+            "index": ctx.similarity_index or None, "issue": issue, "indexed_articles": len(index),
+            "threshold": near_duplicates_module.THRESHOLD, "pairs": pairs,
+        }
+        attrs["pairs"] = len(pairs)
+    for pair in pairs:
+        logger.warning("near-duplicate article", extra={"fields": {
+            "first_page": pair["first_page"], "match_issue": pair["match"]["issue"],
+            "match_first_page": pair["match"]["first_page"], "similarity": pair["similarity"],
+        }})
+    write_json_atomic(ctx.path("near_duplicates.json"), report, indent=2)
+
+
+# ---------- XML ----------
+def _crossref_inputs(ctx):
+    return {
+        "articles": ctx.snapshot_digest(),
+        "reproducible": reproducible_settings(),
+        "config": ctx.config_subset(CROSSREF_CONFIG_KEYS),
+        "code": ctx.code_digest(*CROSSREF_MODULES),
+    }
+
+
+def _run_crossref(ctx):
+    articles, _ = snapshot_module.load_articles(ctx.snapshot_path)
+    crossref_module.apply_config(ctx.config)
+    cache = ctx.fragment_cache("crossref")
+    with span("create_full_xml", cat="crossref", articles=len(articles)) as attrs, \
+            DoiLedger(ledger_path(ctx.config)) as ledger:
+        xml = crossref_module.create_full_xml(articles, ledger=ledger, cache=cache, workers=ctx.xml_workers)
+        attrs["cached_fragments"] = cache.hits
+        attrs["bytes"] = len(xml)
+    cache.prune_unused()
+    with open(ctx.path("crossref.xml"), "w", encoding="utf-8") as f:
+        f.write(xml)
+    if ctx.archive_index:
+        # The archive index is a lookup aid: a failure to update it must not fail the written crossref.xml.
+        try:
+            with ArchiveIndex(ctx.archive_index) as archive:
+                archive.ingest(ctx.path("crossref.xml"))
+        except sqlite3.Error as exc:
+            logger.warning("Archive index %s not updated: %s", ctx.archive_index, exc)
+
+
+def _copernicus_inputs(ctx):
+    return {
+        "articles": ctx.snapshot_digest(),
+        "reproducible": reproducible_settings(),
+        "config": ctx.config_subset(COPERNICUS_CONFIG_KEYS),
+        "code": ctx.code_digest(
+            copernicus_module, extractors_module, author_names_module, abstracts_module, references_module,
+        ),
+    }
+
+
+def _run_copernicus(ctx):
+    articles, _ = snapshot_module.load_articles(ctx.snapshot_path)
+    copernicus_module.apply_config(ctx.config)
+    cache = ctx.fragment_cache("copernicus")
+    with span("create_ici_copernicus_xml", cat="copernicus", articles=len(articles)) as attrs:
+        xml = copernicus_module.create_ici_copernicus_xml(articles, cache=cache, workers=ctx.xml_workers)
+        attrs["cached_fragments"] = cache.hits
+        attrs["bytes"] = len(xml)
+    cache.prune_unused()
+    with open(ctx.path("copernicus.xml"), "w", encoding="utf-8") as f:
+        f.write(xml)
+
+
+# ---------- DOCX ----------
+def _crossref_table_data(ctx):
+    """What the DOCX generators read from crossref.xml (None before the first build)."""
+    path = ctx.path("crossref.xml")
+    if ctx.digest(path) is None:
+        return None
+    root = parse_xml(path)
+    nsmap = _nsmap(root)
+    return {"journal": parse_journal_metadata(root, nsmap), "articles": parse_articles(root, nsmap)}
+
+
+def _docx_inputs(ctx, with_ukrainian_authors=False):
+    inputs = {"crossref": _crossref_table_data(ctx), "code": ctx.code_digest(generate_docx_module, table_writer_module)}
+    if with_ukrainian_authors and ctx.snapshot_digest() is not None:
+        inputs["ukrainian_authors"] = snapshot_module.load_articles(ctx.snapshot_path)[1]
+    return inputs
+
+
+def _run_doi_letter(ctx):
+    with span("create_doi_letter_docx", cat="doi_letter"):
+        create_doi_letter_docx(ctx.path("crossref.xml"), ctx.path("doi_letter.docx"))
+
+
+def _run_contents_eng(ctx):
+    with span("create_contents_docx", cat="contents", output="contents_eng.docx"):
+        create_contents_docx(ctx.path("crossref.xml"), ctx.path("contents_eng.docx"))
+
+
+def _run_contents_ua(ctx):
+    _, ukrainian_authors = snapshot_module.load_articles(ctx.snapshot_path)
+    with span("create_contents_docx", cat="contents", output="contents_ua.docx"):
+        create_contents_docx(ctx.path("crossref.xml"), ctx.path("contents_ua.docx"), ukrainian_authors)
+
+
+def build_graph(ctx):
+    """The converter's BuildGraph for one issue."""
+    stages = [
+        Stage("extract", _run_extract, _extract_inputs, [ctx.extract_index_path]),
+        Stage("pages", _run_pages, _pages_inputs, [ctx.pages_path], deps=("extract",)),
+        Stage(
+            "snapshot", _run_snapshot, _snapshot_inputs,
+            [ctx.snapshot_path, snapshot_module.index_path(ctx.snapshot_path)], deps=("pages",),
+        ),
+        Stage("preflight", _run_preflight, _preflight_inputs, [ctx.path("preflight.json")], deps=("snapshot",)),
+        Stage("doi_check", _run_doi_check, _doi_check_inputs, [ctx.path("doi_check.json")], deps=("snapshot",)),
+        Stage(
+            "near_duplicates", _run_near_duplicates, _near_duplicates_inputs,
+            [ctx.path("near_duplicates.json")], deps=("snapshot",),
+        ),
+        Stage(
+            "crossref", _run_crossref, _crossref_inputs, [ctx.path("crossref.xml")],
+            deps=("snapshot", "preflight", "doi_check", "near_duplicates"),
+        ),
+        Stage("copernicus", _run_copernicus, _copernicus_inputs, [ctx.path("copernicus.xml")], deps=("snapshot",)),
+        Stage("doi_letter", _run_doi_letter, _docx_inputs, [ctx.path("doi_letter.docx")], deps=("crossref",)),
+        Stage("contents_eng", _run_contents_eng, _docx_inputs, [ctx.path("contents_eng.docx")], deps=("crossref",)),
+        Stage(
+            "contents_ua", _run_contents_ua,
+            lambda c: _docx_inputs(c, with_ukrainian_authors=True),
+            [ctx.path("contents_ua.docx")], deps=("crossref", "snapshot"),
+        ),
+    ]
+    graph = BuildGraph(ctx.build_dir, stages)
+    ctx.digest = graph.digest
+    return graph
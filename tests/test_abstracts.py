@@ -0,0 +1,44 @@
+import unittest
+
+from lxml import etree
+
+from xml_generation.abstracts import split_abstract
+from xml_generation.crossref.create_crossref_xml import create_journal_article
+
+JATS = "{http://www.ncbi.nlm.nih.gov/JATS1}"
+XML_LANG = "{http://www.w3.org/XML/1998/namespace}lang"
+BLOCK = (
+    "Abstract. First English line.\nSecond English line.\nKeywords: networks, security; (routing).\n"
+    "Анотація. Український текст.\nКлючові слова: мережі, безпека"
+)
+
+
+class AbstractTests(unittest.TestCase):
+    def test_sections(self):
+        sections = split_abstract(BLOCK)
+        self.assertEqual(sections.en_abstract, "First English line.\nSecond English line.")
+        self.assertEqual(sections.uk_abstract, "Український текст.")
+        self.assertEqual(sections.en_keywords, ("networks", "security", "routing"))
+        self.assertEqual(sections.uk_keywords, ("мережі", "безпека"))
+        self.assertIs(split_abstract(BLOCK), sections)
+
+    def test_unlabelled_block_and_placeholder(self):
+        self.assertEqual(split_abstract("Plain text.\nKeywords: a").en_abstract, "Plain text.")
+        self.assertEqual(split_abstract("Abstract not found.").en_abstract, "")
+
+    def test_label_must_be_a_whole_word(self):
+        text = "Abstraction layers hide the hardware.\nKeywordsearch is fast.\nKeywords: a"
+        sections = split_abstract(text)
+        self.assertEqual(sections.en_abstract, "Abstraction layers hide the hardware.\nKeywordsearch is fast.")
+        self.assertEqual(sections.en_keywords, ("a",))
+
+    def test_crossref_abstract_per_language(self):
+        article = create_journal_article("TITLE", "НАЗВА", "Ivanenko I. V.", (1, 9), [], BLOCK, [])
+        abstracts = article.findall(f"{JATS}abstract")
+        self.assertEqual([a.get(XML_LANG) for a in abstracts], ["en", "uk"])
+        self.assertEqual([p.text for p in abstracts[0]], ["First English line.", "Second English line."])
+        self.assertEqual(etree.QName(abstracts[1][0]).localname, "p")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+
+from xml_generation.crossref.archive_index import ArchiveIndex
+
+BATCH = """<?xml version="1.0" encoding="UTF-8"?>
+<doi_batch xmlns="http://www.crossref.org/schema/5.4.0" version="5.4.0"><body><journal>
+<journal_metadata><full_title>Test Journal</full_title></journal_metadata>
+<journal_issue><publication_date><year>{year}</year></publication_date>
+<journal_volume><volume>{volume}</volume></journal_volume><issue>{issue}</issue></journal_issue>
+<journal_article><titles><title>{title}</title><original_language_title>НЕЙРОННІ МЕРЕЖІ</original_language_title></titles>
+<contributors><person_name><given_name>I V</given_name><surname>Ivanenko</surname>
+<ORCID>https://orcid.org/0000-0002-1825-0097</ORCID></person_name>
+<person_name><given_name>P</given_name><surname>{second}</surname></person_name></contributors>
+<pages><first_page>1</first_page><last_page>9</last_page></pages>
+<doi_data><doi>10.1000/J{year}.0{issue}.001</doi><resource>https://example.org/{issue}</resource></doi_data>
+</journal_article></journal></body></doi_batch>
+"""
+
+
+class ArchiveIndexTests(unittest.TestCase):
+    def write(self, tmp, name, **fields):
+        path = os.path.join(tmp, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(BATCH.format(**fields))
+        return path
+
+    def test_incremental_ingest_and_queries(self):
+        with tempfile.TemporaryDirectory() as tmp, ArchiveIndex(os.path.join(tmp, "archive.sqlite")) as index:
+            first = self.write(tmp, "1.xml", year=2024, volume=6, issue=1, title="Neural networks, revisited",
+                               second="Petrenko")
+            second = self.write(tmp, "2.xml", year=2024, volume=6, issue=2, title="Routing protocols",
+                                second="Kovalenko")
+            self.assertEqual(index.ingest(first), 1)
+            self.assertEqual(index.ingest(second), 1)
+            self.assertIsNone(index.ingest(first))
+
+            self.assertEqual([row["issue"] for row in index.by_author("IVANENKO")], ["1", "2"])
+            self.assertEqual([row["doi"] for row in index.by_author("petr*")], ["10.1000/j2024.01.001"])
+            self.assertEqual(len(index.by_orcid("0000-0002-1825-0097")), 2)
+            self.assertEqual(index.by_doi("10.1000/J2024.02.001")[0]["title"], "Routing protocols")
+            self.assertEqual(len(index.by_title("NEURAL NETWORKS REVISITED")), 1)
+            self.assertEqual([row["issue"] for row in index.search_titles("network")], [])
+            self.assertEqual([row["issue"] for row in index.search_titles("networks neural")], ["1"])
+            self.assertEqual(len(index.search_titles("нейронні")), 2)
+
+            # Rebuilt issue 1: its rows are replaced, issue 2 is untouched.
+            self.write(tmp, "1.xml", year=2024, volume=6, issue=1, title="Neural networks", second="Shevchenko")
+            self.assertEqual(index.ingest(first), 1)
+            self.assertEqual(index.by_author("petrenko"), [])
+            self.assertEqual([row["issue"] for row in index.by_author("shevchenko")], ["1"])
+            self.assertEqual([row["articles"] for row in index.issues()], [1, 1])
+
+    def test_duplicate_dois_and_partial_batches(self):
+        article = BATCH[BATCH.index("<journal_article>"):BATCH.index("</journal>")]
+        two_articles = BATCH.replace(article, article + article.replace(".001<", ".011<"))
+        with tempfile.TemporaryDirectory() as tmp, ArchiveIndex(os.path.join(tmp, "archive.sqlite")) as index:
+            full = os.path.join(tmp, "full.xml")
+            with open(full, "w", encoding="utf-8") as f:
+                f.write(two_articles.format(year=2024, volume=6, issue=1, title="Neural networks", second="Petrenko"))
+            self.assertEqual(index.ingest(full), 2)
+            # Two articles on one DOI (same first page): the first is indexed, the ingest does not fail.
+            twice = os.path.join(tmp, "twice.xml")
+            with open(twice, "w", encoding="utf-8") as f:
+                f.write(BATCH.replace(article, article * 2).format(
+                    year=2024, volume=6, issue=2, title="Routing", second="Kovalenko"))
+            with self.assertLogs("xml_generation.crossref.archive_index", "WARNING"):
+                self.assertEqual(index.ingest(twice), 1)
+            # A changed-only batch with one of issue 1's articles updates it and keeps the other one.
+            delta = self.write(tmp, "delta.xml", year=2024, volume=6, issue=1, title="Neural networks, revised",
+                               second="Shevchenko")
+            self.assertEqual(index.ingest(delta, partial=True), 1)
+            self.assertEqual([row["articles"] for row in index.issues()], [2, 1])
+            self.assertEqual(index.by_doi("10.1000/j2024.01.001")[0]["title"], "Neural networks, revised")
+            self.assertEqual(index.by_doi("10.1000/j2024.01.011")[0]["title"], "Neural networks")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+
+from docx_processing.author_names import AuthorName, parse_author_line, parse_authors
+from xml_generation.ici_copernicus.create_copernicus_ini_xml import parse_authors_simple
+
+
+class AuthorNameTests(unittest.TestCase):
+    def test_name_forms(self):
+        parsed = parse_author_line("Havano N. I., V.S. Ivkova, Ivan Tyshyk, Teleshko 2024")
+        self.assertEqual(parsed, (
+            AuthorName("Havano N. I.", "N I", "Havano"),
+            AuthorName("V.S. Ivkova", "V S", "Ivkova"),
+            AuthorName("Ivan Tyshyk", "Ivan", "Tyshyk"),
+            None,
+        ))
+
+    def test_batch_and_placeholder(self):
+        lines = ["Гавано Н. І. та Добуш М. Р.", "Authors not found.", None]
+        self.assertEqual(
+            [[(a.given, a.surname) for a in authors] for authors in parse_authors(lines)],
+            [[("Н І", "Гавано"), ("М Р", "Добуш")], [], []],
+        )
+
+    def test_copernicus_uses_shared_parser(self):
+        self.assertEqual(
+            [(a["name"], a["surname"], a["order"]) for a in parse_authors_simple("Bybyk R.T., Ivan Tyshyk")],
+            [("R T", "Bybyk", "1"), ("Ivan", "Tyshyk", "2")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
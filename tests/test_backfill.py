@@ -0,0 +1,55 @@
+import os
+import tempfile
+import unittest
+
+from pipeline.backfill import check_doi_collisions, discover_issues, issue_config, merge_config
+
+BASE = {"publication": {"year": "2026", "month": "06", "volume": "8", "issue": "1"}, "app": {"inject_pdf_pages": True}}
+
+
+class BackfillConfigTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        for rel in ("volume-10/issue-2", "volume-9/issue-1", "volume-10/issue-1", "volume-9/notes"):
+            os.makedirs(os.path.join(self.tmp.name, rel))
+
+    def test_discover_issues_in_numeric_order(self):
+        found = [(volume, issue) for volume, issue, _ in discover_issues(self.tmp.name)]
+        self.assertEqual(found, [(9, 1), (10, 1), (10, 2)])
+
+    def test_merge_config_keeps_base(self):
+        merged = merge_config(BASE, {"publication": {"year": "2019"}})
+        self.assertEqual(merged["publication"], {"year": "2019", "month": "06", "volume": "8", "issue": "1"})
+        self.assertEqual(BASE["publication"]["year"], "2026")
+
+    def test_issue_config_defaults_and_override(self):
+        issue_dir = os.path.join(self.tmp.name, "volume-10", "issue-2")
+        output_dir = os.path.join(self.tmp.name, "out", "volume-10", "issue-2")
+        with self.assertRaisesRegex(ValueError, "publication.year is required for volume 10"):
+            issue_config(BASE, 10, 2, issue_dir, output_dir)
+        config = issue_config(BASE, 8, 2, issue_dir, output_dir)
+        self.assertEqual((config["publication"]["volume"], config["publication"]["issue"]), ("8", "2"))
+        self.assertEqual(config["publication"]["year"], "2026")
+        self.assertFalse(config["app"]["inject_pdf_pages"])
+        self.assertEqual(config["crossref"]["batch_id_prefix"], "register_v8_i2")
+        self.assertEqual(config["deposit"]["ledger_db"], os.path.join(output_dir, "doi_ledger.sqlite"))
+        with open(os.path.join(issue_dir, "issue.yml"), "w", encoding="utf-8") as f:
+            f.write("publication:\n  month: '12'\n  year: '2028'\n")
+        config = issue_config(BASE, 10, 2, issue_dir, output_dir)
+        self.assertEqual(config["publication"], {"year": "2028", "month": "12", "volume": "10", "issue": "2"})
+
+    def test_doi_collisions_fail_every_issue_involved(self):
+        entries = [
+            {"volume": "1", "issue": "1", "status": "ok", "dois": ["10.1/csn2026.01.001", "10.1/csn2026.01.011"]},
+            {"volume": "2", "issue": "1", "status": "ok", "dois": ["10.1/csn2026.01.001"]},
+            {"volume": "2", "issue": "2", "status": "ok", "dois": ["10.1/csn2026.02.001"]},
+        ]
+        collisions = check_doi_collisions(entries)
+        self.assertEqual(collisions, [{"doi": "10.1/csn2026.01.001", "issues": ["1/1", "2/1"]}])
+        self.assertEqual([entry["status"] for entry in entries], ["failed", "failed", "ok"])
+        self.assertIn("10.1/csn2026.01.001", entries[1]["error"])
+        self.assertFalse(any("dois" in entry for entry in entries))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+
+from pipeline.dag import BuildGraph, Stage
+
+
+class BuildGraphTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.src = os.path.join(self.tmp.name, "src.txt")
+        self.mid = os.path.join(self.tmp.name, "mid.txt")
+        self.out = os.path.join(self.tmp.name, "out.txt")
+        self.runs = []
+        self.settings = {"license": "cc-by"}
+        with open(self.src, "w") as f:
+            f.write("hello")
+
+    def _graph(self):
+        def run_mid(ctx):
+            self.runs.append("mid")
+            with open(self.src) as src, open(self.mid, "w") as dst:
+                dst.write(src.read().strip().upper())
+
+        def run_out(ctx):
+            self.runs.append("out")
+            with open(self.mid) as src, open(self.out, "w") as dst:
+                dst.write(f"{src.read()} [{self.settings['license']}]")
+
+        graph = BuildGraph(
+            os.path.join(self.tmp.name, ".build"),
+            [
+                Stage("mid", run_mid, lambda ctx: {"src": graph.digest(self.src)}, [self.mid]),
+                Stage(
+                    "out", run_out,
+                    lambda ctx: {"mid": graph.digest(self.mid), "license": self.settings["license"]},
+                    [self.out], deps=("mid",),
+                ),
+            ],
+        )
+        return graph
+
+    def _write_src(self, text):
+        with open(self.src, "w") as f:
+            f.write(text)
+        # Make sure the (size, mtime) digest cache notices the rewrite.
+        st = os.stat(self.src)
+        os.utime(self.src, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    def test_second_build_is_a_no_op(self):
+        self._graph().build(None)
+        self._graph().build(None)
+        self.assertEqual(self.runs, ["mid", "out"])
+
+    def test_config_change_reruns_only_dependent_stage(self):
+        self._graph().build(None)
+        self.settings["license"] = "cc-by-sa"
+        report = self._graph().build(None)
+        self.assertEqual(self.runs, ["mid", "out", "out"])
+        self.assertIsNone(dict(report)["mid"])
+
+    def test_identical_upstream_output_does_not_cascade(self):
+        self._graph().build(None)
+        self._write_src("hello\n")  # same upper-cased, stripped output
+        self._graph().build(None)
+        self.assertEqual(self.runs, ["mid", "out", "mid"])
+
+    def test_missing_output_is_rebuilt(self):
+        self._graph().build(None)
+        os.remove(self.out)
+        self._graph().build(None)
+        self.assertEqual(self.runs, ["mid", "out", "out"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+
+from docx import Document
+
+from docx_generation.certificates import write_letters
+
+CROSSREF_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<doi_batch xmlns="http://www.crossref.org/schema/5.4.0" version="5.4.0"><body><journal>
+<journal_metadata><full_title>Test Journal</full_title><issn media_type="print">1234-5678</issn></journal_metadata>
+<journal_issue><publication_date><year>2024</year></publication_date>
+<journal_volume><volume>6</volume></journal_volume><issue>2</issue></journal_issue>
+<journal_article><titles><title>FIRST</title></titles>
+<contributors><person_name><given_name>I V</given_name><surname>Ivanenko</surname></person_name>
+<person_name><given_name>P P</given_name><surname>Petrenko</surname></person_name></contributors>
+<pages><first_page>1</first_page><last_page>9</last_page></pages>
+<doi_data><doi>10.1000/j2024.02.001</doi><resource>https://example.org/1</resource></doi_data></journal_article>
+<journal_article><titles><title>SECOND</title></titles>
+<pages><first_page>10</first_page><last_page>19</last_page></pages>
+<doi_data><doi>10.1000/j2024.02.010</doi><resource>https://example.org/10</resource></doi_data></journal_article>
+</journal></body></doi_batch>
+"""
+
+
+class CertificateTests(unittest.TestCase):
+    def test_letters_per_author_from_template(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            xml_path = os.path.join(tmp, "crossref.xml")
+            with open(xml_path, "w", encoding="utf-8") as f:
+                f.write(CROSSREF_XML)
+            template = Document()
+            paragraph = template.add_paragraph("Dear {au")
+            paragraph.add_run("thor}, DOI {doi}, pages {pages}").bold = True
+            template.add_paragraph("{journal_title} {volume}({issue}) {unknown}")
+            template_path = os.path.join(tmp, "template.docx")
+            template.save(template_path)
+
+            for jobs in (1, 2):
+                out = os.path.join(tmp, f"letters-{jobs}")
+                paths = write_letters(xml_path, out, template_path, per_author=True, jobs=jobs)
+                self.assertEqual(
+                    [os.path.basename(path) for path in paths],
+                    ["j2024.02.001-1-Ivanenko.docx", "j2024.02.001-2-Petrenko.docx", "j2024.02.010.docx"],
+                )
+                texts = [p.text for p in Document(paths[1]).paragraphs]
+                self.assertEqual(texts, ["Dear P P Petrenko, DOI 10.1000/j2024.02.001, pages 1-9",
+                                         "Test Journal 6(2) {unknown}"])
+                self.assertEqual(Document(paths[2]).paragraphs[0].text,
+                                 "Dear N/A, DOI 10.1000/j2024.02.010, pages 10-19")
+
+    def test_split_placeholders_only_and_breaks_kept(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            xml_path = os.path.join(tmp, "crossref.xml")
+            with open(xml_path, "w", encoding="utf-8") as f:
+                f.write(CROSSREF_XML)
+            # No placeholder is whole in the XML: each one is split over runs, as Word often saves them.
+            template = Document()
+            paragraph = template.add_paragraph("DOI: {")
+            paragraph.add_run("doi").bold = True
+            paragraph.add_run("}")
+            paragraph = template.add_paragraph("A {ti")
+            run = paragraph.add_run("tle}")
+            run.add_break()
+            run.add_text("second line")
+            template_path = os.path.join(tmp, "template.docx")
+            template.save(template_path)
+
+            paths = write_letters(xml_path, os.path.join(tmp, "letters"), template_path, jobs=1)
+            paragraphs = Document(paths[1]).paragraphs
+            self.assertEqual([p.text for p in paragraphs], ["DOI: 10.1000/j2024.02.010", "A SECOND\nsecond line"])
+            self.assertEqual([r.text for r in paragraphs[1].runs], ["A SECOND", "\nsecond line"])
+
+
+if __name__ == "__main__":
+    unittest.main()
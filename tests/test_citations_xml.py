@@ -0,0 +1,32 @@
+import os
+import tempfile
+import unittest
+
+from lxml import etree
+
+from xml_generation.crossref.create_citations_xml import DOI_RESOURCES_NS, write_citation_deposits
+
+NS = {"r": DOI_RESOURCES_NS}
+
+
+class CitationDepositTests(unittest.TestCase):
+    def test_streaming_split_deposits(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            items = ((f"10.23939/csn2026.01.{i:03d}", [f"Ref {i} & co.", "Second ref."]) for i in range(5))
+            written = write_citation_deposits(os.path.join(tmp, "citations.xml"), items, per_file=2,
+                                              batch_prefix="citations_test")
+            self.assertEqual([(os.path.basename(p), n) for p, n in written],
+                             [("citations-0001.xml", 2), ("citations-0002.xml", 2), ("citations-0003.xml", 1)])
+            root = etree.parse(written[0][0]).getroot()
+            self.assertEqual(root.get("version"), "4.4.2")
+            self.assertEqual(root.findtext("r:head/r:doi_batch_id", namespaces=NS), "citations_test_0001")
+            entries = root.findall("r:body/r:doi_citations", NS)
+            self.assertEqual([e.findtext("r:doi", namespaces=NS) for e in entries],
+                             ["10.23939/csn2026.01.000", "10.23939/csn2026.01.001"])
+            citations = entries[0].findall("r:citation_list/r:citation", NS)
+            self.assertEqual(citations[0].get("key"), "ref1")
+            self.assertEqual(citations[0].findtext("r:unstructured_citation", namespaces=NS), "Ref 0 & co.")
+
+
+if __name__ == "__main__":
+    unittest.main()
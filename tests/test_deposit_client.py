@@ -0,0 +1,115 @@
+import os
+import tempfile
+import time
+import unittest
+
+from deposit.client import DepositClient, read_batch_id
+from deposit.mock_server import FAILURE_PAGE, MockHandler, start_mock_server
+
+BATCH = """<?xml version='1.0' encoding='UTF-8'?>
+<doi_batch xmlns="http://www.crossref.org/schema/5.4.0" version="5.4.0">
+  <head><doi_batch_id>register_issue_{n}</doi_batch_id><timestamp>2026010100000{n}</timestamp></head>
+  <body/>
+</doi_batch>
+"""
+
+
+class DepositClientTests(unittest.TestCase):
+    def setUp(self):
+        self.server = start_mock_server(credentials=("user/role", "secret"))
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.paths = []
+        for n in range(20):
+            path = os.path.join(self.tmp.name, f"batch-{n}.xml")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(BATCH.format(n=n))
+            self.paths.append(path)
+
+    def _client(self, **kwargs):
+        client = DepositClient(self.server.base_url, "user/role", "secret", backoff=0.001, **kwargs)
+        self.addCleanup(client.close)
+        return client
+
+    def test_read_batch_id(self):
+        self.assertEqual(read_batch_id(self.paths[3]), "register_issue_3")
+
+    def test_parallel_upload_over_pooled_connections(self):
+        results = self._client(concurrency=4).upload_many(self.paths)
+        self.assertEqual([r["status"] for r in results], ["submitted"] * 20)
+        self.assertEqual([r["doi_batch_id"] for r in results], [f"register_issue_{n}" for n in range(20)])
+        self.assertEqual(len(self.server.state.deposits), 20)
+        self.assertLessEqual(len(self.server.state.connections), 4)
+
+    def test_retries_transient_failures(self):
+        self.server.state.fail_next = 2
+        result = self._client(concurrency=1).upload(self.paths[0])
+        self.assertEqual(result["status"], "submitted")
+        self.assertEqual(result["attempts"], 3)
+
+    def test_rejected_login_is_not_retried(self):
+        client = DepositClient(self.server.base_url, "user/role", "wrong", backoff=0.001)
+        self.addCleanup(client.close)
+        result = client.upload(self.paths[0])
+        self.assertEqual(result["status"], "failed")
+        self.assertEqual(result["attempts"], 1)
+        self.assertEqual(self.server.state.requests, 1)
+
+
+    def test_credentials_stay_out_of_urls(self):
+        paths = []
+
+        class RecordingHandler(MockHandler):
+            def parse_request(self):
+                ok = super().parse_request()
+                paths.append(self.path)
+                return ok
+
+        server = start_mock_server(credentials=("user/role", "secret"), handler=RecordingHandler)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        client = DepositClient(server.base_url, "user/role", "secret", backoff=0.001)
+        self.addCleanup(client.close)
+        self.assertEqual(client.upload(self.paths[0])["status"], "submitted")
+        self.assertIn(b'status="completed"', client.submission_result("register_issue_0"))
+        self.assertEqual(len(paths), 2)
+        self.assertFalse([path for path in paths if "secret" in path])
+
+    def test_upload_is_not_retried_after_a_read_timeout(self):
+        class SlowHandler(MockHandler):
+            def do_POST(self):
+                time.sleep(0.3)
+                super().do_POST()
+
+        server = start_mock_server(handler=SlowHandler)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        client = DepositClient(server.base_url, backoff=0.001, timeout=0.1)
+        self.addCleanup(client.close)
+        result = client.upload(self.paths[0])
+        self.assertEqual(result["status"], "failed")
+        self.assertIn("Timeout", result["error"])
+        time.sleep(0.5)
+        self.assertEqual(server.state.requests, 1)
+
+    def test_upload_is_not_retried_after_a_gateway_error(self):
+        class GatewayErrorHandler(MockHandler):
+            def do_POST(self):
+                self._count()
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                self._send(502, FAILURE_PAGE.format("Bad gateway"))
+
+        server = start_mock_server(handler=GatewayErrorHandler)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        client = DepositClient(server.base_url, backoff=0.001)
+        self.addCleanup(client.close)
+        result = client.upload(self.paths[0])
+        self.assertEqual((result["status"], result["http_status"], result["attempts"]), ("failed", 502, 1))
+        self.assertEqual(server.state.requests, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
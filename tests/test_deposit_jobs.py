@@ -0,0 +1,114 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+
+from deposit.client import DepositClient
+from deposit.jobs import MIN_POLL_SECONDS, DepositQueue, parse_diagnostic, poll
+from deposit.mock_server import start_mock_server
+
+BATCH = """<?xml version='1.0' encoding='UTF-8'?>
+<doi_batch xmlns="http://www.crossref.org/schema/5.4.0" version="5.4.0">
+  <head><doi_batch_id>register_issue_{n}</doi_batch_id></head>
+  <body><journal><journal_article><doi_data><doi>10.23939/csn2026.01.{n:03d}</doi></doi_data></journal_article>
+  <journal_article><doi_data><doi>10.23939/csn2026.01.{m:03d}</doi></doi_data></journal_article></journal></body>
+</doi_batch>
+"""
+
+DIAGNOSTIC = b"""<?xml version="1.0" encoding="UTF-8"?>
+<doi_batch_diagnostic status="completed" sp="cs3.crossref.org">
+   <submission_id>1430210932</submission_id>
+   <batch_id>register_issue_20260601120000</batch_id>
+   <record_diagnostic status="Success">
+      <doi>10.23939/csn2026.01.001</doi>
+      <msg>Successfully added</msg>
+   </record_diagnostic>
+   <record_diagnostic status="Failure">
+      <doi>10.23939/csn2026.01.012</doi>
+      <msg>Record not processed because submitted version: 2 is less or equal to previously submitted version</msg>
+   </record_diagnostic>
+   <batch_data>
+      <record_count>2</record_count>
+      <success_count>1</success_count>
+      <warning_count>0</warning_count>
+      <failure_count>1</failure_count>
+   </batch_data>
+</doi_batch_diagnostic>
+"""
+
+
+class DepositJobsTests(unittest.TestCase):
+    def setUp(self):
+        self.server = start_mock_server()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.db = os.path.join(self.tmp.name, "deposits.sqlite")
+        self.client = DepositClient(self.server.base_url, backoff=0.001)
+        self.addCleanup(self.client.close)
+
+    def test_parse_diagnostic(self):
+        diagnostic = parse_diagnostic(DIAGNOSTIC)
+        self.assertEqual(diagnostic["status"], "completed")
+        self.assertEqual(diagnostic["submission_id"], "1430210932")
+        self.assertEqual((diagnostic["success_count"], diagnostic["failure_count"]), (1, 1))
+        self.assertEqual(diagnostic["records"][1][:2], ("10.23939/csn2026.01.012", "Failure"))
+
+    def test_poll_until_completed_and_survive_restart(self):
+        self.server.state.processing_delay = 0.15
+        self.server.state.fail_dois = {"10.23939/csn2026.01.104"}
+        paths = []
+        for n in range(6):
+            path = os.path.join(self.tmp.name, f"batch-{n}.xml")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(BATCH.format(n=n, m=100 + n))
+            paths.append(path)
+        queue = DepositQueue(self.db, initial_interval=0.0, max_interval=0.05, min_interval=0.01)
+        for result in self.client.upload_many(paths):
+            queue.add(result)
+        time.sleep(0.02)
+        asyncio.run(poll(queue, self.client, concurrency=3, once=True))
+        self.assertEqual(queue.status_counts(), {"queued": 6})
+        queue.close()
+
+        queue = DepositQueue(self.db, initial_interval=0.0, max_interval=0.05, min_interval=0.01)
+        self.addCleanup(queue.close)
+        asyncio.run(poll(queue, self.client, concurrency=3))
+        self.assertEqual(queue.status_counts(), {"completed": 6})
+        self.assertEqual(len(queue.records()), 12)
+        self.assertEqual([r["doi"] for r in queue.records(failed_only=True)], ["10.23939/csn2026.01.104"])
+        # Only the batch with a Failure record may be submitted again.
+        self.assertEqual([n for n in range(6) if queue.accepts(f"register_issue_{n}")], [4])
+
+
+    def test_missing_and_duplicate_batch_ids_are_rejected(self):
+        queue = DepositQueue(self.db, initial_interval=0.0)
+        self.addCleanup(queue.close)
+        self.assertEqual(queue.initial_interval, MIN_POLL_SECONDS)
+        with self.assertRaisesRegex(ValueError, "no doi_batch_id"):
+            queue.add({"file": "a.xml", "doi_batch_id": None})
+        queue.add({"file": "a.xml", "doi_batch_id": "register_issue_1"})
+        with self.assertRaisesRegex(ValueError, "already queued"):
+            queue.add({"file": "b.xml", "doi_batch_id": "register_issue_1"})
+        self.assertEqual([batch["file"] for batch in queue.outstanding()], ["a.xml"])
+
+    def test_batch_never_completing_is_failed_after_max_age(self):
+        queue = DepositQueue(self.db, initial_interval=0.0, max_interval=0.05, max_age=0.2, min_interval=0.01)
+        self.addCleanup(queue.close)
+        queue.add({"file": "lost.xml", "doi_batch_id": "never_uploaded"})
+        asyncio.run(asyncio.wait_for(poll(queue, self.client), timeout=5))
+        batch = queue.db.execute("SELECT * FROM batches").fetchone()
+        self.assertEqual(batch["status"], "failed")
+        self.assertGreater(batch["polls"], 1)
+        self.assertIn("last status unknown_submission", batch["error"])
+        # A failed batch id (same file resubmitted, e.g. after fixing credentials) can be queued again.
+        self.assertTrue(queue.accepts("never_uploaded"))
+        queue.add({"file": "lost.xml", "doi_batch_id": "never_uploaded"})
+        batch = queue.batch("never_uploaded")
+        self.assertEqual((batch["status"], batch["polls"], batch["error"]), ("submitted", 0, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+
+from xml_generation.doi_index import DoiIndex, append, build, compact, unknown_reference_dois
+
+
+class DoiIndexTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        self.index = os.path.join(self.dir, "index")
+        self.openalex = os.path.join(self.dir, "works.jsonl.gz")
+        with gzip.open(self.openalex, "wt", encoding="utf-8") as f:
+            for i in range(500):
+                f.write(json.dumps({"doi": f"https://doi.org/10.1000/W{i}", "publication_year": 2000 + i % 20}) + "\n")
+        self.crossref = os.path.join(self.dir, "crossref.json")
+        with open(self.crossref, "w", encoding="utf-8") as f:
+            json.dump({"items": [{"DOI": "10.2000/new", "issued": {"date-parts": [[2024, 5]]}}]}, f)
+
+    def test_build_append_lookup(self):
+        self.assertEqual(build(self.index, [self.openalex], chunk_records=128), 500)
+        self.assertEqual(append(self.index, [self.crossref]), 1)
+        with DoiIndex(self.index) as index:
+            self.assertEqual(len(index), 501)
+            self.assertEqual(index.lookup("10.1000/w7"), 2007)
+            self.assertEqual(index.lookup("https://doi.org/10.2000/NEW."), 2024)
+            self.assertNotIn("10.1000/w500", index)
+        self.assertEqual(compact(self.index), 501)
+        self.assertEqual(len([name for name in os.listdir(self.index) if name.endswith(".seg")]), 1)
+
+    def test_unknown_reference_dois(self):
+        build(self.index, [self.openalex])
+        article = ("T", "Т", "A", (5, 9), ["Known. https://doi.org/10.1000/W1", "Typo. doi:10.1000/W1x", "No DOI."])
+        with DoiIndex(self.index) as index:
+            unknown = unknown_reference_dois(index, [article])
+        self.assertEqual([(u["first_page"], u["reference"], u["doi"]) for u in unknown], [(5, 2, "10.1000/W1x")])
+
+
+if __name__ == "__main__":
+    unittest.main()
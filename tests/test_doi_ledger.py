@@ -0,0 +1,57 @@
+import os
+import re
+import tempfile
+import unittest
+
+from xml_generation.crossref.create_crossref_xml import create_full_xml
+from xml_generation.crossref.doi_ledger import DoiLedger
+
+ARTICLES = [
+    (
+        "FIRST TITLE", "ПЕРША НАЗВА", "Ivanenko I. V.", (1, 8), ["Ref one."], "First abstract.",
+        ["Lviv Polytechnic National University"], [None],
+    ),
+    (
+        "SECOND TITLE", "ДРУГА НАЗВА", "Petrenko P. P.", (9, 20), ["Ref two."], "Second abstract.",
+        ["Lviv Polytechnic National University"], [None],
+    ),
+]
+
+
+def batch_id(xml):
+    return re.search(r"<doi_batch_id>([^<]+)</doi_batch_id>", xml).group(1)
+
+
+def dois(xml):
+    return re.findall(r"<doi>([^<]+\.\d{3})</doi>", xml)
+
+
+class DoiLedgerTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.ledger = DoiLedger(os.path.join(tmp.name, "ledger.sqlite"))
+        self.addCleanup(self.ledger.close)
+
+    def test_changed_only_emits_articles_changed_since_deposit(self):
+        xml = create_full_xml(ARTICLES, ledger=self.ledger)
+        self.assertEqual(len(dois(xml)), 2)
+        self.assertEqual(self.ledger.mark_deposited(batch_id(xml), dois(xml)), 2)
+
+        self.assertIsNone(create_full_xml(ARTICLES, ledger=self.ledger, changed_only=True))
+        with self.assertRaisesRegex(ValueError, "ledger"):
+            create_full_xml(ARTICLES, changed_only=True)
+
+        corrected = [ARTICLES[0], ARTICLES[1][:5] + ("Corrected abstract.",) + ARTICLES[1][6:]]
+        delta = create_full_xml(corrected, ledger=self.ledger, changed_only=True)
+        self.assertEqual(len(dois(delta)), 1)
+        self.assertTrue(dois(delta)[0].endswith(".009"))
+        self.assertIn("Corrected abstract.", delta)
+        self.assertEqual([e["doi"] for e in self.ledger.entries(pending_only=True)], dois(delta))
+
+    def test_without_ledger_output_is_unchanged(self):
+        self.assertEqual(len(dois(create_full_xml(ARTICLES))), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
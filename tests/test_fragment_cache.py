@@ -0,0 +1,63 @@
+import tempfile
+import unittest
+
+from xml_generation.crossref.create_crossref_xml import create_full_xml
+from xml_generation.fragment_cache import FragmentCache
+from xml_generation.ici_copernicus.create_copernicus_ini_xml import create_ici_copernicus_xml
+from xml_generation.reproducible import configure_reproducible, reproducible_settings
+
+ARTICLES = [
+    (
+        f"TITLE {n}", f"НАЗВА {n}", "Ivanenko I. V., Petrenko P. P.", (n * 10 + 1, n * 10 + 10),
+        [f"Ref {n}. https://doi.org/10.1000/{n}"], f"Abstract {n}.", ["Lviv Polytechnic National University"],
+        [None, None],
+    )
+    for n in range(4)
+]
+
+
+class FragmentCacheTests(unittest.TestCase):
+    def setUp(self):
+        saved = reproducible_settings()
+        self.addCleanup(lambda: configure_reproducible(**saved))
+        configure_reproducible(deterministic=True)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+
+    def _check(self, builder, name):
+        expected = builder(ARTICLES)
+        cache = FragmentCache(f"{self.dir}/{name}")
+        self.assertEqual(builder(ARTICLES, cache=cache), expected)
+        self.assertEqual((cache.hits, cache.misses), (0, 4))
+
+        cache = FragmentCache(f"{self.dir}/{name}")
+        self.assertEqual(builder(ARTICLES, cache=cache), expected)
+        self.assertEqual((cache.hits, cache.misses), (4, 0))
+
+        corrected = list(ARTICLES)
+        corrected[2] = corrected[2][:5] + ("Corrected abstract.",) + corrected[2][6:]
+        cache = FragmentCache(f"{self.dir}/{name}")
+        self.assertEqual(builder(corrected, cache=cache), builder(corrected))
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+        self.assertEqual(cache.prune_unused(), 1)
+
+    def test_crossref_fragments(self):
+        self._check(create_full_xml, "crossref")
+
+    def test_copernicus_fragments(self):
+        self._check(create_ici_copernicus_xml, "copernicus")
+
+    def test_parallel_build_is_byte_identical(self):
+        for builder in (create_full_xml, create_ici_copernicus_xml):
+            expected = builder(ARTICLES)
+            self.assertEqual(builder(ARTICLES, workers=2), expected)
+            cache = FragmentCache(f"{self.dir}/{builder.__name__}")
+            builder(ARTICLES[:1], cache=cache)
+            cache = FragmentCache(f"{self.dir}/{builder.__name__}")
+            self.assertEqual(builder(iter(ARTICLES), cache=cache, workers=2), expected)
+            self.assertEqual((cache.hits, cache.misses), (1, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import io
+import json
+import logging
+import unittest
+
+from instrumentation.logging_setup import configure_logging
+
+
+class LoggingSetupTests(unittest.TestCase):
+    def tearDown(self):
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+            handler.close()
+        root.setLevel(logging.WARNING)
+
+    def test_json_record_merges_fields(self):
+        stream = io.StringIO()
+        handler = configure_logging(log_format="json", stream=stream)
+        logging.getLogger("main").info(
+            "article extracted", extra={"fields": {"file": "a.docx", "references": 31}}
+        )
+        handler.flush()
+        record = json.loads(stream.getvalue().strip())
+        self.assertEqual(record["msg"], "article extracted")
+        self.assertEqual(record["level"], "info")
+        self.assertEqual(record["references"], 31)
+
+    def test_quiet_drops_info_and_debug(self):
+        stream = io.StringIO()
+        handler = configure_logging(quiet=True, stream=stream)
+        log = logging.getLogger("main")
+        log.info("article extracted")
+        log.debug("Abstract: ...")
+        log.warning("page count missing")
+        handler.flush()
+        lines = stream.getvalue().strip().splitlines()
+        self.assertEqual(lines, ["WARNING main: page count missing"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import os
+import random
+import tempfile
+import unittest
+
+from xml_generation.near_duplicates import NearDuplicateIndex, check_issue, signature, similarity
+
+VOCABULARY = [f"word{n}" for n in range(2000)]
+
+
+def text(seed, length=300):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(VOCABULARY) for _ in range(length))
+
+
+def article(title, first_page, abstract, references=()):
+    return (title, "", "Ivanenko I. V.", (first_page, first_page + 9), list(references), abstract, [], [])
+
+
+class NearDuplicateTests(unittest.TestCase):
+    def test_signature_estimates_similarity(self):
+        base = text(1)
+        edited = base.replace(base.split()[10], "changed", 1)
+        self.assertIsNone(signature("too short"))
+        self.assertGreater(similarity(signature(base), signature(edited)), 0.8)
+        self.assertLess(similarity(signature(base), signature(text(2))), 0.1)
+
+    def test_issue_checked_against_earlier_issues(self):
+        original = text(3)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "similarity.sqlite")
+            with NearDuplicateIndex(path) as index:
+                earlier = [article("ORIGINAL", 1, original, ["Ref A. 2020.", "Ref B. 2021."]), article("OTHER", 11, text(4))]
+                self.assertEqual(check_issue(index, "6/1", earlier, ["a.docx", "b.docx"]), [])
+            with NearDuplicateIndex(path) as index:
+                resubmitted = article("RESUBMITTED", 1, original + " with one more sentence", ["Ref A. 2020."])
+                current = [resubmitted, article("NEW", 11, text(5)), article("NEW COPY", 21, text(5))]
+                pairs = check_issue(index, "6/2", current, ["c.docx", "d.docx", "e.docx"])
+                self.assertEqual(len(index), 5)
+                # Re-checking the same issue replaces it instead of matching it against itself.
+                self.assertEqual(check_issue(index, "6/2", current, ["c.docx", "d.docx", "e.docx"]), pairs)
+        self.assertEqual(
+            [(p["title"], p["match"]["issue"], p["match"]["title"]) for p in pairs],
+            [("NEW", "6/2", "NEW COPY"), ("RESUBMITTED", "6/1", "ORIGINAL")],
+        )
+        self.assertEqual(pairs[0]["similarity"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import copy
+import unittest
+
+import xml_generation.crossref.create_crossref_xml as crossref_module
+from docx_validation.preflight import lint, orcid_checksums_ok
+
+LPNU = ["Lviv Polytechnic National University", "Department of Software Engineering"]
+
+
+def article(title, pages, authors="Ivanenko I. V., Petrenko P. P.", orcids=None, affiliations=LPNU,
+            abstract="Abstract text."):
+    if orcids is None:
+        orcids = ["https://orcid.org/0000-0002-1825-0097", "https://orcid.org/0000-0002-1694-233X"]
+    return (title, "НАЗВА", authors, pages, [], abstract, affiliations, orcids)
+
+
+class PreflightTests(unittest.TestCase):
+    def test_orcid_checksums(self):
+        self.assertEqual(
+            list(orcid_checksums_ok(["0000-0002-1825-0097", "0000-0002-1694-233X", "0000-0002-1825-0098"])),
+            [True, True, False],
+        )
+
+    def test_lint_reports_every_check(self):
+        self.addCleanup(crossref_module.apply_config, crossref_module.config)
+        config = copy.deepcopy(crossref_module.config)
+        articles = [
+            article("CLEAN", (1, 10)),
+            article("English title not found.", (11, 20), orcids=["https://orcid.org/0000-0002-1825-0098"]),
+            article("GAP", (23, 30), affiliations=["Unknown Institute of Nowhere"]),
+            article("OVERLAP", (30, 35), abstract="Abstract not found."),
+            article("NO PAGES", (None, None), affiliations=[]),
+            article("SAME FIRST PAGE", (30, 36)),
+        ]
+        ukrainian_authors = ["Іваненко І. В."] * 5 + ["Authors not found."]
+        for workers in (0, 2):
+            report = lint(articles, ukrainian_authors, config, workers=workers)
+            found = {(problem["article"], problem["check"]) for problem in report["problems"]}
+            self.assertEqual(found, {
+                (1, "placeholder"), (1, "orcid_missing"), (1, "orcid_checksum"),
+                (2, "page_gap"), (2, "institution_unresolved"),
+                (3, "page_overlap"), (3, "placeholder"), (3, "duplicate_doi"),
+                (4, "pages_missing"), (4, "institution_unresolved"),
+                (5, "placeholder"), (5, "page_overlap"), (5, "duplicate_doi"),
+            })
+        self.assertEqual(report["counts"]["placeholder"], 3)
+        duplicate = [p for p in report["problems"] if p["check"] == "duplicate_doi" and p["article"] == 3][0]
+        self.assertEqual(duplicate["same_as"], [5])
+
+
+if __name__ == "__main__":
+    unittest.main()
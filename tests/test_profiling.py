@@ -0,0 +1,121 @@
+import os
+import pstats
+import re
+import tempfile
+import time
+import unittest
+
+from instrumentation.profiling import StageProfiler
+from instrumentation.tracing import Tracer
+
+
+def _busy_crossref(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(200))
+
+
+def _busy_extract(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(200))
+
+
+def _allocate_outer():
+    return [bytearray(1024) for _ in range(300)]
+
+
+def _allocate_inner():
+    return [bytearray(1024) for _ in range(500)]
+
+
+def _profiled_run(mode, out_dir):
+    """crossref stage with a same-stage nested span and an extract stage nested in that."""
+    tracer = Tracer()
+    profiler = StageProfiler(mode, out_dir, sample_interval=0.001)
+    tracer.add_hook(profiler)
+    kept = []
+    profiler.start()
+    try:
+        with tracer.span("create_full_xml", cat="crossref"):
+            if mode == "cpu":
+                _busy_crossref(0.15)
+            else:
+                kept.append(_allocate_outer())
+            with tracer.span("fragments", cat="crossref"):
+                with tracer.span("extract_article", cat="extract"):
+                    if mode == "cpu":
+                        _busy_extract(0.15)
+                    else:
+                        kept.append(_allocate_inner())
+    finally:
+        profiler.stop()
+    profiler.write_reports()
+    return profiler
+
+
+class StageProfilerTests(unittest.TestCase):
+    def test_cpu_collapsed_stacks_and_stage_attribution(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            _profiled_run("cpu", tmp)
+            collapsed = {}
+            for stage in ("crossref", "extract"):
+                with open(os.path.join(tmp, f"{stage}.collapsed"), encoding="utf-8") as f:
+                    collapsed[stage] = f.read().splitlines()
+            functions = {
+                stage: {func for _, _, func in pstats.Stats(os.path.join(tmp, f"{stage}.pstats")).stats}
+                for stage in ("crossref", "extract")
+            }
+            self.assertTrue(os.path.exists(os.path.join(tmp, "summary.txt")))
+
+        for stage, lines in collapsed.items():
+            self.assertTrue(lines)
+            for line in lines:
+                self.assertRegex(line, r"^[^ ;]+:[^ ;]+(;[^ ;]+:[^ ;]+)* \d+$")
+        self.assertTrue(any(re.search(r":_busy_crossref( |;)", line) for line in collapsed["crossref"]))
+        self.assertFalse(any(":_busy_extract" in line for line in collapsed["crossref"]))
+        self.assertTrue(any(re.search(r":_busy_extract( |;)", line) for line in collapsed["extract"]))
+        self.assertFalse(any(":_busy_crossref" in line for line in collapsed["extract"]))
+        self.assertIn("_busy_crossref", functions["crossref"])
+        self.assertNotIn("_busy_extract", functions["crossref"])
+        self.assertIn("_busy_extract", functions["extract"])
+        self.assertNotIn("_busy_crossref", functions["extract"])
+
+    def test_mem_nested_stage_allocations_counted_once(self):
+        outer_line = _allocate_outer.__code__.co_firstlineno + 1
+        inner_line = _allocate_inner.__code__.co_firstlineno + 1
+        with tempfile.TemporaryDirectory() as tmp:
+            profiler = _profiled_run("mem", tmp)
+            with open(os.path.join(tmp, "crossref.tracemalloc.txt"), encoding="utf-8") as f:
+                report = f.read()
+
+        def net_kib(stage, line):
+            size, _ = profiler.stages[stage].sites.get((__file__, line), (0, 0))
+            return size / 1024
+
+        self.assertGreater(net_kib("crossref", outer_line), 300)
+        self.assertEqual(net_kib("crossref", inner_line), 0)
+        self.assertGreater(net_kib("extract", inner_line), 500)
+        self.assertEqual(net_kib("extract", outer_line), 0)
+        self.assertIn(f"{__file__}:{outer_line}", report)
+        self.assertNotIn(f"{__file__}:{inner_line}", report)
+        self.assertGreaterEqual(profiler.stages["crossref"].peak, 800 * 1024)
+
+    def test_check_stages_are_profiled(self):
+        for stage in ("preflight", "doi_check", "near_duplicates"):
+            with tempfile.TemporaryDirectory() as tmp:
+                tracer = Tracer()
+                profiler = StageProfiler("cpu", tmp, sample_interval=0.001)
+                tracer.add_hook(profiler)
+                profiler.start()
+                try:
+                    with tracer.span(stage, cat=stage):
+                        _busy_crossref(0.02)
+                finally:
+                    profiler.stop()
+                profiler.write_reports()
+                self.assertTrue(os.path.exists(os.path.join(tmp, f"{stage}.pstats")), stage)
+
+
+if __name__ == "__main__":
+    unittest.main()
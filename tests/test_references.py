@@ -0,0 +1,26 @@
+import unittest
+import xml.etree.ElementTree as ET
+
+from xml_generation.crossref.create_literature import create_literature_xml
+from xml_generation.references import normalize_reference
+
+REF = "Smith J. Networks. Journal, 2019, 4(2). https://doi.org/10.1000/abc.12)."
+
+
+class ReferenceTests(unittest.TestCase):
+    def test_normalize(self):
+        ref = normalize_reference(REF)
+        self.assertEqual((ref.doi, ref.year, ref.urls), ("10.1000/abc.12", 2019, ("https://doi.org/10.1000/abc.12",)))
+        self.assertIs(normalize_reference(REF), ref)
+        self.assertEqual(normalize_reference("No identifiers here.")[1:], (None, None, ()))
+
+    def test_crossref_citation_has_doi_first(self):
+        root = ET.fromstring(create_literature_xml([REF, "Plain reference."]))
+        first, second = root.findall("citation")
+        self.assertEqual([child.tag for child in first], ["doi", "unstructured_citation"])
+        self.assertEqual(first.findtext("doi"), "10.1000/abc.12")
+        self.assertEqual([child.tag for child in second], ["unstructured_citation"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import time
+import unittest
+
+from xml_generation.crossref.create_crossref_xml import create_full_xml
+from xml_generation.reproducible import configure_reproducible, reproducible_settings
+
+ARTICLES = [
+    (
+        "FIRST TITLE", "ПЕРША НАЗВА", "Ivanenko I. V.", (1, 8), ["Ref one."], "First abstract.",
+        ["Lviv Polytechnic National University"], [None],
+    ),
+]
+
+
+class ReproducibleOutputTests(unittest.TestCase):
+    def setUp(self):
+        saved = reproducible_settings()
+        self.addCleanup(lambda: configure_reproducible(**saved))
+
+    def test_deterministic_output_is_byte_identical(self):
+        configure_reproducible(deterministic=True)
+        first = create_full_xml(ARTICLES)
+        time.sleep(1.1)
+        self.assertEqual(create_full_xml(ARTICLES), first)
+        changed = create_full_xml([ARTICLES[0][:5] + ("Other abstract.",) + ARTICLES[0][6:]])
+        self.assertNotEqual(changed.split("<timestamp>")[0], first.split("<timestamp>")[0])
+
+    def test_epoch_pins_timestamp(self):
+        configure_reproducible(epoch=1780000000)
+        xml = create_full_xml(ARTICLES)
+        self.assertIn("<timestamp>20260528202640</timestamp>", xml)
+        self.assertIn("<doi_batch_id>register_issue_20260528202640</doi_batch_id>", xml)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+
+from pipeline.snapshot import load_articles, read_article, read_header, read_index, write_snapshot
+
+ARTICLES = [
+    (
+        "FIRST TITLE", "ПЕРША НАЗВА", "Ivanenko I. V.", (1, 8),
+        ["Ref one.", "Ref two."], "Abstract text.", ["Lviv Polytechnic National University"], ["0000-0002-1825-0097"],
+    ),
+    (
+        "SECOND TITLE", "ДРУГА НАЗВА", "Petrenko P. P., Sydorenko S. S.", (9, 20),
+        [], "Другий абстракт.", [], [None, None],
+    ),
+]
+
+
+class SnapshotTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "issue.ndjson")
+
+    def test_round_trip(self):
+        write_snapshot(
+            self.path, ARTICLES, {"publication": {"year": 2024}},
+            sources=["a.docx", "b.docx"], ukrainian_authors=["Іваненко І. В.", "Петренко П. П."],
+        )
+        self.assertEqual(read_header(self.path)["articles"], 2)
+        self.assertEqual(read_header(self.path)["config"], {"publication": {"year": 2024}})
+        articles, ukrainian_authors = load_articles(self.path)
+        self.assertEqual(articles, ARTICLES)
+        self.assertEqual(ukrainian_authors, ["Іваненко І. В.", "Петренко П. П."])
+
+    def test_read_article_by_offset(self):
+        write_snapshot(self.path, ARTICLES, {}, sources=["a.docx", "b.docx"])
+        record = read_article(self.path, 1)
+        self.assertEqual(record["english_title"], "SECOND TITLE")
+        self.assertEqual(record["source"], "b.docx")
+        self.assertEqual(record["pages"], [9, 20])
+
+    def test_articles_digest_ignores_config(self):
+        write_snapshot(self.path, ARTICLES, {"license": {"applies_to": "vor"}})
+        first = read_index(self.path)["articles_sha256"]
+        write_snapshot(self.path, ARTICLES, {"license": {"applies_to": "am"}})
+        self.assertEqual(read_index(self.path)["articles_sha256"], first)
+        write_snapshot(self.path, ARTICLES[:1], {"license": {"applies_to": "am"}})
+        self.assertNotEqual(read_index(self.path)["articles_sha256"], first)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import gc
+import os
+import tempfile
+import unittest
+import weakref
+from unittest import mock
+
+from benchmarks.synthetic_corpus import MERGED_PDF_NAME, build_article, generate_corpus
+from docx_processing.articles import iter_articles
+from docx_processing.parse import iter_docs
+from pdf_processing.page_count import extract_pdf_articles_pages
+
+
+class SyntheticCorpusTests(unittest.TestCase):
+    def test_build_article_is_deterministic(self):
+        self.assertEqual(build_article(3, seed=7), build_article(3, seed=7))
+        self.assertNotEqual(build_article(3, seed=7)[1], build_article(4, seed=7)[1])
+
+    def test_generated_issue_round_trips_through_extractors_and_pdf(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            names = generate_corpus(tmp, 3, seed=1, images=True)
+            extracted = list(iter_articles(tmp))
+            pdf_pages = extract_pdf_articles_pages(os.path.join(tmp, MERGED_PDF_NAME))
+
+        self.assertEqual([filename for filename, _, _ in extracted], names)
+        for (_, article, authors_uk), pages in zip(extracted, pdf_pages):
+            english_title, _, authors, page_range, references, abstract, _, orcids = article
+            self.assertNotIn("not found", english_title)
+            self.assertTrue(30 <= len(references) <= 80)
+            self.assertTrue(abstract.startswith("Abstract."))
+            self.assertEqual(len(orcids), len(authors.split(".,")))
+            self.assertTrue(all(orcids))
+            self.assertRegex(authors_uk, "[А-Яа-яІЇЄҐіїєґ]")
+            self.assertEqual(page_range, (pages["start_page"], pages["end_page"]))
+
+    def test_paragraphs_are_released_before_the_next_file_is_parsed(self):
+        class Paragraphs(list):
+            pass
+
+        parsed = []
+
+        def fake_parse_docx(path):
+            gc.collect()
+            alive = [ref for ref in parsed if ref() is not None]
+            self.assertEqual(alive, [], f"paragraphs still alive while parsing {os.path.basename(path)}")
+            paragraphs = Paragraphs(["text"])
+            parsed.append(weakref.ref(paragraphs))
+            return paragraphs, 1
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ("a.docx", "b.docx", "c.docx"):
+                open(os.path.join(tmp, name), "wb").close()
+            with mock.patch("docx_processing.parse.parse_docx", fake_parse_docx), \
+                    mock.patch("docx_processing.articles.extract_article", lambda *args: (((),) * 5, None)):
+                names = [filename for filename, _, _ in iter_articles(tmp)]
+        self.assertEqual(sorted(names), ["a.docx", "b.docx", "c.docx"])
+
+    def test_cached_files_are_not_parsed_but_keep_their_pages(self):
+        parsed = []
+
+        def fake_parse_docx(path):
+            parsed.append(os.path.basename(path))
+            return ["text"], 2
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ("a.docx", "b.docx", "c.docx"):
+                open(os.path.join(tmp, name), "wb").close()
+            with mock.patch("docx_processing.parse.parse_docx", fake_parse_docx):
+                docs = list(iter_docs(tmp, cached=lambda filename: 5 if filename == "b.docx" else None))
+        self.assertEqual(sorted(parsed), ["a.docx", "c.docx"])
+        self.assertEqual(sorted((name, paragraphs is None, end - start + 1) for name, paragraphs, start, end in docs),
+                         [("a.docx", False, 2), ("b.docx", True, 5), ("c.docx", False, 2)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import copy
+import os
+import tempfile
+import unittest
+
+from docx import Document
+from lxml import etree
+
+import xml_generation.crossref.create_crossref_xml as crossref_module
+from docx_generation.cumulative_contents import create_cumulative_contents_docx
+from docx_generation.table_writer import append_table
+from pipeline.snapshot import write_snapshot
+
+ROWS = [(1, "Ivanenko I. V.", "Title & <more>"), (2, "Line one\nline two", " padded\tcell "), (3, "", None)]
+
+
+class TableWriterTests(unittest.TestCase):
+    def test_matches_python_docx_rows(self):
+        expected = Document()
+        table = expected.add_table(rows=1, cols=3)
+        table.style = "Table Grid"
+        for cell, text in zip(table.rows[0].cells, ("№", "Authors", "Title")):
+            cell.text = text
+        for row in ROWS:
+            for cell, text in zip(table.add_row().cells, row):
+                cell.text = "" if text is None else str(text)
+
+        doc = Document()
+        self.assertEqual(append_table(doc, ("№", "Authors", "Title"), iter(ROWS)), 3)
+        self.assertEqual(etree.tostring(doc.tables[0]._tbl), etree.tostring(table._tbl))
+
+    def test_cumulative_contents_from_snapshots(self):
+        self.addCleanup(crossref_module.apply_config, crossref_module.config)
+        config = copy.deepcopy(crossref_module.config)
+        config["publication"].update(year=2024, month=5, volume=6)
+        config["journal"]["doi"] = "10.1000/j"
+        with tempfile.TemporaryDirectory() as tmp:
+            sources = []
+            for issue in (1, 2):
+                path = os.path.join(tmp, f"issue-{issue}.ndjson")
+                config["publication"]["issue"] = issue
+                articles = [(f"TITLE {issue}.{n}", f"НАЗВА {issue}.{n}", "Ivanenko I. V.", (n * 10 + 1, n * 10 + 9),
+                             [], "", [], []) for n in range(3)]
+                write_snapshot(path, articles, config, sources=["a.docx"] * 3, ukrainian_authors=["Іваненко І. В."] * 3)
+                sources.append(path)
+            out = os.path.join(tmp, "contents.docx")
+            self.assertEqual(create_cumulative_contents_docx(sources, out, ukrainian=True), 6)
+            rows = Document(out).tables[0].rows
+            self.assertEqual(
+                [cell.text for cell in rows[4].cells],
+                ["4", "Вип. 6, №2, 2024", "Іваненко І. В.", "НАЗВА 2.0", "1-9", "10.1000/j2024.02.001"],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from docx import Document
+
+from docx_validation.title_sequence_validator import (
+    REQUIRED_SECTIONS,
+    docx_paths,
+    validate_files,
+    write_csv_report,
+    write_json_report,
+)
+
+
+def write_docx(path, paragraphs):
+    doc = Document()
+    for text in paragraphs:
+        doc.add_paragraph(text)
+    doc.save(path)
+
+
+class TitleSequenceValidatorTests(unittest.TestCase):
+    def test_presence_order_and_reports(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            # Table of contents first: the repeated titles must not count as out of order.
+            write_docx(os.path.join(tmp, "a_ok.docx"),
+                       ["Зміст", *REQUIRED_SECTIONS[::-1], "Title"]
+                       + [f"{n}. {title}" for n, title in enumerate(REQUIRED_SECTIONS, 1)])
+            write_docx(os.path.join(tmp, "b_missing.docx"), ["1. Вступ", "  Висновки ", "Список літератури"])
+            swapped = REQUIRED_SECTIONS[:]
+            swapped[3], swapped[4] = swapped[4], swapped[3]
+            write_docx(os.path.join(tmp, "c_order.docx"), swapped)
+            with open(os.path.join(tmp, "d_broken.docx"), "wb") as f:
+                f.write(b"not a zip")
+            # Only the introduction is misplaced; the five sections before it are in order.
+            write_docx(os.path.join(tmp, "e_late.docx"), REQUIRED_SECTIONS[1:] + REQUIRED_SECTIONS[:1])
+
+            results = validate_files(docx_paths(tmp), workers=2)
+            write_json_report(results, os.path.join(tmp, "report.json"))
+            write_csv_report(results, os.path.join(tmp, "report.csv"))
+            with open(os.path.join(tmp, "report.json"), encoding="utf-8") as f:
+                report = json.load(f)
+            with open(os.path.join(tmp, "report.csv"), encoding="utf-8-sig", newline="") as f:
+                rows = list(csv.DictReader(f))
+
+        ok, missing, order, broken, late = results
+        self.assertTrue(ok["ok"])
+        self.assertEqual(ok["positions"]["Список літератури"], 13)
+        self.assertEqual(missing["missing"], REQUIRED_SECTIONS[1:4])
+        self.assertEqual(missing["out_of_order"], [])
+        self.assertEqual(order["missing"], [])
+        self.assertEqual(order["out_of_order"], ["Висновки"])
+        self.assertFalse(broken["ok"])
+        self.assertIsNotNone(broken["error"])
+        self.assertEqual(late["out_of_order"], ["Вступ"])
+        self.assertEqual(late["positions"], {"Вступ": 5, **{t: n for n, t in enumerate(REQUIRED_SECTIONS[1:])}})
+        self.assertEqual((report["files"], report["ok"]), (5, 1))
+        self.assertEqual([row["ok"] for row in rows], ["1", "0", "0", "0", "0"])
+        self.assertEqual(rows[2]["out_of_order"], "Висновки")
+
+
+if __name__ == "__main__":
+    unittest.main()
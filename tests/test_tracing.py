@@ -0,0 +1,34 @@
+import unittest
+
+from instrumentation.tracing import Tracer
+
+
+class TracerTests(unittest.TestCase):
+    def test_disabled_tracer_records_nothing(self):
+        tracer = Tracer()
+        with tracer.span("create_full_xml") as attrs:
+            attrs["bytes"] = 10
+        self.assertEqual(tracer.spans, [])
+
+    def test_chrome_trace_and_article_totals(self):
+        tracer = Tracer()
+        tracer.enable()
+        with tracer.span("parse_docx", file="a.docx") as attrs:
+            attrs["paragraphs"] = 120
+            with tracer.span("extract_literature", file="a.docx"):
+                pass
+        with tracer.span("extract", file="a.docx"):
+            pass
+
+        events = tracer.chrome_trace()["traceEvents"]
+        self.assertEqual([e["name"] for e in events][0], "parse_docx")
+        self.assertTrue(all(e["ph"] == "X" for e in events))
+        self.assertEqual(events[0]["args"]["paragraphs"], 120)
+        # The nested span is not double counted for the article.
+        outer = [s for s in tracer.spans if s.name in ("parse_docx", "extract")]
+        self.assertEqual(tracer.article_totals()["a.docx"], sum(s.dur_ns for s in outer))
+        self.assertIn("Slowest articles:", tracer.summary_table())
+
+
+if __name__ == "__main__":
+    unittest.main()
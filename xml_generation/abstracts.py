@@ -0,0 +1,75 @@
+"""EN/UK abstract and keyword sections of an article's extracted abstract block.
+
+The block is tokenized in one pass: each line is matched once against a
+single compiled pattern for the section labels (Abstract / Анотація /
+Keywords / Ключові слова), and the following unlabelled lines continue the
+current abstract. Results are memoized by the block text, so the Crossref and
+Copernicus emitters share one tokenization per article.
+"""
+
+import functools
+import re
+from typing import NamedTuple, Tuple
+
+ABSTRACT_NOT_FOUND = "Abstract not found."
+MAX_KEYWORDS = 20
+MAX_KEYWORD_LENGTH = 80
+
+SECTION_RE = re.compile(
+    r"^(?:(?P<en_abstract>abstract)|(?P<uk_abstract>анотац(?:ія|iя))"
+    r"|(?P<en_keywords>keywords?)|(?P<uk_keywords>ключов[іi]\s+слова))\b\s*[:.\-]?\s*(?P<rest>.*)$",
+    re.IGNORECASE,
+)
+SECTION_LABELS = ("en_abstract", "uk_abstract", "en_keywords", "uk_keywords")
+KEYWORD_SEPARATOR_RE = re.compile(r"[;,]")
+KEYWORD_STRIP = " .;:,–—()[]"
+
+
+class AbstractSections(NamedTuple):
+    en_abstract: str
+    uk_abstract: str
+    en_keywords: Tuple[str, ...]
+    uk_keywords: Tuple[str, ...]
+
+
+def parse_keywords(text):
+    """Keywords of one 'Keywords: a, b; c' remainder (at most MAX_KEYWORDS)."""
+    if not text:
+        return []
+    items = [x.strip(KEYWORD_STRIP) for x in KEYWORD_SEPARATOR_RE.split(text) if x.strip()]
+    return [x for x in items if 0 < len(x) <= MAX_KEYWORD_LENGTH][:MAX_KEYWORDS]
+
+
+@functools.lru_cache(maxsize=1024)
+def split_abstract(abstract_text):
+    """AbstractSections of one abstract block; without an English label the whole block
+    (minus keyword lines) is the English abstract."""
+    if not abstract_text or abstract_text.strip() == ABSTRACT_NOT_FOUND:
+        return AbstractSections("", "", (), ())
+    abstracts = {"en_abstract": [], "uk_abstract": []}
+    keywords = {"en_keywords": [], "uk_keywords": []}
+    unlabelled = []  # every line except keyword lines (fallback English abstract)
+    state = None
+    for line in abstract_text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        m = SECTION_RE.match(line)
+        kind = next((label for label in SECTION_LABELS if m.group(label) is not None), None) if m else None
+        if kind in keywords:
+            state = None
+            keywords[kind].extend(parse_keywords(m.group("rest")))
+            continue
+        unlabelled.append(line)
+        if kind in abstracts:
+            state = kind
+            rest = m.group("rest").strip()
+            if rest:
+                abstracts[kind].append(rest)
+        elif state is not None:
+            abstracts[state].append(line)
+    en_abstract = "\n".join(abstracts["en_abstract"]) or "\n".join(unlabelled)
+    return AbstractSections(
+        en_abstract, "\n".join(abstracts["uk_abstract"]),
+        tuple(keywords["en_keywords"]), tuple(keywords["uk_keywords"]),
+    )
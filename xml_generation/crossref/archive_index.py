@@ -0,0 +1,320 @@
+"""Archive-wide index of generated crossref.xml files: authors, ORCIDs, titles and DOIs.
+
+Each doi_batch is read with the same namespace-aware parsing as the DOCX
+tables (docx_generation.generate_docx) and stored in SQLite: articles by DOI,
+contributors by case-folded surname and bare ORCID iD (both B-tree indexed),
+and titles in an FTS5 table (unicode61 tokenizer, diacritics folded) plus a
+normalized exact-title key. Updates are per issue (volume, issue): a file
+whose SHA-256 is unchanged is skipped, otherwise that issue's rows are
+replaced in one transaction. A partial batch (pipeline.snapshot emit
+--changed-only) is ingested with --partial: its articles are upserted by DOI
+and the issue's other articles are kept. Within one file only the first
+article of a DOI is indexed. Queries never touch the XML again.
+
+    python -m xml_generation.crossref.archive_index ingest output/backfill/volume-*/issue-*/crossref.xml
+    python -m xml_generation.crossref.archive_index ingest --partial output/delta/crossref.xml
+    python -m xml_generation.crossref.archive_index author Dobush      (trailing * for a prefix)
+    python -m xml_generation.crossref.archive_index orcid 0000-0002-1825-0097
+    python -m xml_generation.crossref.archive_index title "data embedded aggregation" [--exact]
+    python -m xml_generation.crossref.archive_index doi 10.23939/csn2026.01.001
+
+With app.archive_index set, the crossref stage ingests every crossref.xml it builds.
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import sys
+import time
+
+from docx_generation.generate_docx import _nsmap, article_row, parse_journal_metadata, parse_xml
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARCHIVE_DB = os.path.join("output", "archive_index.sqlite")
+ORCID_RE = re.compile(r"(\d{4}-\d{4}-\d{4}-\d{3}[\dX])", re.IGNORECASE)
+WORD_RE = re.compile(r"\w+")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    issue_key   TEXT PRIMARY KEY,
+    volume      TEXT,
+    issue       TEXT,
+    year        TEXT,
+    source      TEXT NOT NULL,
+    sha256      TEXT NOT NULL,
+    indexed_at  REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS articles (
+    id              INTEGER PRIMARY KEY,
+    doi             TEXT NOT NULL UNIQUE,
+    issue_key       TEXT NOT NULL REFERENCES issues (issue_key),
+    title           TEXT,
+    original_title  TEXT,
+    title_key       TEXT,
+    authors         TEXT,
+    pages           TEXT,
+    url             TEXT
+);
+CREATE INDEX IF NOT EXISTS articles_issue ON articles (issue_key);
+CREATE INDEX IF NOT EXISTS articles_title_key ON articles (title_key);
+CREATE TABLE IF NOT EXISTS contributors (
+    article_id   INTEGER NOT NULL REFERENCES articles (id),
+    position     INTEGER NOT NULL,
+    given_name   TEXT,
+    surname      TEXT,
+    surname_key  TEXT,
+    orcid        TEXT,
+    PRIMARY KEY (article_id, position)
+);
+CREATE INDEX IF NOT EXISTS contributors_surname ON contributors (surname_key);
+CREATE INDEX IF NOT EXISTS contributors_orcid ON contributors (orcid);
+CREATE VIRTUAL TABLE IF NOT EXISTS title_tokens USING fts5(
+    title, original_title, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+ARTICLE_COLUMNS = (
+    "a.doi, a.title, a.original_title, a.authors, a.pages, a.url, i.volume, i.issue, i.year"
+)
+
+
+def title_key(title):
+    """Case-folded title words joined by single spaces (exact-title comparisons)."""
+    return " ".join(WORD_RE.findall((title or "").casefold()))
+
+
+def normalize_orcid(orcid):
+    match = ORCID_RE.search(orcid or "")
+    return match.group(1).upper() if match else None
+
+
+def _fts_query(text):
+    """All words of text as quoted FTS5 terms (implicit AND)."""
+    return " ".join(f'"{word}"' for word in WORD_RE.findall(text))
+
+
+def parse_batch(xml_path):
+    """(volume, issue, year, [article dict]) of a crossref.xml."""
+    root = parse_xml(xml_path)
+    nsmap = _nsmap(root)
+    _, volume, issue, year, _, _, _ = parse_journal_metadata(root, nsmap)
+    articles = []
+    for article in root.xpath("//ns:journal_article", namespaces=nsmap):
+        _, authors, title, original_title, pages, url, doi = article_row(0, article, nsmap)
+        contributors = []
+        for person in article.xpath("ns:contributors/ns:person_name", namespaces=nsmap):
+            contributors.append((
+                (person.findtext("ns:given_name", namespaces=nsmap) or "").strip(),
+                (person.findtext("ns:surname", namespaces=nsmap) or "").strip(),
+                normalize_orcid(person.findtext("ns:ORCID", namespaces=nsmap)),
+            ))
+        articles.append({
+            "doi": doi.lower(), "title": title, "original_title": original_title, "authors": authors,
+            "pages": pages, "url": url, "contributors": contributors,
+        })
+    return volume, issue, year, articles
+
+
+class ArchiveIndex:
+    def __init__(self, path=DEFAULT_ARCHIVE_DB):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _remove_articles(self, ids):
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            self.db.execute(f"DELETE FROM contributors WHERE article_id IN ({marks})", chunk)
+            self.db.execute(f"DELETE FROM title_tokens WHERE rowid IN ({marks})", chunk)
+            self.db.execute(f"DELETE FROM articles WHERE id IN ({marks})", chunk)
+
+    def _remove_issue(self, issue_key):
+        self._remove_articles([row[0] for row in self.db.execute(
+            "SELECT id FROM articles WHERE issue_key = ?", (issue_key,)
+        )])
+        self.db.execute("DELETE FROM issues WHERE issue_key = ?", (issue_key,))
+
+    def ingest(self, xml_path, force=False, partial=False, now=None):
+        """Index one crossref.xml; returns its article count, or None when it is already indexed.
+
+        partial: the file holds only some of the issue's articles; upsert them by DOI instead of
+        replacing the issue.
+        """
+        with open(xml_path, "rb") as f:
+            sha = hashlib.sha256(f.read()).hexdigest()
+        if not force and self.db.execute("SELECT 1 FROM issues WHERE sha256 = ?", (sha,)).fetchone():
+            return None
+        volume, issue, year, parsed = parse_batch(xml_path)
+        issue_key = f"{volume}/{issue}"
+        articles = {}
+        for article in parsed:
+            if article["doi"] in articles:
+                logger.warning("Duplicate DOI %s in %s; indexing its first article only", article["doi"], xml_path)
+                continue
+            articles[article["doi"]] = article
+        articles = list(articles.values())
+        now = time.time() if now is None else now
+        with self.db:
+            if not partial:
+                self._remove_issue(issue_key)
+            # A DOI moved from another issue (renumbering) belongs to this one now; in a partial
+            # batch this also replaces the article's previous version.
+            self._remove_articles([
+                row[0] for article in articles
+                for row in self.db.execute("SELECT id FROM articles WHERE doi = ?", (article["doi"],))
+            ])
+            self.db.execute(
+                "INSERT INTO issues (issue_key, volume, issue, year, source, sha256, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (issue_key) DO UPDATE SET "
+                "year = excluded.year, sha256 = excluded.sha256, indexed_at = excluded.indexed_at",
+                (issue_key, volume, issue, year, os.path.abspath(xml_path), sha, now),
+            )
+            for article in articles:
+                article_id = self.db.execute(
+                    "INSERT INTO articles (doi, issue_key, title, original_title, title_key, authors, pages, url) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (article["doi"], issue_key, article["title"], article["original_title"],
+                     title_key(article["title"]), article["authors"], article["pages"], article["url"]),
+                ).lastrowid
+                self.db.execute(
+                    "INSERT INTO title_tokens (rowid, title, original_title) VALUES (?, ?, ?)",
+                    (article_id, article["title"], article["original_title"]),
+                )
+                self.db.executemany(
+                    "INSERT INTO contributors (article_id, position, given_name, surname, surname_key, orcid) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(article_id, position, given, surname, surname.casefold(), orcid)
+                     for position, (given, surname, orcid) in enumerate(article["contributors"], 1)],
+                )
+        logger.info("Indexed %s", xml_path, extra={"fields": {
+            "issue": issue_key, "articles": len(articles), "partial": partial,
+        }})
+        return len(articles)
+
+    def _articles(self, where, params, order="i.year, CAST(i.volume AS INTEGER), CAST(i.issue AS INTEGER), a.id"):
+        return self.db.execute(
+            f"SELECT DISTINCT {ARTICLE_COLUMNS} FROM articles a JOIN issues i ON i.issue_key = a.issue_key "
+            f"{where} ORDER BY {order}",
+            params,
+        ).fetchall()
+
+    def by_author(self, surname):
+        """Articles with a contributor of that surname (case-insensitive; trailing * for a prefix)."""
+        key = surname.casefold()
+        if key.endswith("*"):
+            key = key[:-1]
+            return self._articles(
+                "JOIN contributors c ON c.article_id = a.id WHERE c.surname_key >= ? AND c.surname_key < ?",
+                (key, key + "\U0010ffff"),
+            )
+        return self._articles("JOIN contributors c ON c.article_id = a.id WHERE c.surname_key = ?", (key,))
+
+    def by_orcid(self, orcid):
+        return self._articles(
+            "JOIN contributors c ON c.article_id = a.id WHERE c.orcid = ?", (normalize_orcid(orcid) or orcid,)
+        )
+
+    def by_doi(self, doi):
+        return self._articles("WHERE a.doi = ?", (doi.strip().lower(),))
+
+    def by_title(self, title):
+        """Articles whose title has the same words as title (case and punctuation ignored)."""
+        return self._articles("WHERE a.title_key = ?", (title_key(title),))
+
+    def search_titles(self, text, limit=20):
+        """Best FTS5 matches for all words of text in the English or original title."""
+        query = _fts_query(text)
+        if not query:
+            return []
+        return self.db.execute(
+            f"SELECT {ARTICLE_COLUMNS} FROM title_tokens t JOIN articles a ON a.id = t.rowid "
+            "JOIN issues i ON i.issue_key = a.issue_key WHERE title_tokens MATCH ? ORDER BY t.rank LIMIT ?",
+            (query, limit),
+        ).fetchall()
+
+    def issues(self):
+        return self.db.execute(
+            "SELECT i.*, COUNT(a.id) AS articles FROM issues i LEFT JOIN articles a ON a.issue_key = i.issue_key "
+            "GROUP BY i.issue_key ORDER BY i.year, CAST(i.volume AS INTEGER), CAST(i.issue AS INTEGER)"
+        ).fetchall()
+
+
+def archive_path(config):
+    return (config.get("app") or {}).get("archive_index") or DEFAULT_ARCHIVE_DB
+
+
+def main(argv=None):
+    import yaml
+
+    from instrumentation.logging_setup import add_logging_arguments, configure_logging
+
+    parser = argparse.ArgumentParser(description="Index generated crossref.xml files and query the archive.")
+    parser.add_argument("--db", help="Index database (default: app.archive_index in config.yml).")
+    add_logging_arguments(parser)
+    sub = parser.add_subparsers(dest="command", required=True)
+    ingest = sub.add_parser("ingest", help="Add or update issues from crossref.xml files.")
+    ingest.add_argument("xml", nargs="+")
+    ingest.add_argument("--force", action="store_true", help="Re-index files that are unchanged.")
+    ingest.add_argument(
+        "--partial", action="store_true",
+        help="Files hold only some articles of their issue (emit --changed-only): update those, keep the rest.",
+    )
+    sub.add_parser("author", help="Articles by surname (trailing * for a prefix).").add_argument("surname")
+    sub.add_parser("orcid", help="Articles by ORCID iD.").add_argument("orcid")
+    sub.add_parser("doi", help="Article by DOI.").add_argument("doi")
+    title = sub.add_parser("title", help="Articles whose title contains all the words.")
+    title.add_argument("words", nargs="+")
+    title.add_argument("--exact", action="store_true", help="Only titles with exactly these words.")
+    title.add_argument("--limit", type=int, default=20)
+    sub.add_parser("issues", help="Indexed issues.")
+    args = parser.parse_args(argv)
+    configure_logging(quiet=args.quiet, verbose=args.verbose, log_format=args.log_format)
+    if args.db is None:
+        with open("config.yml", "r", encoding="utf-8") as f:
+            args.db = archive_path(yaml.safe_load(f))
+
+    with ArchiveIndex(args.db) as index:
+        if args.command == "ingest":
+            for path in args.xml:
+                if index.ingest(path, force=args.force, partial=args.partial) is None:
+                    logger.info("Unchanged %s", path)
+            return 0
+        if args.command == "issues":
+            for row in index.issues():
+                print(f"{row['volume']}/{row['issue']}\t{row['year']}\t{row['articles']}\t{row['source']}")
+            return 0
+        if args.command == "author":
+            rows = index.by_author(args.surname)
+        elif args.command == "orcid":
+            rows = index.by_orcid(args.orcid)
+        elif args.command == "doi":
+            rows = index.by_doi(args.doi)
+        elif args.exact:
+            rows = index.by_title(" ".join(args.words))
+        else:
+            rows = index.search_titles(" ".join(args.words), limit=args.limit)
+        for row in rows:
+            print(f"{row['volume']}/{row['issue']}\t{row['year']}\t{row['doi']}\t{row['pages']}\t"
+                  f"{row['authors']}\t{row['title']}")
+        return 0 if rows else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
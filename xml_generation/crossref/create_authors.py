@@ -1,6 +1,5 @@
-import re
 import xml.etree.ElementTree as ET
-from docx_processing.extractors import split_copyright_authors
+from docx_processing.author_names import parse_author_line
 
 
 def create_contributors_xml_from_override(items):
@@ -76,20 +75,12 @@ def create_xml_for_authors_with_affiliations(
     department=None,
 ):
     """person_name contributors with optional ROR affiliations (no separate organization nodes)."""
-    authors_list = split_copyright_authors(authors_text)
     root = ET.Element("contributors")
     emitted = 0
     author_orcids = author_orcids or []
 
-    for author_index, author in enumerate(authors_list):
-        parsed = _parse_author_name(author)
-        if not parsed:
-            continue
-
-        given_name, surname = parsed
-        given_name = re.sub(r"\d+", "", given_name).strip()
-        surname = surname.strip()
-        if not given_name or not surname:
+    for author_index, author in enumerate(parse_author_line(authors_text or "")):
+        if author is None:
             continue
 
         sequence = "first" if emitted == 0 else "additional"
@@ -98,8 +89,8 @@ def create_xml_for_authors_with_affiliations(
         person_name = ET.SubElement(
             root, "person_name", sequence=sequence, contributor_role="author"
         )
-        ET.SubElement(person_name, "given_name").text = given_name
-        ET.SubElement(person_name, "surname").text = surname
+        ET.SubElement(person_name, "given_name").text = author.given
+        ET.SubElement(person_name, "surname").text = author.surname
         _append_affiliations(person_name, institution, department)
         _attach_orcid(person_name, author_orcids, author_index)
 
@@ -135,68 +126,22 @@ def create_xml_organizations_then_authors(organization_lines, authors_text, auth
     return ET.tostring(root, encoding="unicode")
 
 
-def _parse_author_name(author_str):
-    """Parse one copyright-line author into (given_name, surname), or None."""
-    t = author_str.strip()
-    if not t:
-        return None
-
-    # I. V. Tyshko / I.V. Teleshko
-    m = re.match(
-        r"^([A-Za-zА-ЯІЇЄҐа-яіїєґ]\.){1,4}\s*([A-Za-zА-ЯІЇЄҐа-яіїєґ'\-]{2,})$",
-        t,
-    )
-    if m:
-        return " ".join(re.findall(r"[A-Za-zА-ЯІЇЄҐа-яіїєґ]", m.group(1))), m.group(2)
-
-    # Tyshyk I. Y. / Arseniuk V.
-    m = re.match(
-        r"^([A-Za-zА-ЯІЇЄҐа-яіїєґ'\-]{2,})\s+((?:[A-Za-zА-ЯІЇЄҐа-яіїєґ]\.\s*){1,4})$",
-        t,
-    )
-    if m:
-        initials = re.findall(r"[A-Za-zА-ЯІЇЄҐа-яіїєґ]", m.group(2))
-        return " ".join(initials), m.group(1)
-
-    # Ivan Tyshyk (full first + surname)
-    m = re.match(
-        r"^([A-Z][a-zА-ЯІЇЄҐа-яіїєґ'\-]+)\s+([A-Z][A-Za-zА-ЯІЇЄҐа-яіїєґ'\-]{1,})$",
-        t,
-    )
-    if m:
-        return m.group(1), m.group(2)
-
-    # Fallback: first token surname, rest given (legacy)
-    name_parts = re.split(r"\s+", t)
-    if len(name_parts) >= 2:
-        return " ".join(name_parts[1:]), name_parts[0]
-    return None
-
-
 def create_xml_for_authors(authors_text, author_orcids=None):
     """Converts extracted authors into XML format."""
-    authors_list = split_copyright_authors(authors_text)
     root = ET.Element("contributors")
     emitted = 0
     author_orcids = author_orcids or []
 
-    for author_index, author in enumerate(authors_list):
-        parsed = _parse_author_name(author)
-        if not parsed:
-            continue
-
-        given_name, surname = parsed
-        given_name = re.sub(r"\d+", "", given_name).strip()
-        surname = surname.strip()
-        if not given_name or not surname:
+    for author_index, author in enumerate(parse_author_line(authors_text or "")):
+        if author is None:
             continue
 
         sequence = "first" if emitted == 0 else "additional"
         emitted += 1
 
         person_name = ET.SubElement(root, "person_name", sequence=sequence, contributor_role="author")
-        ET.SubElement(person_name, "given_name").text = given_name
-        ET.SubElement(person_name, "surname").text = surname
+        ET.SubElement(person_name, "given_name").text = author.given
+        ET.SubElement(person_name, "surname").text = author.surname
         _attach_orcid(person_name, author_orcids, author_index)
 
     xml_str = ET.tostring(root, encoding="unicode")
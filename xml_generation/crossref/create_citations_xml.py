@@ -0,0 +1,119 @@
+"""Citation-only (doi_resources 4.4.2) deposits: reference lists for existing DOIs.
+
+A resource deposit carries just <doi_citations> (DOI + citation_list) per
+article, so reference updates do not resend full journal_article records.
+Files are written in one streaming pass with lxml's xmlfile: each
+doi_citations element is built, written and dropped, so memory stays flat for
+any number of DOIs. Upload them with operation doDOICitUpload:
+
+    python -m xml_generation.crossref.create_citations_xml output/backfill/volume-*/issue-*/issue.ndjson \\
+        --output output/citations.xml --per-file 5000
+    python -m deposit.client output/citations*.xml --operation doDOICitUpload
+"""
+
+import argparse
+import itertools
+import logging
+import os
+
+import lxml.etree as etree
+
+import xml_generation.crossref.create_crossref_xml as crossref_module
+from xml_generation.crossref.create_literature import create_literature_xml
+from xml_generation.reproducible import add_reproducible_arguments, batch_timestamp, configure_reproducible
+
+logger = logging.getLogger(__name__)
+
+DOI_RESOURCES_VERSION = "4.4.2"
+DOI_RESOURCES_NS = f"http://www.crossref.org/doi_resources_schema/{DOI_RESOURCES_VERSION}"
+DOI_RESOURCES_XSD = f"http://www.crossref.org/schemas/doi_resources{DOI_RESOURCES_VERSION}.xsd"
+XSI_NS = "http://www.w3.org/2001/XMLSchema-instance"
+UPLOAD_OPERATION = "doDOICitUpload"
+
+
+def _q(tag):
+    return f"{{{DOI_RESOURCES_NS}}}{tag}"
+
+
+def create_doi_citations(doi, literature_references):
+    """<doi_citations> element for one DOI, with the citation_list from create_literature_xml."""
+    doi_citations = etree.Element(_q("doi_citations"), nsmap={None: DOI_RESOURCES_NS})
+    etree.SubElement(doi_citations, _q("doi")).text = doi
+    citation_list = etree.fromstring(create_literature_xml(literature_references))
+    crossref_module._qualify_crossref_ns(citation_list, DOI_RESOURCES_NS)
+    doi_citations.append(citation_list)
+    return doi_citations
+
+
+def _head(doi_batch_id):
+    head = etree.Element(_q("head"), nsmap={None: DOI_RESOURCES_NS})
+    etree.SubElement(head, _q("doi_batch_id")).text = doi_batch_id
+    depositor = etree.SubElement(head, _q("depositor"))
+    etree.SubElement(depositor, _q("depositor_name")).text = crossref_module.DEPOSITOR_NAME
+    etree.SubElement(depositor, _q("email_address")).text = crossref_module.DEPOSITOR_EMAIL
+    return head
+
+
+def write_citation_deposit(path, items, doi_batch_id):
+    """Stream (doi, references) pairs into one deposit file; returns the number of DOIs written."""
+    count = 0
+    with etree.xmlfile(path, encoding="UTF-8") as xf:
+        xf.write_declaration()
+        attrib = {
+            "version": DOI_RESOURCES_VERSION,
+            f"{{{XSI_NS}}}schemaLocation": f"{DOI_RESOURCES_NS} {DOI_RESOURCES_XSD}",
+        }
+        with xf.element(_q("doi_batch"), attrib, nsmap={None: DOI_RESOURCES_NS, "xsi": XSI_NS}):
+            xf.write("\n")
+            xf.write(_head(doi_batch_id), pretty_print=True)
+            with xf.element(_q("body")):
+                xf.write("\n")
+                for doi, references in items:
+                    xf.write(create_doi_citations(doi, references), pretty_print=True)
+                    count += 1
+            xf.write("\n")
+    return count
+
+
+def write_citation_deposits(output, items, per_file=0, batch_prefix=None):
+    """Write items to output (split into output-0001.xml, ... when per_file > 0); returns [(path, DOIs)]."""
+    batch_prefix = batch_prefix or f"citations_{batch_timestamp()}"
+    items = iter(items)
+    if per_file <= 0:
+        return [(output, write_citation_deposit(output, items, batch_prefix))]
+    stem, ext = os.path.splitext(output)
+    written = []
+    for part in itertools.count(1):
+        chunk = itertools.islice(items, per_file)
+        first = next(chunk, None)
+        if first is None:
+            return written
+        path = f"{stem}-{part:04d}{ext}"
+        written.append((path, write_citation_deposit(path, itertools.chain([first], chunk), f"{batch_prefix}_{part:04d}")))
+
+
+def iter_snapshot_citations(snapshot_paths):
+    """(DOI, references) for every article of every snapshot, DOIs built with that issue's config."""
+    from pipeline.snapshot import iter_snapshot, read_header
+
+    for snapshot_path in snapshot_paths:
+        crossref_module.apply_config(read_header(snapshot_path)["config"])
+        for record in iter_snapshot(snapshot_path):
+            if record.get("references"):
+                yield crossref_module.generate_doi(record["pages"][0]), record["references"]
+
+
+if __name__ == "__main__":
+    from instrumentation.logging_setup import add_logging_arguments, configure_logging
+
+    parser = argparse.ArgumentParser(description="Write citation-only (doi_resources) deposits from issue snapshots.")
+    parser.add_argument("snapshots", nargs="+", help="issue.ndjson snapshots (see pipeline.snapshot).")
+    parser.add_argument("--output", default=os.path.join("output", "citations.xml"))
+    parser.add_argument("--per-file", type=int, default=0, help="Split into files of at most N DOIs.")
+    add_logging_arguments(parser)
+    add_reproducible_arguments(parser)
+    args = parser.parse_args()
+    configure_logging(quiet=args.quiet, verbose=args.verbose, log_format=args.log_format)
+    configure_reproducible(args.deterministic, args.epoch)
+    for path, dois in write_citation_deposits(args.output, iter_snapshot_citations(args.snapshots), args.per_file):
+        logger.info("Wrote %s", path, extra={"fields": {"dois": dois}})
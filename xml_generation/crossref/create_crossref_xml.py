@@ -1,7 +1,8 @@
+import sys
 import xml.etree.ElementTree as ET
-from datetime import datetime
 import lxml.etree as etree
 import yaml
+from instrumentation.tracing import span
 from docx_processing.extractors import (
     affiliation_department_for_crossref,
     affiliation_lines_for_crossref_organization,
@@ -13,38 +14,60 @@ from xml_generation.crossref.create_authors import (
 from xml_generation.crossref.institution_ror import resolve_institution
 from xml_generation.crossref.create_literature import create_literature_xml
 from xml_generation.crossref.create_pages import create_pages_xml
+from xml_generation.crossref.doi_ledger import article_hash
+from xml_generation.fragment_cache import build_fragments, code_digest, fragment_key
+from xml_generation.reproducible import batch_timestamp, content_id, is_deterministic
 from xml_generation.crossref.slug_utils import slugify_title
+from xml_generation.abstracts import split_abstract
+
+AI_NS = "http://www.crossref.org/AccessIndicators.xsd"
+
+
+def apply_config(new_config):
+    """Bind the module-level publication/journal settings from a parsed config.yml dict.
+
+    Called at import with ./config.yml; call again to build XML for another issue
+    (snapshot re-emission, per-issue overrides in backfill workers).
+    """
+    global config, PUBLICATION_YEAR, PUBLICATION_MONTH, JOURNAL_VOLUME, JOURNAL_ISSUE
+    global JOURNAL_DOI, JOURNAL_URL, ISSN_PRINT, ISSN_ELECTRONIC, JOURNAL_FULL_TITLE
+    global JOURNAL_ABBREV_TITLE, DEPOSITOR_NAME, DEPOSITOR_EMAIL, REGISTRANT, LICENSE_URL
+    global LICENSE_APPLIES_TO, CROSSREF_SCHEMA_VERSION, CROSSREF_NS, INSTITUTIONS_CONFIG
+    global DEFAULT_INSTITUTION_ID, BATCH_ID_PREFIX
+    config = new_config
+
+    PUBLICATION_YEAR = str(config["publication"]["year"])
+    PUBLICATION_MONTH = str(config["publication"]["month"]).zfill(2)
+    JOURNAL_VOLUME = str(config["publication"]["volume"])
+    JOURNAL_ISSUE = str(config["publication"]["issue"])
+    JOURNAL_DOI = config["journal"]["doi"]
+    JOURNAL_URL = config["journal"]["base_url"]
+    ISSN_PRINT = config["journal"]["issn"]["print"]
+    ISSN_ELECTRONIC = config["journal"]["issn"]["electronic"]
+    JOURNAL_FULL_TITLE = config["journal"]["full_title"]
+    JOURNAL_ABBREV_TITLE = config["journal"]["abbrev_title"]
+    DEPOSITOR_NAME = config["depositor"]["name"]
+    DEPOSITOR_EMAIL = config["depositor"]["email"]
+    REGISTRANT = config["registrant"]
+    LICENSE_URL = config.get("license", {}).get(
+        "url", "https://creativecommons.org/licenses/by/4.0/"
+    )
+    LICENSE_APPLIES_TO = config.get("license", {}).get("applies_to", "vor")
+    CROSSREF_SCHEMA_VERSION = config.get("crossref", {}).get("schema_version", "5.4.0")
+    CROSSREF_NS = f"http://www.crossref.org/schema/{CROSSREF_SCHEMA_VERSION}"
+    INSTITUTIONS_CONFIG = config.get("institutions") or {}
+    DEFAULT_INSTITUTION_ID = config.get("crossref", {}).get("default_institution")
+    BATCH_ID_PREFIX = config.get("crossref", {}).get("batch_id_prefix", "register_issue")
+
 
 # Load configuration from YAML file
 with open("config.yml", "r") as config_file:
-    config = yaml.safe_load(config_file)
-
-PUBLICATION_YEAR = config["publication"]["year"]
-PUBLICATION_MONTH = config["publication"]["month"]
-JOURNAL_VOLUME = config["publication"]["volume"]
-JOURNAL_ISSUE = config["publication"]["issue"]
-JOURNAL_DOI = config["journal"]["doi"]
-JOURNAL_URL = config["journal"]["base_url"]
-ISSN_PRINT = config["journal"]["issn"]["print"]
-ISSN_ELECTRONIC = config["journal"]["issn"]["electronic"]
-JOURNAL_FULL_TITLE = config["journal"]["full_title"]
-JOURNAL_ABBREV_TITLE = config["journal"]["abbrev_title"]
-DEPOSITOR_NAME = config["depositor"]["name"]
-DEPOSITOR_EMAIL = config["depositor"]["email"]
-REGISTRANT = config["registrant"]
-AI_NS = "http://www.crossref.org/AccessIndicators.xsd"
-LICENSE_URL = config.get("license", {}).get(
-    "url", "https://creativecommons.org/licenses/by/4.0/"
-)
-LICENSE_APPLIES_TO = config.get("license", {}).get("applies_to", "vor")
-CROSSREF_SCHEMA_VERSION = config.get("crossref", {}).get("schema_version", "5.4.0")
-CROSSREF_NS = f"http://www.crossref.org/schema/{CROSSREF_SCHEMA_VERSION}"
-INSTITUTIONS_CONFIG = config.get("institutions") or {}
-DEFAULT_INSTITUTION_ID = config.get("crossref", {}).get("default_institution")
+    apply_config(yaml.safe_load(config_file))
 
 
-def _qualify_crossref_ns(element, ns=CROSSREF_NS):
+def _qualify_crossref_ns(element, ns=None):
     """Ensure elements parsed from stdlib ElementTree use the Crossref default namespace."""
+    ns = ns or CROSSREF_NS
     if element.tag and not str(element.tag).startswith("{"):
         element.tag = f"{{{ns}}}{element.tag}"
     for child in element:
@@ -139,10 +162,15 @@ def create_journal_article(
     _qualify_crossref_ns(contributors_element)
     journal_article.append(contributors_element)
 
-    # Abstract section
-    abstract = etree.SubElement(journal_article, "{http://www.ncbi.nlm.nih.gov/JATS1}abstract")
-    abstract.set("{http://www.w3.org/XML/1998/namespace}lang", "en")
-    etree.SubElement(abstract, "{http://www.ncbi.nlm.nih.gov/JATS1}p").text = abstract_text if abstract_text else "Abstract not available."
+    # Abstract section: one jats:abstract per language, one jats:p per paragraph
+    sections = split_abstract(abstract_text or "")
+    for language, text in (("en", sections.en_abstract or "Abstract not available."), ("uk", sections.uk_abstract)):
+        if not text:
+            continue
+        abstract = etree.SubElement(journal_article, "{http://www.ncbi.nlm.nih.gov/JATS1}abstract")
+        abstract.set("{http://www.w3.org/XML/1998/namespace}lang", language)
+        for paragraph in text.split("\n"):
+            etree.SubElement(abstract, "{http://www.ncbi.nlm.nih.gov/JATS1}p").text = paragraph
 
     # Publication Date section
     publication_date = etree.SubElement(journal_article, "publication_date", media_type="print")
@@ -183,7 +211,82 @@ def create_journal_article(
 
     return journal_article
 
-def create_full_xml(articles_data):
+FRAGMENT_CODE_MODULES = (
+    __name__,
+    "xml_generation.crossref.create_authors",
+    "xml_generation.crossref.create_literature",
+    "xml_generation.crossref.create_pages",
+    "xml_generation.crossref.institution_ror",
+    "xml_generation.crossref.slug_utils",
+    "docx_processing.extractors",
+    "docx_processing.author_names",
+    "xml_generation.abstracts",
+    "xml_generation.references",
+)
+
+
+def _fragment_settings():
+    """Module settings a journal_article fragment depends on."""
+    return {
+        "ns": CROSSREF_NS,
+        "publication": [PUBLICATION_YEAR, PUBLICATION_MONTH, JOURNAL_VOLUME, JOURNAL_ISSUE],
+        "journal": [JOURNAL_DOI, JOURNAL_URL],
+        "license": [LICENSE_URL, LICENSE_APPLIES_TO],
+        "institutions": [INSTITUTIONS_CONFIG, DEFAULT_INSTITUTION_ID],
+    }
+
+
+def journal_article_fragment(article):
+    """Serialized <journal_article> (bytes) for one article tuple."""
+    (
+        title,
+        original_language_title,
+        authors,
+        pages,
+        literature,
+        abstract_text,
+        affiliation_lines,
+    ) = article[:7]
+    author_orcids = article[7] if len(article) > 7 else None
+    journal_article = create_journal_article(
+        title,
+        original_language_title,
+        authors,
+        pages,
+        literature,
+        abstract_text,
+        affiliation_lines,
+        author_orcids=author_orcids,
+    )
+    ja = etree.fromstring(ET.tostring(journal_article))
+    _qualify_crossref_ns(ja)
+    return etree.tostring(ja)
+
+
+def journal_article_fragment_key(article):
+    return fragment_key(
+        "journal_article", list(article), _fragment_settings(),
+        code_digest(*(sys.modules[name] for name in FRAGMENT_CODE_MODULES)),
+    )
+
+
+def _init_fragment_worker(worker_config):
+    apply_config(worker_config)
+
+
+def create_full_xml(articles_data, ledger=None, changed_only=False, cache=None, workers=0):
+    """Crossref deposit XML for the issue's articles.
+
+    ledger: a DoiLedger that records each emitted DOI's journal_article hash.
+    changed_only: leave out articles whose hash equals their last deposited one (needs
+    a ledger; ValueError otherwise). Returns None when no article is left to deposit.
+    cache: a FragmentCache of serialized journal_article elements.
+    workers: build the fragments in a process pool of this size (same bytes as the serial build).
+    In deterministic mode (xml_generation.reproducible) the doi_batch_id is a
+    hash of the body, so identical inputs give identical bytes.
+    """
+    if changed_only and ledger is None:
+        raise ValueError("changed_only needs a DOI ledger to compare against")
     schema_xsd = f"http://www.crossref.org/schemas/crossref{CROSSREF_SCHEMA_VERSION}.xsd"
     root = etree.Element(
         "doi_batch",
@@ -203,8 +306,8 @@ def create_full_xml(articles_data):
 
     # Create head
     head = etree.SubElement(root, "head")
-    current_timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-    etree.SubElement(head, "doi_batch_id").text = f"register_issue_{current_timestamp}"
+    current_timestamp = batch_timestamp(PUBLICATION_YEAR, PUBLICATION_MONTH)
+    doi_batch_id_element = etree.SubElement(head, "doi_batch_id")
     etree.SubElement(head, "timestamp").text = current_timestamp
 
     depositor = etree.SubElement(head, "depositor")
@@ -229,31 +332,45 @@ def create_full_xml(articles_data):
     journal.append(jissue)
 
     # Add articles
-    for article in articles_data:
-        (
-            title,
-            original_language_title,
-            authors,
-            pages,
-            literature,
-            abstract_text,
-            affiliation_lines,
-        ) = article[:7]
-        author_orcids = article[7] if len(article) > 7 else None
-        journal_article = create_journal_article(
-            title,
-            original_language_title,
-            authors,
-            pages,
-            literature,
-            abstract_text,
-            affiliation_lines,
-            author_orcids=author_orcids,
+    emitted = {}
+    fragments = None
+    if workers and workers > 1:
+        articles_data = list(articles_data)
+        fragments = build_fragments(
+            articles_data, journal_article_fragment, journal_article_fragment_key, cache, workers,
+            initializer=_init_fragment_worker, initargs=(config,),
         )
-        ja = etree.fromstring(ET.tostring(journal_article))
-        _qualify_crossref_ns(ja)
-        journal.append(ja)
-
+    for index, article in enumerate(articles_data):
+        pages, literature = article[3], article[4]
+        with span("journal_article", cat="crossref", first_page=pages[0], references=len(literature)):
+            if fragments is not None:
+                fragment = fragments[index]
+            elif cache is None:
+                fragment = journal_article_fragment(article)
+            else:
+                fragment = cache.fragment(
+                    journal_article_fragment_key(article), lambda: journal_article_fragment(article)
+                )
+            ja = etree.fromstring(fragment)
+            if ledger is not None:
+                doi = generate_doi(pages[0])
+                content_hash = article_hash(ja)
+                if changed_only and ledger.deposited_hash(doi) == content_hash:
+                    continue
+                emitted[doi] = content_hash
+            journal.append(ja)
+
+    if changed_only and not emitted:
+        return None
+
+    if is_deterministic():
+        doi_batch_id = f"{BATCH_ID_PREFIX}_{content_id(etree.tostring(body, method='c14n'))}"
+    else:
+        doi_batch_id = f"{BATCH_ID_PREFIX}_{current_timestamp}"
+    doi_batch_id_element.text = doi_batch_id
+
+    if ledger is not None:
+        ledger.record_emissions(doi_batch_id, emitted)
 
     # Convert to a pretty-printed XML string using lxml
     xml_str = etree.tostring(root, pretty_print=True, encoding='unicode')
@@ -1,11 +1,16 @@
 import xml.etree.ElementTree as ET
 
+from xml_generation.references import normalize_references
+
+
 def create_literature_xml(literature_references):
-    """Converts the extracted literature references into an XML format."""
+    """Converts the extracted literature references into an XML format (with <doi> when the reference has one)."""
     root = ET.Element("citation_list")
-    for i, reference in enumerate(literature_references, start=1):
+    for i, reference in enumerate(normalize_references(literature_references), start=1):
         citation = ET.SubElement(root, "citation", key=f"ref{i}")
+        if reference.doi:
+            ET.SubElement(citation, "doi").text = reference.doi
         unstructured_citation = ET.SubElement(citation, "unstructured_citation")
-        unstructured_citation.text = reference
+        unstructured_citation.text = reference.text
     xml_str = ET.tostring(root, encoding="unicode")
     return xml_str
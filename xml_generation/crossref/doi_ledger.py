@@ -0,0 +1,130 @@
+"""Persistent ledger of emitted DOIs and the content hash of their journal_article.
+
+Every crossref.xml built with a ledger records, per DOI, the SHA-256 of the
+canonical (C14N) serialization of its <journal_article> and the doi_batch_id
+it went out in. When the deposit queue (deposit.jobs) sees a batch complete,
+the DOIs Crossref accepted are marked deposited with the hash from that batch.
+create_full_xml(..., changed_only=True) then leaves out articles whose hash
+equals the last deposited one, so a correction deposit carries only the
+articles that actually changed.
+
+    python -m xml_generation.crossref.doi_ledger list [--pending]
+"""
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import time
+
+from lxml import etree
+
+DEFAULT_LEDGER_DB = os.path.join("output", "doi_ledger.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS emissions (
+    doi            TEXT NOT NULL,
+    doi_batch_id   TEXT NOT NULL,
+    content_sha256 TEXT NOT NULL,
+    emitted_at     REAL NOT NULL,
+    PRIMARY KEY (doi, doi_batch_id)
+);
+CREATE TABLE IF NOT EXISTS dois (
+    doi                TEXT PRIMARY KEY,
+    emitted_sha256     TEXT NOT NULL,
+    emitted_batch_id   TEXT NOT NULL,
+    emitted_at         REAL NOT NULL,
+    deposited_sha256   TEXT,
+    deposited_batch_id TEXT,
+    deposited_at       REAL
+);
+"""
+
+
+def article_hash(journal_article):
+    """SHA-256 of the C14N form of a <journal_article> element."""
+    return hashlib.sha256(etree.tostring(journal_article, method="c14n")).hexdigest()
+
+
+class DoiLedger:
+    def __init__(self, path=DEFAULT_LEDGER_DB):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def deposited_hash(self, doi):
+        row = self.db.execute("SELECT deposited_sha256 FROM dois WHERE doi = ?", (doi,)).fetchone()
+        return row[0] if row else None
+
+    def record_emissions(self, doi_batch_id, hashes, now=None):
+        """Store {doi: content hash} for a built batch."""
+        now = time.time() if now is None else now
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO emissions (doi, doi_batch_id, content_sha256, emitted_at) VALUES (?, ?, ?, ?)",
+                [(doi, doi_batch_id, sha, now) for doi, sha in hashes.items()],
+            )
+            self.db.executemany(
+                "INSERT INTO dois (doi, emitted_sha256, emitted_batch_id, emitted_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (doi) DO UPDATE SET emitted_sha256 = excluded.emitted_sha256, "
+                "emitted_batch_id = excluded.emitted_batch_id, emitted_at = excluded.emitted_at",
+                [(doi, sha, doi_batch_id, now) for doi, sha in hashes.items()],
+            )
+
+    def mark_deposited(self, doi_batch_id, dois, now=None):
+        """Mark DOIs accepted from a batch as deposited; returns how many were known to the ledger."""
+        now = time.time() if now is None else now
+        marked = 0
+        with self.db:
+            for doi in dois:
+                row = self.db.execute(
+                    "SELECT content_sha256 FROM emissions WHERE doi = ? AND doi_batch_id = ?", (doi, doi_batch_id)
+                ).fetchone()
+                if row is None:
+                    continue
+                self.db.execute(
+                    "UPDATE dois SET deposited_sha256 = ?, deposited_batch_id = ?, deposited_at = ? WHERE doi = ?",
+                    (row[0], doi_batch_id, now, doi),
+                )
+                marked += 1
+        return marked
+
+    def entries(self, pending_only=False):
+        query = "SELECT * FROM dois"
+        if pending_only:
+            query += " WHERE deposited_sha256 IS NULL OR deposited_sha256 != emitted_sha256"
+        return self.db.execute(query + " ORDER BY doi").fetchall()
+
+
+def ledger_path(config):
+    return (config.get("deposit") or {}).get("ledger_db", DEFAULT_LEDGER_DB)
+
+
+if __name__ == "__main__":
+    import yaml
+
+    parser = argparse.ArgumentParser(description="Inspect the DOI ledger.")
+    parser.add_argument("--db", help="Ledger database (default: deposit.ledger_db in config.yml).")
+    sub = parser.add_subparsers(dest="command", required=True)
+    list_parser = sub.add_parser("list", help="Emitted DOIs with their deposit state.")
+    list_parser.add_argument("--pending", action="store_true", help="Only DOIs changed since their last deposit.")
+    args = parser.parse_args()
+    if args.db is None:
+        with open("config.yml", "r", encoding="utf-8") as f:
+            args.db = ledger_path(yaml.safe_load(f))
+    with DoiLedger(args.db) as ledger:
+        for entry in ledger.entries(pending_only=args.pending):
+            state = "deposited" if entry["deposited_sha256"] == entry["emitted_sha256"] else "pending"
+            print(f"{entry['doi']}\t{state}\t{entry['emitted_batch_id']}\t{entry['deposited_batch_id'] or ''}")
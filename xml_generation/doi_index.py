@@ -0,0 +1,341 @@
+"""Offline index of registered DOIs, for checking reference DOIs without network access.
+
+An index is a directory of immutable segment files. A segment is a 16-byte
+header (MAGIC, record count) followed by sorted big-endian uint64 records:
+the top 48 bits hold a BLAKE2b hash of the normalized DOI and the low 16 bits
+the publication year (0 when unknown). Segments are memory-mapped and binary
+searched, so a lookup reads a few pages and takes microseconds. `append` adds
+one segment per chunk of records; `compact` merges all segments into one.
+
+Sources: Crossref public data files (.json / .json.gz with "items"), OpenAlex
+works snapshots (.jsonl / .gz, one work per line), .tar archives of either,
+or text files with one DOI per line.
+
+    python -m xml_generation.doi_index build  data/doi-index crossref-2025/*.json.gz
+    python -m xml_generation.doi_index append data/doi-index openalex/part_000.gz
+    python -m xml_generation.doi_index check  data/doi-index output/issue.ndjson 10.1000/abc
+
+The doi_check build stage uses app.doi_index to flag reference DOIs that are
+not in the index before the XML is emitted.
+"""
+
+import argparse
+import gzip
+import hashlib
+import heapq
+import io
+import itertools
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import sys
+import tarfile
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"DOIIDX01"
+HEADER = struct.Struct(">8sQ")
+RECORD = struct.Struct(">Q")
+SEGMENT_SUFFIX = ".seg"
+CHUNK_RECORDS = 2_000_000
+YEAR_BITS = 16
+YEAR_MASK = (1 << YEAR_BITS) - 1
+
+DOI_PREFIX_RE = re.compile(r"^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)", re.IGNORECASE)
+
+
+def normalize_doi(doi):
+    """Lower-case DOI without resolver prefix or trailing punctuation, or None if it is not a DOI."""
+    if not doi:
+        return None
+    doi = DOI_PREFIX_RE.sub("", doi.strip()).rstrip(".,;)").lower()
+    return doi if doi.startswith("10.") and "/" in doi else None
+
+
+def doi_key(doi):
+    """48-bit hash of a normalized DOI."""
+    return int.from_bytes(hashlib.blake2b(doi.encode("utf-8"), digest_size=6).digest(), "big")
+
+
+# ---------- reading metadata dumps ----------
+def _year_of(work):
+    year = work.get("publication_year")
+    if year is None:
+        for field in ("issued", "published", "created"):
+            parts = (work.get(field) or {}).get("date-parts") or [[None]]
+            if parts and parts[0] and parts[0][0]:
+                year = parts[0][0]
+                break
+    try:
+        return min(max(int(year), 0), YEAR_MASK)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _works_from_stream(name, stream):
+    if name.endswith(".gz"):
+        stream = gzip.GzipFile(fileobj=stream)
+        name = name[:-3]
+    text = io.TextIOWrapper(stream, encoding="utf-8")
+    if name.endswith(".json"):
+        data = json.load(text)
+        items = data.get("items", []) if isinstance(data, dict) else data
+        if isinstance(data, dict) and "message" in data:
+            items = data["message"].get("items", [])
+        yield from items
+        return
+    for line in text:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("{"):
+            yield json.loads(line)
+        else:
+            yield {"DOI": line.split(",")[0].split("\t")[0]}
+
+
+def iter_source_records(path):
+    """(normalized DOI, year) for every work in a metadata dump file."""
+    if tarfile.is_tarfile(path):
+        with tarfile.open(path) as archive:
+            for member in archive:
+                if member.isfile():
+                    works = _works_from_stream(member.name, archive.extractfile(member))
+                    yield from _records(works)
+        return
+    with open(path, "rb") as f:
+        yield from _records(_works_from_stream(path, f))
+
+
+def _records(works):
+    for work in works:
+        doi = normalize_doi(work.get("DOI") or work.get("doi"))
+        if doi:
+            yield doi, _year_of(work)
+
+
+# ---------- segments ----------
+def _segment_paths(directory):
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(SEGMENT_SUFFIX)
+    )
+
+
+def _next_segment_path(directory):
+    paths = _segment_paths(directory)
+    number = int(os.path.basename(paths[-1])[len("segment-"):-len(SEGMENT_SUFFIX)]) + 1 if paths else 1
+    return os.path.join(directory, f"segment-{number:06d}{SEGMENT_SUFFIX}")
+
+
+def _write_segment(path, records):
+    """Stream sorted, de-duplicated records (ints) to path atomically; returns the count."""
+    tmp = f"{path}.tmp"
+    count = 0
+    records = iter(records)
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, 0))
+        while True:
+            batch = list(itertools.islice(records, 65536))
+            if not batch:
+                break
+            f.write(struct.pack(f">{len(batch)}Q", *batch))
+            count += len(batch)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, count))
+    os.replace(tmp, path)
+    return count
+
+
+def _dedupe(sorted_records):
+    """Drop repeated DOI hashes, keeping the first record that has a year."""
+    previous = None
+    for record in sorted_records:
+        key = record >> YEAR_BITS
+        if previous is not None and previous >> YEAR_BITS == key:
+            if not previous & YEAR_MASK and record & YEAR_MASK:
+                previous = record
+            continue
+        if previous is not None:
+            yield previous
+        previous = record
+    if previous is not None:
+        yield previous
+
+
+def append(directory, sources, chunk_records=CHUNK_RECORDS):
+    """Add the DOIs of the source files as new segment(s); returns the number of records written."""
+    os.makedirs(directory, exist_ok=True)
+    records = (
+        doi_key(doi) << YEAR_BITS | year for path in sources for doi, year in iter_source_records(path)
+    )
+    written = 0
+    while True:
+        chunk = sorted(itertools.islice(records, chunk_records))
+        if not chunk:
+            return written
+        path = _next_segment_path(directory)
+        count = _write_segment(path, _dedupe(chunk))
+        written += count
+        logger.info("Wrote %s", path, extra={"fields": {"records": count}})
+
+
+def _segment_records(path):
+    with open(path, "rb") as f:
+        f.seek(HEADER.size)
+        for block in iter(lambda: f.read(RECORD.size * 65536), b""):
+            for (record,) in RECORD.iter_unpack(block):
+                yield record
+
+
+def compact(directory):
+    """Merge all segments into one; returns its record count."""
+    paths = _segment_paths(directory)
+    if len(paths) <= 1:
+        with DoiIndex(directory) as index:
+            return len(index)
+    target = _next_segment_path(directory)
+    count = _write_segment(target, _dedupe(heapq.merge(*(_segment_records(path) for path in paths))))
+    for path in paths:
+        os.remove(path)
+    return count
+
+
+def build(directory, sources, chunk_records=CHUNK_RECORDS):
+    """Replace the index in directory with the DOIs of the source files."""
+    for path in _segment_paths(directory):
+        os.remove(path)
+    append(directory, sources, chunk_records)
+    return compact(directory)
+
+
+def index_signature(directory):
+    """Segment names, sizes and mtimes (cheap fingerprint for the build graph)."""
+    return {os.path.basename(path): [os.stat(path).st_size, os.stat(path).st_mtime_ns]
+            for path in _segment_paths(directory)}
+
+
+class DoiIndex:
+    def __init__(self, directory):
+        self.directory = directory
+        self._files = []
+        self.segments = []  # (mmap, record count), newest first
+        for path in reversed(_segment_paths(directory)):
+            f = open(path, "rb")
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, count = HEADER.unpack_from(mm)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a DOI index segment")
+            self._files.append(f)
+            self.segments.append((mm, count))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for mm, _ in self.segments:
+            mm.close()
+        for f in self._files:
+            f.close()
+        self.segments, self._files = [], []
+
+    def __len__(self):
+        return sum(count for _, count in self.segments)
+
+    def lookup(self, doi):
+        """Publication year of a DOI (0 if unknown), or None when the DOI is not in the index."""
+        doi = normalize_doi(doi)
+        if doi is None:
+            return None
+        key = doi_key(doi)
+        unpack = RECORD.unpack_from
+        for mm, count in self.segments:
+            lo, hi = 0, count
+            while lo < hi:
+                mid = (lo + hi) // 2
+                record = unpack(mm, HEADER.size + mid * RECORD.size)[0]
+                found = record >> YEAR_BITS
+                if found < key:
+                    lo = mid + 1
+                elif found > key:
+                    hi = mid
+                else:
+                    return record & YEAR_MASK
+        return None
+
+    def __contains__(self, doi):
+        return self.lookup(doi) is not None
+
+
+def unknown_reference_dois(index, articles):
+    """[{article, first_page, title, reference, doi}] for reference DOIs missing from the index."""
+    from xml_generation.references import normalize_references
+
+    unknown = []
+    for position, article in enumerate(articles):
+        for number, reference in enumerate(normalize_references(article[4]), 1):
+            if reference.doi and reference.doi not in index:
+                unknown.append({
+                    "article": position, "first_page": article[3][0], "title": article[0],
+                    "reference": number, "doi": reference.doi,
+                })
+    return unknown
+
+
+def main(argv=None):
+    from instrumentation.logging_setup import add_logging_arguments, configure_logging
+
+    parser = argparse.ArgumentParser(description="Build or query the offline DOI index.")
+    add_logging_arguments(parser)
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("build", "Create the index from metadata dumps."),
+                            ("append", "Add metadata dumps to the index as new segments.")):
+        command = sub.add_parser(name, help=help_text)
+        command.add_argument("index")
+        command.add_argument("sources", nargs="+")
+    sub.add_parser("compact", help="Merge all segments into one.").add_argument("index")
+    check = sub.add_parser("check", help="Look up DOIs, or the reference DOIs of issue snapshots (*.ndjson).")
+    check.add_argument("index")
+    check.add_argument("items", nargs="+")
+    args = parser.parse_args(argv)
+    configure_logging(quiet=args.quiet, verbose=args.verbose, log_format=args.log_format)
+
+    if args.command == "build":
+        logger.info("index built", extra={"fields": {"records": build(args.index, args.sources)}})
+        return 0
+    if args.command == "append":
+        logger.info("index appended", extra={"fields": {"records": append(args.index, args.sources)}})
+        return 0
+    if args.command == "compact":
+        logger.info("index compacted", extra={"fields": {"records": compact(args.index)}})
+        return 0
+
+    from pipeline.snapshot import load_articles
+
+    missing = 0
+    with DoiIndex(args.index) as index:
+        for item in args.items:
+            if item.endswith(".ndjson"):
+                articles, _ = load_articles(item)
+                for entry in unknown_reference_dois(index, articles):
+                    print(f"{item}\tp.{entry['first_page']}\tref {entry['reference']}\t{entry['doi']}\tunknown")
+                    missing += 1
+            else:
+                year = index.lookup(item)
+                if year is None:
+                    print(f"{item}\tunknown")
+                    missing += 1
+                else:
+                    print(f"{item}\tknown\t{year or ''}".rstrip())
+    return 1 if missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""On-disk cache of serialized per-article XML fragments.
+
+The Crossref and Copernicus builders serialize every article element and
+splice it back into the batch by parsing those bytes. With a cache, the bytes
+are stored under a key that hashes the article's extracted data, the module
+settings the fragment depends on and the source of the builder modules, so a
+rebuild only regenerates articles whose data, settings or code changed. Cached
+and fresh fragments go through the same bytes → parse path, so the assembled
+document is identical either way.
+
+Layout: <directory>/<key[:2]>/<key>.xml. prune_unused() drops fragments the
+last build did not touch, so the cache tracks the current issue.
+
+build_fragments() builds the missing fragments of a batch, optionally in a
+process pool; results are returned in article order, so the assembled
+document does not depend on the number of workers.
+"""
+
+import functools
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def fragment_key(*parts):
+    """SHA-256 of JSON-serializable parts in canonical form."""
+    data = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _file_digest(path, mtime_ns):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def code_digest(*modules):
+    """Digest of the modules' source files (part of every fragment key)."""
+    return {module.__name__: _file_digest(module.__file__, os.stat(module.__file__).st_mtime_ns) for module in modules}
+
+
+class FragmentCache:
+    def __init__(self, directory):
+        self.directory = directory
+        self.used = set()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.xml")
+
+    def get(self, key):
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.used.add(key)
+        self.hits += 1
+        return data
+
+    def put(self, key, data):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        self.used.add(key)
+
+    def fragment(self, key, build):
+        """Cached bytes for key, or build() (bytes) stored under key."""
+        data = self.get(key)
+        if data is None:
+            data = build()
+            self.put(key, data)
+        return data
+
+    def prune_unused(self):
+        """Delete fragments not read or written since this cache object was created; returns the count."""
+        removed = 0
+        if not os.path.isdir(self.directory):
+            return removed
+        for shard in os.listdir(self.directory):
+            shard_dir = os.path.join(self.directory, shard)
+            for name in os.listdir(shard_dir):
+                if name.endswith(".xml") and name[:-4] not in self.used:
+                    os.remove(os.path.join(shard_dir, name))
+                    removed += 1
+        return removed
+
+
+def build_fragments(items, build, key=None, cache=None, workers=0, initializer=None, initargs=()):
+    """Fragment bytes for every item, in order: cache hits first, the rest built serially or in a pool.
+
+    build and initializer must be module-level functions (they are sent to worker processes);
+    initializer(*initargs) must give workers the builder's module settings.
+    """
+    fragments = [None] * len(items)
+    keys = [key(item) for item in items] if cache is not None else None
+    todo = []
+    for index, item in enumerate(items):
+        data = cache.get(keys[index]) if cache is not None else None
+        if data is None:
+            todo.append(index)
+        else:
+            fragments[index] = data
+    pending = [items[index] for index in todo]
+    if workers and workers > 1 and len(pending) > 1:
+        chunksize = max(1, len(pending) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+            built = list(pool.map(build, pending, chunksize=chunksize))
+    else:
+        built = [build(item) for item in pending]
+    for index, data in zip(todo, built):
+        fragments[index] = data
+        if cache is not None:
+            cache.put(keys[index], data)
+    return fragments
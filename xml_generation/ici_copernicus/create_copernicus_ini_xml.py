@@ -1,23 +1,36 @@
-import re
-from datetime import datetime
+import sys
+from datetime import datetime, timezone
 import xml.etree.ElementTree as ET
 import lxml.etree as etree
 import yaml
+from instrumentation.tracing import span
+from xml_generation.abstracts import split_abstract
+from xml_generation.fragment_cache import build_fragments, code_digest, fragment_key
+from xml_generation.references import normalize_reference, normalize_references
+from xml_generation.reproducible import configure_reproducible, pinned_now, reproducible_settings
+from docx_processing.author_names import parsed_authors
 from docx_processing.extractors import sanitize_affiliation_lines_for_organization
 
 # ---------- Load configuration (same style as your Crossref file) ----------
-with open("config.yml", "r", encoding="utf-8") as config_file:
-    config = yaml.safe_load(config_file)
+def apply_config(new_config):
+    """Bind the module-level publication/journal settings from a parsed config.yml dict."""
+    global config, PUBLICATION_YEAR, PUBLICATION_MONTH, JOURNAL_VOLUME, JOURNAL_ISSUE
+    global JOURNAL_DOI, JOURNAL_URL, ISSN_PRINT, ISSN_ELECTRONIC
+    config = new_config
+
+    PUBLICATION_YEAR = str(config["publication"]["year"])
+    PUBLICATION_MONTH = str(config["publication"]["month"]).zfill(2)
+    JOURNAL_VOLUME = str(config["publication"]["volume"])
+    JOURNAL_ISSUE = str(config["publication"]["issue"])
 
-PUBLICATION_YEAR = config["publication"]["year"]
-PUBLICATION_MONTH = config["publication"]["month"]
-JOURNAL_VOLUME = config["publication"]["volume"]
-JOURNAL_ISSUE = config["publication"]["issue"]
+    JOURNAL_DOI = config["journal"]["doi"]
+    JOURNAL_URL = config["journal"]["base_url"].rstrip("/")
+    ISSN_PRINT = config["journal"]["issn"].get("print", "")
+    ISSN_ELECTRONIC = config["journal"]["issn"].get("electronic", "")
 
-JOURNAL_DOI = config["journal"]["doi"]
-JOURNAL_URL = config["journal"]["base_url"].rstrip("/")
-ISSN_PRINT = config["journal"]["issn"].get("print", "")
-ISSN_ELECTRONIC = config["journal"]["issn"].get("electronic", "")
+
+with open("config.yml", "r", encoding="utf-8") as config_file:
+    apply_config(yaml.safe_load(config_file))
 
 
 def month_to_issue_date(year: str, month: str) -> str:
@@ -26,124 +39,46 @@ def month_to_issue_date(year: str, month: str) -> str:
         y = int(year); m = int(month)
         return f"{y:04d}-{m:02d}-01"
     except Exception:
-        return datetime.utcnow().strftime("%Y-%m-%d")
+        return (pinned_now() or datetime.now(timezone.utc)).strftime("%Y-%m-%d")
 
 def generate_doi(start_page: int) -> str:
     """Same DOI pattern you use for Crossref: <prefix><YYYY>.<II>.<SSS>."""
     return f"{JOURNAL_DOI}{int(PUBLICATION_YEAR)}.{int(JOURNAL_ISSUE):02d}.{int(start_page):03d}"
 
 def extract_doi_from_string(s: str):
-    """Pull DOI from a reference line if present."""
-    if not s:
-        return None
-    m = re.search(r"\b10\.\d{4,9}/\S+\b", s)
-    if m:
-        return m.group(0).rstrip(".,;)")
-    m = re.search(r"https?://doi\.org/(10\.\d{4,9}/\S+)", s, flags=re.IGNORECASE)
-    if m:
-        return m.group(1).rstrip(".,;)")
-    return None
+    """Pull DOI from a reference line if present (xml_generation.references)."""
+    return normalize_reference(s).doi if s else None
 
 def parse_authors_simple(authors_text: str):
     """
-    Very tolerant author parser for strings like:
+    Authors of a © line (docx_processing.author_names, shared with the Crossref builder), e.g.
       "Bybyk R.T., Nakonechnyi Y.M."
       "V.S. Ivkova, I.R. Opirskyi"
-      "Kudriavtsev D.O., Mychuda L.Z."
     Returns a list of dicts with fields: name, surname, order, role, polishAffiliation
     """
-    authors = []
-    if not authors_text:
-        return authors
-    parts = [p.strip() for p in authors_text.split(",") if p.strip()]
-    for idx, p in enumerate(parts, 1):
-        # Pattern 1: "I.P. Surname"
-        m = re.match(r"^(([A-Za-zА-Яа-яІіЇїЄєҐґ]\.){1,3})\s+([A-Za-zА-Яа-яІіЇїЄєҐґ'\-]+)$", p)
-        if m:
-            initials = re.findall(r"[A-Za-zА-Яа-яІіЇїЄєҐґ]", m.group(1))
-            name = " ".join(initials)
-            surname = m.group(3)
-        else:
-            # Pattern 2: "Surname I.P." or "Surname I.P" or "Surname I. P."
-            tokens = p.replace(".", " ").split()
-            if not tokens:
-                continue
-            surname = tokens[0]
-            initials = [t[0] for t in tokens[1:] if t]
-            name = " ".join(initials) if initials else ""
-        authors.append({
-            "name": name,
-            "surname": surname,
+    return [
+        {
+            "name": author.given,
+            "surname": author.surname,
             "order": str(idx),
             "role": "AUTHOR",
             "polishAffiliation": "false"
-        })
-    return authors
-
-def _parse_keywords_line(text: str):
-    if not text:
-        return []
-    items = [x.strip(" .;:,–—()[]") for x in re.split(r"[;,]", text) if x.strip()]
-    return [x for x in items if 0 < len(x) <= 80][:20]
-
+        }
+        for idx, author in enumerate(parsed_authors(authors_text), 1)
+    ]
 
 def split_multilingual_abstract_payload(abstract_text: str):
     """
-    Parse EN/UK abstract and keyword sections from a single extracted abstract block.
-    Uses labels when present and falls back to EN-only payload.
+    EN/UK abstract and keyword sections of the extracted abstract block (xml_generation.abstracts,
+    shared with the Crossref builder). Falls back to an EN-only payload when there are no labels.
     """
-    payload = {
-        "en_abstract": "",
-        "uk_abstract": "",
-        "en_keywords": [],
-        "uk_keywords": [],
+    sections = split_abstract(abstract_text or "")
+    return {
+        "en_abstract": sections.en_abstract,
+        "uk_abstract": sections.uk_abstract,
+        "en_keywords": list(sections.en_keywords),
+        "uk_keywords": list(sections.uk_keywords),
     }
-    if not abstract_text:
-        return payload
-
-    lines = [line.strip() for line in abstract_text.splitlines() if line.strip()]
-    state = None
-
-    for line in lines:
-        en_abs_match = re.match(r"^abstract\s*[:.\-]?\s*(.*)$", line, flags=re.IGNORECASE)
-        uk_abs_match = re.match(r"^анотац(?:ія|iя)\s*[:.\-]?\s*(.*)$", line, flags=re.IGNORECASE)
-        en_kw_match = re.match(r"^keywords?\s*[:.\-]?\s*(.*)$", line, flags=re.IGNORECASE)
-        uk_kw_match = re.match(r"^ключов[іi]\s+слова\s*[:.\-]?\s*(.*)$", line, flags=re.IGNORECASE)
-
-        if en_abs_match:
-            state = "en_abstract"
-            rest = en_abs_match.group(1).strip()
-            if rest:
-                payload["en_abstract"] = f'{payload["en_abstract"]}\n{rest}'.strip()
-            continue
-        if uk_abs_match:
-            state = "uk_abstract"
-            rest = uk_abs_match.group(1).strip()
-            if rest:
-                payload["uk_abstract"] = f'{payload["uk_abstract"]}\n{rest}'.strip()
-            continue
-        if en_kw_match:
-            state = None
-            payload["en_keywords"].extend(_parse_keywords_line(en_kw_match.group(1)))
-            continue
-        if uk_kw_match:
-            state = None
-            payload["uk_keywords"].extend(_parse_keywords_line(uk_kw_match.group(1)))
-            continue
-
-        if state == "en_abstract":
-            payload["en_abstract"] = f'{payload["en_abstract"]}\n{line}'.strip()
-        elif state == "uk_abstract":
-            payload["uk_abstract"] = f'{payload["uk_abstract"]}\n{line}'.strip()
-
-    if not payload["en_abstract"]:
-        cleaned_lines = [
-            line for line in lines
-            if not re.match(r"^(keywords?|ключов[іi]\s+слова)\s*[:.\-]?\s*", line, flags=re.IGNORECASE)
-        ]
-        payload["en_abstract"] = "\n".join(cleaned_lines).strip()
-
-    return payload
 
 # ---------- Builders (similar style/shape to your Crossref functions) ----------
 def create_issue_element():
@@ -229,20 +164,51 @@ def create_article_element(en_title, uk_title, authors_text, pages, refs, abstra
     # References
     if refs:
         refs_el = ET.SubElement(article_el, "references")
-        for i, r in enumerate(refs, 1):
+        for i, r in enumerate(normalize_references(refs), 1):
             re_el = ET.SubElement(refs_el, "reference")
-            ET.SubElement(re_el, "unparsedContent").text = r
+            ET.SubElement(re_el, "unparsedContent").text = r.text
             ET.SubElement(re_el, "order").text = str(i)
-            r_doi = extract_doi_from_string(r)
-            if r_doi:
-                ET.SubElement(re_el, "doi").text = r_doi
+            if r.doi:
+                ET.SubElement(re_el, "doi").text = r.doi
 
     return article_el
 
+FRAGMENT_CODE_MODULES = (
+    __name__, "docx_processing.extractors", "docx_processing.author_names", "xml_generation.abstracts",
+    "xml_generation.references",
+)
+
+
+def article_fragment(item):
+    """Serialized <article> (bytes) for one article tuple."""
+    en_title, uk_title, authors_text, pages, refs, abstract_text = item[:6]
+    affiliation_lines = item[6] if len(item) > 6 else []
+    return ET.tostring(create_article_element(
+        en_title, uk_title, authors_text, pages, refs, abstract_text, affiliation_lines
+    ))
+
+
+def article_fragment_key(item):
+    settings = [
+        JOURNAL_DOI, PUBLICATION_YEAR, JOURNAL_ISSUE, month_to_issue_date(PUBLICATION_YEAR, PUBLICATION_MONTH)
+    ]
+    return fragment_key(
+        "copernicus_article", list(item[:7]), settings,
+        code_digest(*(sys.modules[name] for name in FRAGMENT_CODE_MODULES)),
+    )
+
+
+def _init_fragment_worker(worker_config, reproducible):
+    apply_config(worker_config)
+    configure_reproducible(**reproducible)
+
+
 # ---------- Main entrypoint (keeps your signature/name) ----------
-def create_ici_copernicus_xml(articles_data):
+def create_ici_copernicus_xml(articles_data, cache=None, workers=0):
     """
     Build the ICI Copernicus XML as a unicode string (same style as your Crossref create_full_xml).
+    cache: a FragmentCache of serialized <article> elements.
+    workers: build the fragments in a process pool of this size (same bytes as the serial build).
     """
     # Root
     root = ET.Element("ici-import")
@@ -255,16 +221,30 @@ def create_ici_copernicus_xml(articles_data):
     issue_el = create_issue_element()
     root.append(issue_el)
 
-    for item in articles_data:
-        en_title, uk_title, authors_text, pages, refs, abstract_text = item[:6]
-        affiliation_lines = item[6] if len(item) > 6 else []
-        article_el = create_article_element(
-            en_title, uk_title, authors_text, pages, refs, abstract_text, affiliation_lines
+    fragments = None
+    if workers and workers > 1:
+        articles_data = list(articles_data)
+        fragments = build_fragments(
+            articles_data, article_fragment, article_fragment_key, cache, workers,
+            initializer=_init_fragment_worker, initargs=(config, reproducible_settings()),
         )
+
+    article_count = 0
+    for item in articles_data:
+        pages, refs = item[3], item[4]
+        with span("copernicus_article", cat="copernicus", first_page=pages[0], references=len(refs)):
+            if fragments is not None:
+                fragment = fragments[article_count]
+            elif cache is None:
+                fragment = article_fragment(item)
+            else:
+                fragment = cache.fragment(article_fragment_key(item), lambda: article_fragment(item))
+            article_el = ET.fromstring(fragment)
         issue_el.append(article_el)
+        article_count += 1
 
-    # Set numberOfArticles attribute at the end
-    issue_el.set("numberOfArticles", str(len(articles_data)))
+    # Set numberOfArticles attribute at the end (articles_data may be a one-shot iterable)
+    issue_el.set("numberOfArticles", str(article_count))
 
     # Pretty-print via lxml (same output pattern as in Crossref code)
     xml_str = etree.tostring(etree.fromstring(ET.tostring(root)), pretty_print=True, encoding="unicode")
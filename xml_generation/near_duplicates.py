@@ -0,0 +1,243 @@
+"""Near-duplicate submissions across the archive: MinHash signatures in an LSH index.
+
+An article's text is its abstract and references (as extracted by
+extract_abstract / extract_literature). Its case-folded words form
+SHINGLE_WORDS-word shingles, hashed as a rolling polynomial over per-word
+hashes. NUM_PERM multiply-shift hash functions are applied to all shingles
+in one NumPy broadcast, and the minimum of each is kept as a uint32
+signature. The share of equal positions in two signatures estimates the
+Jaccard similarity of their shingle sets.
+
+The signatures are stored in SQLite together with BANDS band keys per
+article (ROWS signature values each, hashed with the band number). A new
+article is compared only with the articles that share at least one band
+key, found through an indexed IN lookup, so checking an issue does not
+scan the archive. With BANDS=32 and ROWS=4, pairs at 0.5 similarity
+collide in some band 87% of the time and pairs at 0.7 more than 99.9% of
+the time. Only candidates whose estimate reaches the threshold are
+reported.
+
+    python -m xml_generation.near_duplicates check data/similarity.sqlite output/backfill/volume-*/issue-*/issue.ndjson
+
+The near_duplicates build stage checks each issue against app.similarity_index
+(or only within the issue when it is empty) and writes output/near_duplicates.json.
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+SHINGLE_WORDS = 5
+THRESHOLD = 0.5
+SEED = 20240501
+
+WORD_RE = re.compile(r"\w+")
+
+_rng = np.random.default_rng(SEED)
+_PERM_A = _rng.integers(0, 2**64, size=NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_PERM_B = _rng.integers(0, 2**64, size=NUM_PERM, dtype=np.uint64)
+_SHINGLE_MULTIPLIERS = _rng.integers(0, 2**64, size=SHINGLE_WORDS, dtype=np.uint64) | np.uint64(1)
+_BAND_MULTIPLIERS = _rng.integers(0, 2**64, size=ROWS, dtype=np.uint64) | np.uint64(1)
+_BAND_SALTS = _rng.integers(0, 2**64, size=BANDS, dtype=np.uint64)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id          INTEGER PRIMARY KEY,
+    issue_key   TEXT NOT NULL,
+    position    INTEGER NOT NULL,
+    first_page  INTEGER,
+    title       TEXT,
+    source      TEXT,
+    signature   BLOB NOT NULL,
+    UNIQUE (issue_key, position)
+);
+CREATE TABLE IF NOT EXISTS bands (
+    band_key    INTEGER NOT NULL,
+    article_id  INTEGER NOT NULL REFERENCES articles (id)
+);
+CREATE INDEX IF NOT EXISTS bands_key ON bands (band_key);
+CREATE INDEX IF NOT EXISTS bands_article ON bands (article_id);
+"""
+
+
+@lru_cache(maxsize=65536)
+def _word_hash(word):
+    return int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def article_text(article):
+    """Abstract and references of an article tuple as one string."""
+    references = article[4] or []
+    return "\n".join([article[5] or "", *references])
+
+
+def shingle_hashes(text):
+    """Distinct uint64 hashes of the SHINGLE_WORDS-word shingles of text."""
+    words = WORD_RE.findall(text.casefold())
+    if len(words) < SHINGLE_WORDS:
+        return np.empty(0, dtype=np.uint64)
+    word_hashes = np.fromiter((_word_hash(w) for w in words), dtype=np.uint64, count=len(words))
+    count = len(words) - SHINGLE_WORDS + 1
+    shingles = np.zeros(count, dtype=np.uint64)
+    for offset in range(SHINGLE_WORDS):
+        shingles = shingles * _SHINGLE_MULTIPLIERS[offset] + word_hashes[offset:offset + count]
+    return np.unique(shingles)
+
+
+def signature(text):
+    """uint32 MinHash signature of text, or None when it has no shingles."""
+    shingles = shingle_hashes(text)
+    if not shingles.size:
+        return None
+    hashed = (_PERM_A[:, None] * shingles[None, :] + _PERM_B[:, None]) >> np.uint64(32)
+    return hashed.min(axis=1).astype(np.uint32)
+
+
+def band_keys(sig):
+    """BANDS signed 64-bit keys, one per band of ROWS signature values."""
+    bands = sig.reshape(BANDS, ROWS).astype(np.uint64)
+    return ((bands * _BAND_MULTIPLIERS).sum(axis=1) ^ _BAND_SALTS).view(np.int64)
+
+
+def similarity(sig, other):
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.count_nonzero(sig == other)) / NUM_PERM
+
+
+class NearDuplicateIndex:
+    def __init__(self, path=":memory:"):
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def replace_issue(self, issue_key, entries):
+        """Store {position, first_page, title, source, signature} entries as the issue's articles; returns their ids."""
+        ids = []
+        with self.db:
+            self.db.execute(
+                "DELETE FROM bands WHERE article_id IN (SELECT id FROM articles WHERE issue_key = ?)", (issue_key,)
+            )
+            self.db.execute("DELETE FROM articles WHERE issue_key = ?", (issue_key,))
+            for entry in entries:
+                article_id = self.db.execute(
+                    "INSERT INTO articles (issue_key, position, first_page, title, source, signature) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (issue_key, entry["position"], entry["first_page"], entry["title"], entry["source"],
+                     entry["signature"].tobytes()),
+                ).lastrowid
+                self.db.executemany(
+                    "INSERT INTO bands (band_key, article_id) VALUES (?, ?)",
+                    [(int(key), article_id) for key in band_keys(entry["signature"])],
+                )
+                ids.append(article_id)
+        return ids
+
+    def candidates(self, sig):
+        """Stored articles sharing a band with sig, each with its estimated similarity."""
+        keys = [int(key) for key in band_keys(sig)]
+        rows = self.db.execute(
+            "SELECT a.* FROM articles a WHERE a.id IN "
+            f"(SELECT article_id FROM bands WHERE band_key IN ({','.join('?' * len(keys))}))",
+            keys,
+        ).fetchall()
+        return [
+            (row, similarity(sig, np.frombuffer(row["signature"], dtype=np.uint32)))
+            for row in rows
+        ]
+
+
+def check_issue(index, issue_key, articles, sources=None, threshold=THRESHOLD):
+    """Replace the issue in the index and return its near-duplicate pairs (within it or with earlier issues)."""
+    sources = sources or [None] * len(articles)
+    entries = []
+    for position, (article, source) in enumerate(zip(articles, sources)):
+        sig = signature(article_text(article))
+        if sig is not None:
+            entries.append({
+                "position": position, "first_page": article[3][0], "title": article[0],
+                "source": source, "signature": sig,
+            })
+    ids = index.replace_issue(issue_key, entries)
+    pairs = []
+    for article_id, entry in zip(ids, entries):
+        for row, score in index.candidates(entry["signature"]):
+            if row["id"] == article_id or score < threshold:
+                continue
+            if row["issue_key"] == issue_key and row["position"] < entry["position"]:
+                continue  # same-issue pair, already reported from the other side
+            pairs.append({
+                "article": entry["position"], "first_page": entry["first_page"], "title": entry["title"],
+                "source": entry["source"],
+                "match": {
+                    "issue": row["issue_key"], "article": row["position"], "first_page": row["first_page"],
+                    "title": row["title"], "source": row["source"],
+                },
+                "similarity": round(score, 3),
+            })
+    pairs.sort(key=lambda pair: (-pair["similarity"], pair["article"]))
+    return pairs
+
+
+def issue_key(config):
+    publication = config.get("publication") or {}
+    return f"{publication.get('volume')}/{publication.get('issue')}"
+
+
+def main(argv=None):
+    from instrumentation.logging_setup import add_logging_arguments, configure_logging
+    from pipeline.snapshot import load_articles, read_header, iter_snapshot
+
+    parser = argparse.ArgumentParser(description="Check issue snapshots for near-duplicate articles.")
+    add_logging_arguments(parser)
+    sub = parser.add_subparsers(dest="command", required=True)
+    check = sub.add_parser("check", help="Add issue snapshots (in order) to the index and report near duplicates.")
+    check.add_argument("index")
+    check.add_argument("snapshots", nargs="+")
+    check.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = parser.parse_args(argv)
+    configure_logging(quiet=args.quiet, verbose=args.verbose, log_format=args.log_format)
+
+    found = 0
+    with NearDuplicateIndex(args.index) as index:
+        for path in args.snapshots:
+            key = issue_key(read_header(path)["config"])
+            articles, _ = load_articles(path)
+            sources = [record.get("source") for record in iter_snapshot(path)]
+            for pair in check_issue(index, key, articles, sources, args.threshold):
+                match = pair["match"]
+                print(f"{key}\tp.{pair['first_page']}\t{match['issue']}\tp.{match['first_page']}\t"
+                      f"{pair['similarity']:.3f}\t{pair['title']}")
+                found += 1
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+"""Reference-list normalization shared by the Crossref and Copernicus emitters.
+
+Each reference string is scanned once with precompiled patterns for its DOI,
+publication year and URLs. Results are memoized by the reference text, so a
+reference that recurs across articles and issues — or is read by both
+emitters in the same run — is only parsed the first time.
+"""
+
+import functools
+import re
+from typing import NamedTuple, Optional, Tuple
+
+DOI_RE = re.compile(r"\b10\.\d{4,9}/\S+\b")
+URL_RE = re.compile(r"https?://[^\s<>\"]+", re.IGNORECASE)
+YEAR_RE = re.compile(r"(?<!\d)(1[6-9]\d{2}|20\d{2})(?!\d)")
+TRAILING_PUNCTUATION = ".,;)"
+
+
+class Reference(NamedTuple):
+    text: str
+    doi: Optional[str]
+    year: Optional[int]
+    urls: Tuple[str, ...]
+
+
+@functools.lru_cache(maxsize=16384)
+def normalize_reference(text):
+    """Reference with the DOI (first match), year (first outside URLs) and URLs of one reference string."""
+    text = text or ""
+    m = DOI_RE.search(text)
+    doi = m.group(0).rstrip(TRAILING_PUNCTUATION) if m else None
+    urls = tuple(url.rstrip(TRAILING_PUNCTUATION) for url in URL_RE.findall(text))
+    m = YEAR_RE.search(URL_RE.sub(" ", text) if urls else text)
+    year = int(m.group(1)) if m else None
+    return Reference(text, doi, year, urls)
+
+
+def normalize_references(references):
+    """normalize_reference for a whole reference list (one article or a batch)."""
+    return [normalize_reference(reference) for reference in references]
@@ -0,0 +1,76 @@
+"""Reproducible-output settings shared by the XML builders.
+
+By default doi_batch_id and timestamp come from the wall clock, so two runs
+never produce the same bytes. Supplying an epoch (--epoch, or the
+SOURCE_DATE_EPOCH environment variable) pins the clock; --deterministic also
+derives doi_batch_id from a hash of the deposit body. Without an epoch, the
+deterministic timestamp is the first second of the publication month.
+
+Crossref only accepts a re-deposit of a DOI whose timestamp is higher than
+the previous one, so corrections built in deterministic mode need a newer
+epoch than the original deposit.
+"""
+
+import hashlib
+import os
+from datetime import datetime, timezone
+
+SOURCE_DATE_EPOCH_ENV = "SOURCE_DATE_EPOCH"
+TIMESTAMP_FORMAT = "%Y%m%d%H%M%S"
+
+_settings = {"deterministic": False, "epoch": None}
+
+
+def configure_reproducible(deterministic=False, epoch=None):
+    """Set the mode for this process; epoch defaults to $SOURCE_DATE_EPOCH."""
+    if epoch is None and os.environ.get(SOURCE_DATE_EPOCH_ENV):
+        epoch = int(os.environ[SOURCE_DATE_EPOCH_ENV])
+    _settings["deterministic"] = bool(deterministic)
+    _settings["epoch"] = epoch
+
+
+def reproducible_settings():
+    """The current settings (for build fingerprints and worker processes)."""
+    return dict(_settings)
+
+
+def is_deterministic():
+    return _settings["deterministic"]
+
+
+def pinned_now():
+    """The supplied epoch as a UTC datetime, or None when the clock is not pinned."""
+    if _settings["epoch"] is None:
+        return None
+    return datetime.fromtimestamp(_settings["epoch"], timezone.utc)
+
+
+def batch_timestamp(year=None, month=None):
+    """YYYYMMDDHHMMSS for <timestamp>: pinned epoch, publication month (deterministic) or now."""
+    pinned = pinned_now()
+    if pinned is not None:
+        return pinned.strftime(TIMESTAMP_FORMAT)
+    if _settings["deterministic"] and year and month:
+        return f"{int(year):04d}{int(month):02d}01000000"
+    return datetime.now().strftime(TIMESTAMP_FORMAT)
+
+
+def content_id(data, length=16):
+    """Short stable id for a batch body (bytes)."""
+    return hashlib.sha256(data).hexdigest()[:length]
+
+
+configure_reproducible()
+
+
+def add_reproducible_arguments(parser):
+    """--deterministic / --epoch options for command-line entry points."""
+    parser.add_argument(
+        "--deterministic", action="store_true",
+        help="Byte-identical XML for identical inputs (batch id from a content hash, timestamp from --epoch).",
+    )
+    parser.add_argument(
+        "--epoch", type=int,
+        help=f"Unix time used for batch timestamps and dates (default: ${SOURCE_DATE_EPOCH_ENV} if set).",
+    )
+    return parser